@@ -0,0 +1,40 @@
+"""
+Route groups of the mock API, one Flask blueprint per lesson
+
+    chatbot   /api/chatbot/...           (Tuesday: conversational interfaces)
+    agent     /api/agents, /api/agent/... (Wednesday: agent supervision)
+    dmi       /api/dmi/...               (Thursday: decision-driven metrics)
+
+ENABLED_APIS (comma-separated, default all three) picks which ones a
+deployment serves; disabled groups are never imported. Blueprint modules
+only define routes at import - intent tables, the DMI metric store, rule
+tables, the agent runtime and storage are built on first use, so a cold
+start pays for Flask and little else.
+"""
+import importlib
+import os
+
+BLUEPRINTS = {
+    "chatbot": "api.chatbot",
+    "agent": "api.agent",
+    "dmi": "api.dmi",
+}
+
+
+def enabled_apis():
+    """
+    Route groups selected by ENABLED_APIS, in BLUEPRINTS order
+    """
+    value = os.environ.get('ENABLED_APIS', '').strip()
+    if not value or value.lower() == 'all':
+        return list(BLUEPRINTS)
+    names = {name.strip().lower() for name in value.split(',') if name.strip()}
+    unknown = names - set(BLUEPRINTS)
+    if unknown:
+        raise ValueError(f"Unknown ENABLED_APIS entries: {', '.join(sorted(unknown))}")
+    return [name for name in BLUEPRINTS if name in names]
+
+
+def register_blueprints(app, names):
+    for name in names:
+        app.register_blueprint(importlib.import_module(BLUEPRINTS[name]).bp)
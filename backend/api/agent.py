@@ -0,0 +1,263 @@
+"""
+Agent Control API (Wednesday: Agent Interfaces & Supervision)
+Key concepts: state visibility, autonomy control, action logs
+
+Every route is available for the default agent (/api/agent/status) and
+for any named agent (/api/agent/<agent_id>/status) - see agents.py
+"""
+import os
+import threading
+
+from flask import Blueprint, Response, request, jsonify
+
+from agents import AgentRuntime, DEFAULT_AGENT_ID
+from clock import make_clock
+from api.conditional import conditional_response, version_etag
+from api.fields import requested_fields, select
+from events import format_sse
+from storage import get_storage
+
+bp = Blueprint('agent', __name__, url_prefix='/api')
+
+SSE_RETRY_MS = 3000
+SSE_KEEPALIVE_SECONDS = 15
+ACTION_LOG_PAGE_MAX = 500
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime():
+    """
+    Agents share one scheduler thread (see agents.py), started with the first
+    agent, on the AGENT_CLOCK clock (see clock.py)
+    """
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AgentRuntime(get_storage(), tick_seconds=float(os.environ.get('AGENT_TICK_SECONDS', 2)),
+                                        clock=make_clock(os.environ.get('AGENT_CLOCK', 'real')))
+    return _runtime
+
+
+@bp.record_once
+def serve_default_agent_directly(state):
+    # Serve /api/agent/default/... directly instead of redirecting to /api/agent/...
+    state.app.url_map.redirect_defaults = False
+
+
+def agent_route(action, methods):
+    """
+    Register a view for both the default agent and /api/agent/<agent_id>/...
+    """
+    def decorator(view):
+        bp.add_url_rule(f'/agent/{action}', view_func=view, methods=methods,
+                        defaults={'agent_id': DEFAULT_AGENT_ID})
+        bp.add_url_rule(f'/agent/<agent_id>/{action}', view_func=view, methods=methods)
+        return view
+    return decorator
+
+
+def agent_not_found(agent_id):
+    return jsonify({"error": f"Agent '{agent_id}' not found"}), 404
+
+
+@bp.route('/agents', methods=['GET'])
+def agent_list():
+    """
+    List all known agents with their status (for stress-testing dashboards)
+    """
+    runtime = get_runtime()
+    agents = []
+    for agent_id in runtime.list_agents():
+        state = runtime.get_state(agent_id) or {}
+        agents.append({
+            "id": agent_id,
+            "status": state.get("status"),
+            "current_goal": state.get("current_goal"),
+            "completed_subtasks": sum(1 for t in state.get("subtasks", []) if t["status"] == "completed"),
+            "total_subtasks": len(state.get("subtasks", [])),
+            "last_update": state.get("last_update")
+        })
+    return jsonify({"agents": agents, "total_agents": len(agents), "running_agents": runtime.running_count()})
+
+
+@agent_route('status', methods=['GET'])
+def agent_status(agent_id):
+    """
+    Get current agent state and progress
+    action_log holds only the latest entries; page the rest via action-log
+    Served from the published snapshot's pre-encoded JSON, tagged with its
+    version (304 while the agent hasn't changed - see api/conditional.py)
+    Query param: fields (state keys to return, see api/fields.py)
+    """
+    snapshot = get_runtime().get_snapshot(agent_id)
+    if snapshot is None:
+        return agent_not_found(agent_id)
+    fields = requested_fields()
+
+    def build():
+        if fields is None:
+            return Response(snapshot.body, mimetype='application/json')
+        return jsonify(select(snapshot.state, fields))
+
+    return conditional_response(version_etag(snapshot.version), build)
+
+
+def open_agent_event_stream(agent_id, last_event_id):
+    """
+    Work out where a (re)connecting SSE client starts
+    Returns the event cursor and the opening chunk: a full snapshot for new
+    clients, nothing when the Last-Event-ID can be resumed from the buffer
+    """
+    runtime = get_runtime()
+    opening = f"retry: {SSE_RETRY_MS}\n\n"
+    events = runtime.events(agent_id)
+    if last_event_id and last_event_id.isdigit() and events.since(int(last_event_id)) is not None:
+        return int(last_event_id), opening
+
+    cursor, snapshot = runtime.snapshot(agent_id)
+    return cursor, opening + format_sse(cursor, "snapshot", snapshot)
+
+
+@agent_route('events', methods=['GET'])
+def agent_events_stream(agent_id):
+    """
+    Server-Sent Events stream of agent state deltas (replaces status polling)
+    Starts with a full snapshot, or resumes from the Last-Event-ID header
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    cursor, opening = open_agent_event_stream(agent_id, last_event_id)
+    events = runtime.events(agent_id)
+
+    def stream(cursor):
+        yield opening
+        while True:
+            pending = events.since(cursor)
+            if pending is None:
+                return  # Fell too far behind; client reconnects and gets a snapshot
+            for event_id, event_type, payload in pending:
+                yield format_sse(event_id, event_type, payload)
+                cursor = event_id
+            if not events.wait(cursor, SSE_KEEPALIVE_SECONDS):
+                yield ": keep-alive\n\n"
+
+    return Response(stream(cursor), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@agent_route('start', methods=['POST'])
+def agent_start(agent_id):
+    """
+    Start agent with a goal (the shared scheduler advances it)
+    """
+    data = request.json
+    goal = data.get('goal', '')
+    autonomy_level = data.get('autonomy_level', 'supervised')  # supervised, semi-auto, full-auto
+
+    return jsonify(get_runtime().start(agent_id, goal, autonomy_level))
+
+
+@agent_route('pause', methods=['POST'])
+def agent_pause(agent_id):
+    """
+    Pause agent execution (the scheduler stops advancing it)
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+    return jsonify(runtime.pause(agent_id))
+
+
+@agent_route('resume', methods=['POST'])
+def agent_resume(agent_id):
+    """
+    Resume agent execution (no-op for the scheduler if already queued)
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+    return jsonify(runtime.resume(agent_id))
+
+
+@agent_route('stop', methods=['POST'])
+def agent_stop(agent_id):
+    """
+    Stop agent completely (kill switch)
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+    return jsonify(runtime.stop(agent_id))
+
+
+@agent_route('modify', methods=['POST'])
+def agent_modify(agent_id):
+    """
+    Modify agent goal mid-execution
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+    data = request.json
+    return jsonify(runtime.modify(agent_id, data.get('goal')))
+
+
+@agent_route('advance', methods=['POST'])
+def agent_advance(agent_id):
+    """
+    Step the simulated clock (AGENT_CLOCK=manual only)
+    Body: {"seconds": 10} (default: one tick). The clock is shared, so every
+    agent with a tick due in that window advances, not just this one
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        return agent_not_found(agent_id)
+    if not runtime.clock.manual:
+        return jsonify({"error": "The agent clock is not manual (set AGENT_CLOCK=manual)"}), 409
+    seconds = (request.get_json(silent=True) or {}).get('seconds', runtime.tick_seconds)
+    if not isinstance(seconds, (int, float)) or isinstance(seconds, bool) or seconds < 0:
+        return jsonify({"error": "seconds must be a non-negative number"}), 400
+
+    ticks = runtime.advance_clock(seconds)
+    return jsonify({
+        "ticks": ticks,
+        "clock": runtime.clock.now().isoformat(),
+        "agent": runtime.get_state(agent_id)
+    })
+
+
+@agent_route('action-log', methods=['GET'])
+def agent_action_log(agent_id):
+    """
+    Get detailed action log for explainability
+    Query params: since (seq of the last entry already seen, default 0),
+    limit (default 100) - poll with since=next_since for new entries only
+    Entries are logged inside agent transactions, so the agent's snapshot
+    version tags the page
+    """
+    runtime = get_runtime()
+    snapshot = runtime.get_snapshot(agent_id)
+    if snapshot is None:
+        return agent_not_found(agent_id)
+    state = snapshot.state
+    since = max(0, request.args.get('since', 0, type=int))
+    limit = max(1, min(request.args.get('limit', 100, type=int), ACTION_LOG_PAGE_MAX))
+
+    def build():
+        actions, has_more = runtime.action_log_page(agent_id, since, limit)
+        return jsonify({
+            "actions": actions,
+            "total_actions": state.get("action_count", len(state.get("action_log", []))),
+            "next_since": actions[-1]["seq"] if actions else since,
+            "has_more": has_more
+        })
+
+    return conditional_response(version_etag(snapshot.version), build)
@@ -0,0 +1,466 @@
+"""
+Chatbot API (Tuesday: Chatbot & Conversational Interfaces)
+Key concepts: confidence signaling, uncertainty, correction loops
+"""
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from flask import Blueprint, Response, request, jsonify
+
+import fastjson
+import latency
+import metrics
+import tools
+from api.fields import requested_fields, select
+from intents import IntentRouter, DEFAULT_PATH as DEFAULT_INTENTS_PATH
+from response_cache import ResponseCache
+from storage import get_storage
+
+bp = Blueprint('chatbot', __name__, url_prefix='/api/chatbot')
+
+HISTORY_PAGE_MAX = 100
+MESSAGE_BATCH_MAX = 10000
+BATCH_LINES_PER_CHUNK = 100  # Results per write in a streamed batch
+
+# Streamed replies (/message/stream): message tokens sent per second, 0 = unpaced
+CHATBOT_STREAM_RATE = float(os.environ.get('CHATBOT_STREAM_RATE', 25))
+STREAM_MIMETYPE = 'application/x-ndjson'
+TOKEN_PATTERN = re.compile(r'\s*\S+|\s+')  # A word with its leading whitespace
+
+# Simulated chatbot "think time" (see latency.py, CHATBOT_LATENCY env var)
+chat_latency = latency.profile_from_env()
+
+# Run each reply's tools concurrently and report measured timings (see tools.py)
+CHATBOT_RUN_TOOLS = tools.enabled(chat_latency)
+
+# Deterministic replies (seeded per message) and their pre-serialized cache (see response_cache.py)
+CHATBOT_DETERMINISTIC = os.environ.get('CHATBOT_DETERMINISTIC', '').lower() in ('1', 'true', 'yes')
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('CHATBOT_CACHE_SIZE', 1024)),
+    ttl_seconds=float(os.environ.get('CHATBOT_CACHE_TTL_SECONDS', 300))
+)
+
+_intent_router = None
+_intent_router_lock = threading.Lock()
+
+
+def get_intent_router():
+    """
+    Keyword intents, hot-reloaded from intents.json (see intents.py)
+    Loaded and compiled on the first chat message rather than at import
+    """
+    global _intent_router
+    if _intent_router is None:
+        with _intent_router_lock:
+            if _intent_router is None:
+                _intent_router = IntentRouter(os.environ.get('CHATBOT_INTENTS_PATH', DEFAULT_INTENTS_PATH))
+    return _intent_router
+
+
+@bp.route('/message', methods=['POST'])
+def chatbot_message():
+    """
+    Chatbot endpoint with confidence signaling, uncertainty, and tool execution
+    The reply's tools run concurrently, alongside the think time (see think)
+    """
+    data = request.json
+    user_message = data.get('message', '')
+    context_id = data.get('context_id', None)
+
+    draft = draft_reply(user_message)
+    tools_used = think(draft[3])
+
+    _, body = finish_reply(draft, reply_dynamic(context_id), tools_used)
+    return Response(body, mimetype='application/json')
+
+
+@bp.route('/message/batch', methods=['POST'])
+def chatbot_message_batch():
+    """
+    Answer many messages in one request (prompt suites, regression runs)
+    Body: {"messages": ["text", {"message": "text", "context_id": "..."}, ...],
+    "simulate_latency": true}. Replies stream back in order as NDJSON, one
+    line per message: the /message reply plus its "index". The think time
+    is paid once per batch, not per message; "simulate_latency": false skips it.
+    Tools aren't run either: tools_used reports their modelled timings
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('messages'), list):
+        return jsonify({"error": "Body must be a JSON object with a messages list"}), 400
+    messages = data['messages']
+    if len(messages) > MESSAGE_BATCH_MAX:
+        return jsonify({"error": f"At most {MESSAGE_BATCH_MAX} messages per batch"}), 413
+    items = [{"message": item} if isinstance(item, str) else item for item in messages]
+    if not all(isinstance(item, dict) and isinstance(item.get('message', ''), str) for item in items):
+        return jsonify({"error": "Each message must be a string or an object with a message string"}), 400
+    if not all(item.get('context_id') is None or isinstance(item['context_id'], str) for item in items):
+        return jsonify({"error": "context_id must be a string"}), 400
+
+    if data.get('simulate_latency', True):
+        with metrics.phase("sleep"):
+            chat_latency.sleep()
+
+    def stream():
+        lines = []
+        for index, item in enumerate(items):
+            _, body = chatbot_reply(item.get('message', ''), item.get('context_id'))
+            lines.append(fastjson.splice(body[1:-1], {"index": index}) + b'\n')
+            if len(lines) == BATCH_LINES_PER_CHUNK:
+                yield b''.join(lines)
+                lines = []
+        if lines:
+            yield b''.join(lines)
+
+    return Response(stream(), mimetype=STREAM_MIMETYPE, headers={'X-Accel-Buffering': 'no'})
+
+
+@bp.route('/message/stream', methods=['POST'])
+def chatbot_message_stream():
+    """
+    Streaming variant of /message: newline-delimited JSON, see chatbot_stream_lines
+    The metadata goes out at once and the message follows at CHATBOT_STREAM_RATE
+    tokens/s while the reply's tools run; their measured timings arrive in
+    the trailer. Here each open stream holds a worker thread; the async entry
+    point (asgi.py) serves streams from the event loop instead
+    """
+    data = request.json
+    draft = draft_reply(data.get('message', ''))
+    dynamic = reply_dynamic(data.get('context_id', None))
+    pending = tools.start(draft[3]) if CHATBOT_RUN_TOOLS and draft[3] else None
+    lines = chatbot_stream_lines({**draft[1], **dynamic})
+
+    def complete():
+        return finish_reply(draft, dynamic, pending.result()[0] if pending else None)[0]
+
+    def stream():
+        response_data = None
+        try:
+            yield lines[0]
+            for line in lines[1:]:
+                if CHATBOT_STREAM_RATE > 0:
+                    time.sleep(1 / CHATBOT_STREAM_RATE)
+                yield line
+            response_data = complete()
+            yield chatbot_stream_trailer(response_data)
+        finally:
+            if response_data is None:
+                complete()  # Client went away; still record the reply
+
+    return Response(stream(), mimetype=STREAM_MIMETYPE, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+def chatbot_stream_lines(response_data):
+    """
+    The opening NDJSON lines of a streamed reply (bytes): a "meta" line
+    (confidence, response_type, sources, ids), then one "token" line per
+    word of the message. The tokens joined give back the message exactly;
+    chatbot_stream_trailer ends the stream
+    """
+    meta = {
+        "type": "meta",
+        "confidence": response_data["confidence"],
+        "response_type": response_data["response_type"],
+        "sources": response_data["sources"],
+        "can_correct": response_data["can_correct"],
+        "context_id": response_data["context_id"],
+        "timestamp": response_data["timestamp"]
+    }
+    with metrics.phase("serialize"):
+        return [
+            fastjson.dumps(meta) + b'\n',
+            *(fastjson.dumps({"type": "token", "text": token}) + b'\n'
+              for token in TOKEN_PATTERN.findall(response_data["message"]))
+        ]
+
+
+def chatbot_stream_trailer(response_data):
+    """
+    The "done" line of a streamed reply: tools_used (as measured, when the
+    tools ran) and alternative_interpretations
+    """
+    trailer = {
+        "type": "done",
+        "tools_used": response_data["tools_used"],
+        "alternative_interpretations": response_data["alternative_interpretations"]
+    }
+    with metrics.phase("serialize"):
+        return fastjson.dumps(trailer) + b'\n'
+
+
+def normalize_message(user_message):
+    """
+    Cache key form of a message: surrounding and repeated whitespace collapsed
+    """
+    return ' '.join(user_message.split())
+
+
+def chatbot_reply(user_message, context_id=None):
+    """
+    Build the chatbot reply for a message and record it in the history
+    Returns (response_data, JSON body bytes). Matched intents' sources and
+    tools_used are pre-encoded fastjson.Fragment values; tools_used reports
+    the modelled timings, as no tools are run (see think)
+
+    In deterministic mode the reply is a pure function of the normalized
+    message, so everything but timestamp/context_id comes pre-encoded from
+    response_cache on repeat messages
+    """
+    return finish_reply(draft_reply(user_message), reply_dynamic(context_id))
+
+
+def think(tool_calls):
+    """
+    The simulated think time, with the reply's tools (CHATBOT_TOOLS=run)
+    started together with it, so a reply waits for the longer of the two
+    rather than their sum. Returns the measured tools_used, or None when no
+    tools ran
+    """
+    start = time.perf_counter()
+    pending = tools.start(tool_calls) if CHATBOT_RUN_TOOLS and tool_calls else None
+    chat_latency.sleep()
+    slept = time.perf_counter() - start
+    tools_used, seconds = pending.result() if pending else (None, None)
+    record_think_phases(start, slept, seconds)
+    return tools_used
+
+
+async def think_async(tool_calls):
+    """
+    think for the event loop: the tools run as a task alongside the sleep
+    """
+    start = time.perf_counter()
+    pending = asyncio.ensure_future(tools.run_timed(tool_calls)) if CHATBOT_RUN_TOOLS and tool_calls else None
+    try:
+        await chat_latency.async_sleep()
+        slept = time.perf_counter() - start
+        tools_used, seconds = await pending if pending else (None, None)
+    finally:
+        if pending:
+            pending.cancel()  # No-op once done; stops the tools if the request is cancelled
+    record_think_phases(start, slept, seconds)
+    return tools_used
+
+
+def record_think_phases(start, slept, tool_seconds):
+    """
+    Server-Timing for think: sleep, tools and "overlap", the measured time
+    they ran side by side (sleep + tools - overlap is the wait)
+    """
+    metrics.record_phase("sleep", slept)
+    if tool_seconds is not None:
+        metrics.record_phase("tools", tool_seconds)
+        metrics.record_phase("overlap", max(0.0, slept + tool_seconds - (time.perf_counter() - start)))
+
+
+def draft_reply(user_message):
+    """
+    (message, reply fields, pre-encoded reply members or None, tool calls
+    to run or None) for chatbot_reply
+    """
+    if CHATBOT_DETERMINISTIC:
+        user_message = normalize_message(user_message)
+        key = (user_message, get_intent_router().version)
+        cached = response_cache.get(key)
+        if cached is None:
+            seed = zlib.crc32(user_message.encode('utf-8'))
+            reply, _ = compose_chatbot_reply(user_message, random.Random(seed))
+            with metrics.phase("serialize"):
+                cached = (reply, fastjson.members(reply))
+            response_cache.put(key, cached)
+        reply, fragment = cached
+        return user_message, reply, fragment, None
+
+    reply, tool_calls = compose_chatbot_reply(user_message)
+    return user_message, reply, None, tool_calls
+
+
+def reply_dynamic(context_id):
+    """
+    The per-request fields of a reply: timestamp and context_id
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "context_id": context_id or f"ctx_{int(time.time())}"
+    }
+
+
+def finish_reply(draft, dynamic, tools_used=None):
+    """
+    Add the reply_dynamic fields (and measured tools_used) to a draft,
+    encode it and record it in the history
+    """
+    user_message, reply, fragment, _ = draft
+    response_data = {**reply, **dynamic}
+    if tools_used is not None:
+        response_data["tools_used"] = tools_used
+
+    with metrics.phase("serialize"):
+        if fragment is None:
+            body = fastjson.dumps(response_data)
+        else:
+            body = fastjson.splice(fragment, dynamic)
+
+    # The history entry embeds the reply as encoded, rather than encoding it again
+    get_storage().append_message(response_data["context_id"], {
+        "user": user_message,
+        "assistant": fastjson.Fragment(body),
+        "timestamp": dynamic["timestamp"]
+    })
+    return response_data, body
+
+
+def compose_chatbot_reply(user_message, rng=random):
+    """
+    (reply fields minus timestamp/context_id, tool calls behind tools_used)
+    rng supplies confidences and tool timings (seeded in deterministic mode)
+    """
+    # Contextual mock responses based on keywords
+    msg_lower = user_message.lower()
+
+    # Initialize tools used (simulating tool execution)
+    tools_used = []
+
+    # Single-pass keyword match against the intent table (intents.json)
+    router = get_intent_router()
+    with metrics.phase("intent"):
+        intent = router.classify(msg_lower)
+    if intent:
+        confidence = rng.uniform(*intent["confidence"])
+        response_type = intent["response_type"]
+        response = intent["response"]
+        sources = intent["encoded"]["sources"]  # Pre-encoded at load (see intents.py)
+        tools_used = intent["encoded"]["tools_used"]
+        tool_calls = intent["tools_used"]
+    elif len(user_message.strip()) < 5:
+        confidence = rng.uniform(0.45, 0.65)
+        response_type = "low_confidence"
+        response = "I'm not sure I understand. Could you provide more context or clarify your question? Short queries often lack the detail needed for accurate responses."
+        sources = [
+            {"type": "nlp_analysis", "name": "Query Parser", "relevance": 0.52},
+            {"type": "context_analysis", "name": "Conversation History", "relevance": 0.48}
+        ]
+        tools_used = [
+            {"name": "QueryParser", "description": "Analyzed query structure", "execution_time_ms": 89, "success": True},
+            {"name": "ContextRetriever", "description": "Retrieved conversation context", "execution_time_ms": 123, "success": False}
+        ]
+        tool_calls = tools_used
+    else:
+        # Generic response with random confidence
+        confidence = rng.uniform(0.5, 0.95)
+        if confidence > 0.85:
+            response_type = "confident"
+            response = f"Based on my analysis, {user_message.lower()} is well-documented in our knowledge base. The implementation follows standard best practices for modern web applications."
+        elif confidence > 0.65:
+            response_type = "uncertain"
+            response = f"I have some information about {user_message.lower()}, but I'm not entirely certain about all the details. It might be related to the core functionality, though additional verification would be helpful."
+        else:
+            response_type = "low_confidence"
+            response = f"I'm not confident about {user_message.lower()}. Would you like me to search the documentation or connect you with a human expert?"
+
+        sources = [
+            {"type": "documentation", "name": "API Guide", "relevance": confidence},
+            {"type": "code_search", "name": "Repository Scan", "relevance": confidence * 0.8}
+        ]
+
+        # Add realistic tool execution data
+        tools_used = [
+            {"name": "KnowledgeBaseSearch", "description": "Searched documentation", "execution_time_ms": rng.randint(150, 400), "success": True},
+            {"name": "CodeAnalyzer", "description": "Analyzed codebase patterns", "execution_time_ms": rng.randint(200, 500), "success": confidence > 0.6},
+            {"name": "SemanticParser", "description": "Parsed query intent", "execution_time_ms": rng.randint(100, 250), "success": True}
+        ]
+        tool_calls = tools_used
+
+    # Generate contextual alternative interpretations for low confidence
+    alternatives = []
+    if confidence < 0.7:
+        if 'ui' in msg_lower or 'interface' in msg_lower:
+            alternatives = [
+                "Did you mean 'What is this interface for?'",
+                "Or were you asking 'How does this UI work?'"
+            ]
+        elif 'auth' in msg_lower or 'login' in msg_lower:
+            alternatives = [
+                "Did you mean 'authentication flow?'",
+                "Or were you asking about 'user login process?'"
+            ]
+        elif len(user_message.strip()) < 5:
+            alternatives = [
+                "Could you rephrase with more detail?",
+                "Did you want to know about a specific feature?"
+            ]
+        else:
+            alternatives = [
+                f"Did you mean '{user_message} implementation?'",
+                f"Or were you asking about '{user_message} best practices?'"
+            ]
+
+    return {
+        "message": response,
+        "confidence": round(confidence, 2),
+        "response_type": response_type,
+        "sources": sources,
+        "tools_used": tools_used,  # Add tools execution data
+        "can_correct": True,  # Allow mid-conversation correction
+        "alternative_interpretations": alternatives
+    }, tool_calls
+
+
+@bp.route('/correct', methods=['POST'])
+def chatbot_correct():
+    """
+    Allow user to correct chatbot's understanding mid-conversation
+    """
+    data = request.json
+    correction = data.get('correction', '')
+    context_id = data.get('context_id', '')
+
+    return jsonify({
+        "acknowledged": True,
+        "message": f"Thanks for the correction. I now understand you meant: {correction}",
+        "updated_confidence": 0.95,
+        "context_id": context_id
+    })
+
+
+@bp.route('/history', methods=['GET'])
+def chatbot_history():
+    """
+    Get conversation history (context visibility)
+    Query params: context_id (omit for recent messages across all
+    conversations), limit (default 10), before (cursor from next_cursor),
+    fields (keys kept per entry, see api/fields.py)
+    """
+    context_id = request.args.get('context_id')
+    limit = max(1, min(request.args.get('limit', 10, type=int), HISTORY_PAGE_MAX))
+    before = request.args.get('before', type=int)
+    fields = requested_fields()
+
+    entries, next_cursor, total = get_storage().history_page(context_id, limit, before)
+    if fields is None:
+        history = [fastjson.Fragment(entry) for entry in entries]  # Stored encoding, as-is
+    else:
+        history = [select(fastjson.loads(entry), fields) for entry in entries]
+
+    return jsonify({
+        "history": history,  # Oldest first; newest page by default
+        "total_messages": total,
+        "context_id": context_id,
+        "next_cursor": next_cursor
+    })
+
+
+@bp.route('/cache', methods=['GET'])
+def chatbot_cache():
+    """
+    Response cache hit/miss counters (only used with CHATBOT_DETERMINISTIC=1)
+    """
+    return jsonify({"deterministic": CHATBOT_DETERMINISTIC, **response_cache.stats()})
@@ -0,0 +1,61 @@
+"""
+Conditional GET for polled endpoints: version-based ETags and 304s
+
+A view tags its response with the version of the data it is built from
+(agent snapshot, decision log, metric store). A client that sends the tag
+back in If-None-Match gets an empty 304 Not Modified without the body being
+built or encoded; browsers do this on their own for responses marked
+Cache-Control: no-cache, so polling dashboards need no changes.
+
+Versions restart with the process and each worker keeps its own in-memory
+data, so tags carry a per-process token: a tag from another worker or an
+earlier run simply misses. The token is drawn per pid, so gunicorn workers
+forked from a preloaded app don't share the master's. Tags are weak (W/"..."), since bodies built from
+the same version can differ in incidental fields such as "timestamp".
+"""
+import os
+import threading
+import uuid
+
+from flask import current_app, make_response, request
+
+_token = (None, None)  # (pid, token)
+_token_lock = threading.Lock()
+
+
+def process_token():
+    """
+    Random token identifying this process, drawn again after a fork
+    """
+    global _token
+    pid, token = _token
+    if pid != os.getpid():
+        with _token_lock:
+            pid, token = _token
+            if pid != os.getpid():
+                token = uuid.uuid4().hex[:12]
+                _token = (os.getpid(), token)
+    return token
+
+
+def version_etag(*versions):
+    """
+    ETag value for data at the given version(s)
+    """
+    return "-".join([process_token(), *(str(version) for version in versions)])
+
+
+def conditional_response(etag, build):
+    """
+    304 if the request's If-None-Match matches etag, else the view result
+    from build() - only a 200 is tagged
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'  # Store, but revalidate on every poll
+    return response
@@ -0,0 +1,505 @@
+"""
+DMI Dashboard API (Thursday: DMI & AI-Driven Reporting UX)
+Key concepts: decision-first metrics, AI insights, confidence visualization
+
+The NumPy-backed modules (dmi_series, dmi_store, dmi_rules) are imported by
+the views that use them, and the rule table and seeded decision log are
+loaded on first use, so registering this blueprint costs no NumPy import.
+
+Oversized synthetic trends and decision batches run in a process pool (see
+dmi_jobs.py): the view answers 202 with a job id and GET /jobs/<job_id>
+returns the result once it is ready.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+from flask import Blueprint, Response, request, jsonify, url_for
+
+from api.conditional import conditional_response, version_etag
+from api.fields import requested_fields
+from decision_log import DecisionLog
+from dmi_jobs import QueueFull, get_jobs
+
+bp = Blueprint('dmi', __name__, url_prefix='/api/dmi')
+
+# Software Project Health Metrics (values come from dmi_store.py)
+DMI_METRICS = [
+    {"name": "Build Time", "key": "build_time", "direction": "lower_is_better", "digits": 2},
+    {"name": "Test Pass Rate", "key": "test_pass_rate", "direction": "higher_is_better", "digits": 1},
+    {"name": "Deployment Frequency", "key": "deployment_frequency", "direction": "higher_is_better", "digits": 0},
+    {"name": "Code Coverage", "key": "code_coverage", "direction": "higher_is_better", "digits": 1},
+    {"name": "Open Bugs", "key": "bug_count", "direction": "lower_is_better", "digits": 0}
+]
+
+# Trend charts are downsampled to at most this many points (see dmi_series.py)
+TREND_POINTS_MIN = 10
+TREND_POINTS_MAX = 5000
+
+DECISION_BATCH_MAX = 100000
+DECISION_EXPLAIN_MAX = 1000
+DECISION_LOG_PAGE_MAX = 200
+
+# Larger requests run as background jobs (see dmi_jobs.py)
+TREND_INLINE_POINTS = int(os.environ.get('DMI_INLINE_POINTS', 20000))  # Generated points (3650 days hourly: 87600)
+DECISION_INLINE_MAX = int(os.environ.get('DMI_INLINE_DECISIONS', 10000))
+DECISION_INLINE_EXPLAIN = int(os.environ.get('DMI_INLINE_EXPLAIN', 100))  # Explanations cost ~0.25 ms each
+JOB_RETRY_SECONDS = 1
+
+# Mock historical decisions, newest first (seed the decision log)
+DECISION_SEED_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dmi_decisions.json')
+
+_decision_rules = None
+_decision_log = None
+_lazy_lock = threading.Lock()
+
+
+def get_decision_rules():
+    """
+    Deployment decision thresholds (see dmi_rules.py), loaded on first use
+    """
+    global _decision_rules
+    if _decision_rules is None:
+        with _lazy_lock:
+            if _decision_rules is None:
+                from dmi_rules import DecisionRules, DEFAULT_PATH
+                _decision_rules = DecisionRules.load(os.environ.get('DMI_RULES_PATH', DEFAULT_PATH))
+    return _decision_rules
+
+
+def get_decision_log():
+    """
+    Decisions made by GET /api/dmi/decision (see decision_log.py), seeded
+    with the mock history on first use
+    """
+    global _decision_log
+    if _decision_log is None:
+        with _lazy_lock:
+            if _decision_log is None:
+                log = DecisionLog(max_entries=int(os.environ.get('DMI_DECISION_LOG_MAX', 20000)))
+                with open(DECISION_SEED_PATH) as f:
+                    for decision in reversed(json.load(f)):
+                        log.append(decision)
+                _decision_log = log
+    return _decision_log
+
+
+def submit_job(kind, fn, *args):
+    """
+    Run fn(*args) in the job pool: 202 with the job's id and status URL,
+    or 503 when the queue is full
+    """
+    try:
+        job = get_jobs().submit(kind, fn, *args)
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(JOB_RETRY_SECONDS)}
+    status_url = url_for('dmi.dmi_job', job_id=job.id)
+    return jsonify({**job.describe(), "status_url": status_url}), 202, {
+        "Location": status_url,
+        "Retry-After": str(JOB_RETRY_SECONDS)
+    }
+
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def dmi_job(job_id):
+    """
+    Poll a background job: 202 with its status until it finishes, then the
+    response the original request would have returned (500 if it failed)
+    Finished jobs are kept for the last DMI_JOB_RESULTS jobs
+    """
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+    info = job.describe()
+    if info["status"] == "done":
+        return Response(job.future.result(), mimetype='application/json')
+    if info["status"] == "failed":
+        return jsonify(info), 500
+    return jsonify(info), 202, {"Retry-After": str(JOB_RETRY_SECONDS)}
+
+
+@bp.route('/metrics', methods=['GET'])
+def dmi_metrics():
+    """
+    Get software project health metrics with status indicators
+    current is the latest hourly sample, previous the value a week earlier,
+    window the rolling 7-day summary (see dmi_store.py)
+    Tagged with the store version: 304 until the next sample arrives
+    """
+    import dmi_store
+
+    version, summaries = dmi_store.get_store().summaries()
+    return conditional_response(version_etag(version), lambda: dmi_metrics_body(summaries))
+
+
+def dmi_metrics_body(summaries):
+    """
+    The /metrics response, built from the store's summaries at one version
+    """
+    import dmi_series
+
+    metrics = []
+    for meta in DMI_METRICS:
+        summary = summaries[meta["key"]]
+        digits = meta["digits"] or None  # 0 digits -> int
+        metrics.append({
+            "name": meta["name"],
+            "key": meta["key"],
+            "current": round(summary["current"], digits),
+            "previous": round(summary["previous"], digits),
+            "unit": dmi_series.METRIC_CONFIGS[meta["key"]]["unit"],
+            "direction": meta["direction"],
+            "window": summary["window"]
+        })
+
+    # Calculate change and status for each metric
+    for metric in metrics:
+        current = metric["current"]
+        previous = metric["previous"]
+        change_percent = ((current - previous) / previous) * 100 if previous else 0.0
+        metric["change_percent"] = round(change_percent, 1)
+
+        # Determine trend direction
+        if change_percent > 1:
+            metric["trend"] = "up"
+        elif change_percent < -1:
+            metric["trend"] = "down"
+        else:
+            metric["trend"] = "stable"
+
+        # Determine status based on direction preference and change
+        is_improving = (metric["direction"] == "higher_is_better" and change_percent > 0) or \
+                      (metric["direction"] == "lower_is_better" and change_percent < 0)
+
+        if metric["key"] == "test_pass_rate":
+            if current >= 95:
+                metric["status"] = "healthy"
+            elif current >= 85:
+                metric["status"] = "warning"
+            else:
+                metric["status"] = "critical"
+        elif metric["key"] == "build_time":
+            if current <= 3.5:
+                metric["status"] = "healthy"
+            elif current <= 5.0:
+                metric["status"] = "warning"
+            else:
+                metric["status"] = "critical"
+        elif metric["key"] == "bug_count":
+            if current <= 10:
+                metric["status"] = "healthy"
+            elif current <= 20:
+                metric["status"] = "warning"
+            else:
+                metric["status"] = "critical"
+        else:
+            # Generic status based on improvement
+            if is_improving and abs(change_percent) > 5:
+                metric["status"] = "healthy"
+            elif not is_improving and abs(change_percent) > 10:
+                metric["status"] = "critical"
+            else:
+                metric["status"] = "warning"
+
+    return jsonify({
+        "metrics": metrics,
+        "as_of": summary["timestamp"],
+        "timestamp": datetime.now().isoformat()
+    })
+
+
+@bp.route('/trend', methods=['GET'])
+def dmi_trend():
+    """
+    Get historical trend data for a specific metric
+    Query params: metric, days (default 14), resolution (day|hour),
+    points (downsample target, default 500), seed (repeatable series),
+    fields (keys kept per point, e.g. date,value - see api/fields.py)
+
+    Served from the metric store (tagged with its version, like /metrics);
+    a seed, or more days than the store holds, generates a synthetic series
+    instead - as a background job (202) above DMI_INLINE_POINTS points
+    """
+    import dmi_series
+    import dmi_store
+
+    metric = request.args.get('metric', 'test_pass_rate', type=str)
+    days = max(1, min(request.args.get('days', 14, type=int), dmi_series.MAX_DAYS))
+    resolution = request.args.get('resolution', 'day', type=str)
+    if resolution not in dmi_series.RESOLUTIONS:
+        return jsonify({"error": f"resolution must be one of {', '.join(dmi_series.RESOLUTIONS)}"}), 400
+    points = max(TREND_POINTS_MIN, min(request.args.get('points', 500, type=int), TREND_POINTS_MAX))
+    seed = request.args.get('seed', type=int)
+
+    store = dmi_store.get_store()
+    fields = requested_fields()
+
+    if metric in dmi_store.METRIC_KEYS and seed is None and days * 24 <= store.series(metric).hours:
+        def from_store():
+            timestamps, values, is_anomaly = store.series(metric).trend(days, resolution)
+            trend_data = dmi_series.format_trend(timestamps, values, is_anomaly, resolution, points, fields)
+            return jsonify(trend_body(metric, resolution, trend_data, len(values)))
+        return conditional_response(version_etag(store.version), from_store)
+
+    args = (metric, days, resolution, points, seed, fields)
+    if dmi_series.series_length(days, resolution) > TREND_INLINE_POINTS:
+        return submit_job("trend", synthetic_trend_body, *args)
+    return jsonify(synthetic_trend_body(*args))
+
+
+def trend_body(metric, resolution, trend_data, total_points):
+    import dmi_series
+
+    config = dmi_series.METRIC_CONFIGS.get(metric, dmi_series.METRIC_CONFIGS["test_pass_rate"])
+    return {
+        "metric": metric,
+        "unit": config["unit"],
+        "resolution": resolution,
+        "total_points": total_points,  # Before downsampling
+        "trend": trend_data,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def synthetic_trend_body(metric, days, resolution, points, seed, fields):
+    """
+    The /trend response for a generated series (inline or as a job)
+    """
+    import dmi_series
+
+    return trend_body(metric, resolution, *dmi_series.trend_points(metric, days, resolution, points, seed, fields))
+
+
+@bp.route('/anomalies', methods=['GET'])
+def dmi_anomalies():
+    """
+    Anomalous samples of a metric from the store's anomaly index
+    Query params: metric, days (default 14)
+    """
+    import dmi_store
+
+    metric = request.args.get('metric', 'test_pass_rate', type=str)
+    if metric not in dmi_store.METRIC_KEYS:
+        return jsonify({"error": f"Unknown metric '{metric}'"}), 404
+    days = max(1, request.args.get('days', 14, type=int))
+
+    return jsonify({
+        "metric": metric,
+        "days": days,
+        "anomalies": dmi_store.get_store().series(metric).anomaly_points(days),
+        "timestamp": datetime.now().isoformat()
+    })
+
+
+@bp.route('/decision', methods=['GET'])
+def dmi_decision():
+    """
+    Get AI-driven deployment decision with reasoning
+    The thresholds live in dmi_rules.json (see dmi_rules.py)
+    """
+    import dmi_store
+
+    # Latest metric values (see dmi_store.py)
+    version, summaries = dmi_store.get_store().summaries()
+    snapshot = {metric: summary["current"] for metric, summary in summaries.items()}
+    snapshot["bug_count"] = round(snapshot["bug_count"])
+
+    decision = get_decision_rules().decide(snapshot)
+
+    # One log entry per metric sample, however often the dashboard refreshes
+    get_decision_log().append({
+        "timestamp": datetime.now().isoformat(),
+        "recommendation": decision["recommendation"],
+        "confidence": decision["confidence"],
+        "actual_outcome": "pending",
+        "outcome_details": "Awaiting deployment outcome",
+        "metrics_snapshot": {metric: round(value, 1) for metric, value in snapshot.items()}
+    }, key=version)
+
+    return jsonify({
+        "recommendation": decision["recommendation"],  # deploy, hold, investigate, rollback
+        "confidence": decision["confidence"],
+        "reasoning": decision["reasoning"],
+        "urgency": decision["urgency"],  # immediate, within_hours, within_days, next_sprint
+        "what_changed": "; ".join(decision["what_changed"]),
+        "why": decision["why"],
+        "impact": decision_impact(decision["recommendation"], decision["confidence"]),
+        "supporting_factors": decision["supporting_factors"],
+        "timestamp": datetime.now().isoformat()
+    })
+
+
+def decision_impact(recommendation, confidence):
+    """
+    Impact assessment shown with a recommendation
+    """
+    if recommendation == "deploy":
+        return {
+            "risk_level": "low" if confidence > 0.85 else "medium",
+            "expected_outcome": "Smooth deployment with minimal user impact",
+            "rollback_plan": "Automated rollback available within 5 minutes"
+        }
+    elif recommendation == "investigate":
+        return {
+            "risk_level": "medium",
+            "expected_outcome": "Investigation will identify root causes within 2-4 hours",
+            "next_steps": "Review logs, run diagnostics, consult with team leads"
+        }
+    else:  # hold
+        return {
+            "risk_level": "high",
+            "expected_outcome": "Deployment blocked pending quality improvements",
+            "required_actions": "Address critical issues before reconsidering deployment"
+        }
+
+
+@bp.route('/decision/batch', methods=['POST'])
+def dmi_decision_batch():
+    """
+    Score many metric snapshots in one call (backtesting, what-if analysis)
+    Body: {"snapshots": [{metric: value, ...}, ...]}, or column form
+    {"columns": {metric: [values...]}}, or {"source": "decision_log"} to
+    re-score the logged decisions. "explain": true adds the full reasoning
+    for each snapshot (up to DECISION_EXPLAIN_MAX)
+    More than DMI_INLINE_DECISIONS snapshots, or DMI_INLINE_EXPLAIN
+    explanations, are scored as a background job (202)
+    """
+    import numpy as np
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+
+    rules = get_decision_rules()
+    logged = None
+    columns = None
+    if data.get("source") == "decision_log":
+        logged = get_decision_log().entries()
+        snapshots = [decision["metrics_snapshot"] for decision in logged]
+    elif isinstance(data.get("snapshots"), list):
+        snapshots = data["snapshots"]
+        if not all(isinstance(snapshot, dict) for snapshot in snapshots):
+            return jsonify({"error": "snapshots must be a list of objects"}), 400
+        if not all(is_metric_value(snapshot.get(metric)) for snapshot in snapshots for metric in rules.metrics):
+            return jsonify({"error": "snapshot metric values must be numbers or null"}), 400
+        # null means missing, as if the metric were left out
+        snapshots = [{key: value for key, value in snapshot.items() if value is not None} for snapshot in snapshots]
+    elif isinstance(data.get("columns"), dict):
+        snapshots = None
+        try:
+            columns = {metric: np.asarray(values, dtype=float) for metric, values in data["columns"].items()}
+        except (TypeError, ValueError):
+            return jsonify({"error": "columns must map metric names to lists of numbers"}), 400
+        if len({column.shape for column in columns.values()}) > 1 or any(c.ndim != 1 for c in columns.values()):
+            return jsonify({"error": "columns must be flat lists of equal length"}), 400
+    else:
+        return jsonify({"error": "Provide snapshots, columns or source"}), 400
+
+    if columns is None:
+        count = len(snapshots)
+    else:
+        count = len(next(iter(columns.values()))) if columns else 0
+    if count > DECISION_BATCH_MAX:
+        return jsonify({"error": f"At most {DECISION_BATCH_MAX} snapshots per batch"}), 413
+
+    explain = bool(data.get("explain"))
+    args = (rules, columns, snapshots, logged, explain)
+    explained = min(count, DECISION_EXPLAIN_MAX) if explain else 0
+    if count > DECISION_INLINE_MAX or explained > DECISION_INLINE_EXPLAIN:
+        return submit_job("decision_batch", decision_batch_body, *args)
+    return jsonify(decision_batch_body(*args))
+
+
+def is_metric_value(value):
+    return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+
+def decision_batch_body(rules, columns, snapshots, logged=None, explain=False):
+    """
+    The /decision/batch response (inline or as a job); columns are built
+    from snapshots when not given
+    """
+    import numpy as np
+
+    if columns is None:
+        columns = rules.columns(snapshots)
+    count = len(next(iter(columns.values()))) if columns else 0
+
+    scores = rules.score(columns)
+    results = [
+        {"recommendation": recommendation, "confidence": confidence, "urgency": urgency,
+         "critical_issues": critical, "warnings": warnings}
+        for recommendation, confidence, urgency, critical, warnings in zip(
+            scores["recommendation"].tolist(), scores["confidence"].tolist(), scores["urgency"].tolist(),
+            scores["critical"].tolist(), scores["warnings"].tolist())
+    ]
+
+    if explain:
+        if snapshots is None:
+            snapshots = [
+                {metric: value for metric, value in zip(columns, row) if value == value}  # Drop NaN
+                for row in zip(*(column.tolist() for column in columns.values()))
+            ]
+        for result, snapshot in zip(results[:DECISION_EXPLAIN_MAX], snapshots):
+            result["explanation"] = rules.decide(snapshot)
+
+    recommendations, counts = np.unique(scores["recommendation"], return_counts=True)
+    summary = {"total": count, "by_recommendation": dict(zip(recommendations.tolist(), counts.tolist()))}
+
+    if logged is not None:
+        for result, decision in zip(results, logged):
+            result["logged_recommendation"] = decision["recommendation"]
+            result["actual_outcome"] = decision["actual_outcome"]
+            result["agrees"] = result["recommendation"] == decision["recommendation"]
+        summary["agreement"] = round(sum(r["agrees"] for r in results) / count, 3) if count else 0.0
+
+    return {"results": results, "summary": summary, "timestamp": datetime.now().isoformat()}
+
+
+@bp.route('/decision-log', methods=['GET'])
+def dmi_decision_log():
+    """
+    Get historical decision log with outcomes, newest first
+    Query params: since / until (ISO timestamps, until exclusive),
+    recommendation, limit (default 20), before (cursor from next_cursor)
+    Tagged with the log version: 304 until a decision or outcome is recorded
+    """
+    log = get_decision_log()
+    limit = max(1, min(request.args.get('limit', 20, type=int), DECISION_LOG_PAGE_MAX))
+
+    def build():
+        decisions, next_cursor, matching = log.page(
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            recommendation=request.args.get('recommendation'),
+            before=request.args.get('before', type=int),
+            limit=limit,
+            encoded=True  # Entries are spliced in as stored, not re-serialized
+        )
+        return jsonify({
+            "decisions": decisions,
+            "summary": log.summary(),
+            "matching_decisions": matching,
+            "next_cursor": next_cursor,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    return conditional_response(version_etag(log.version), build)
+
+
+@bp.route('/decision-log/<int:decision_id>/outcome', methods=['POST'])
+def dmi_decision_outcome(decision_id):
+    """
+    Record what actually happened after a decision (feeds accuracy and calibration)
+    Body: {"actual_outcome": "success|correct|partial|incorrect", "outcome_details": "..."}
+    """
+    log = get_decision_log()
+    data = request.get_json(silent=True) or {}
+    try:
+        entry = log.record_outcome(decision_id, data.get('actual_outcome'), data.get('outcome_details'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if entry is None:
+        return jsonify({"error": f"Decision {decision_id} not found"}), 404
+    return jsonify({"decision": entry, "summary": log.summary()})
@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets: ?fields= trims a response to what the client renders
+
+    /api/agent/status?fields=status,current_goal,subtasks.status
+    /api/chatbot/history?fields=user,assistant.message,assistant.confidence
+    /api/dmi/trend?fields=date,value
+
+Fields are comma-separated keys; dotted paths reach into nested objects,
+and lists are trimmed item by item. Endpoints apply them to the part of the
+payload that grows (agent state, each history entry, each trend point) and
+keep their envelope (totals, cursors) intact. Unknown keys are ignored.
+"""
+from flask import request
+
+
+def requested_fields():
+    """
+    Field tree from the request's ?fields=, or None for the full payload
+    """
+    value = request.args.get('fields')
+    return parse_fields(value) if value else None
+
+
+def parse_fields(value):
+    """
+    "a,b.c,b.d" -> {"a": None, "b": {"c": None, "d": None}} (None keeps the whole value)
+    """
+    tree = {}
+    for path in value.split(','):
+        parts = [part for part in path.strip().split('.') if part]
+        node = tree
+        for depth, part in enumerate(parts):
+            if part in node and node[part] is None:
+                break  # Whole value already kept
+            if depth == len(parts) - 1:
+                node[part] = None
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def select(value, tree):
+    """
+    Copy of value with only the fields in tree
+    """
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [select(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: select(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
@@ -0,0 +1,303 @@
+"""
+ASGI entry point for async serving
+
+    uvicorn asgi:app --port 5000
+
+The chatbot message endpoint runs natively on the event loop, so the
+simulated think time and tool calls are awaitable delays rather than a
+sleeping worker thread - thousands of in-flight chats fit in one process. Streamed chat
+replies and the agent event stream are served here too, so open streams
+don't each hold a thread. Every other route falls through to the Flask app.
+"""
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+import compression
+import fastjson
+import metrics
+import storage
+import tools
+from agents import DEFAULT_AGENT_ID
+from api.agent import get_runtime, open_agent_event_stream, SSE_KEEPALIVE_SECONDS
+from api.chatbot import (chatbot_stream_lines, chatbot_stream_trailer, draft_reply, finish_reply, reply_dynamic,
+                         think_async, CHATBOT_RUN_TOOLS, CHATBOT_STREAM_RATE, STREAM_MIMETYPE)
+from app import ENABLED_APIS
+from events import format_sse
+from wsgi import create_app
+
+# How often open event streams check the agent event bus
+SSE_POLL_SECONDS = 0.25
+
+# Threads running Flask requests
+WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 16))
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    """
+    WsgiToAsgi that runs requests on a thread pool
+
+    The stock wrapper runs every WSGI call on one thread-sensitive executor,
+    which serializes Flask requests and fails outright ("would deadlock")
+    once several keep-alive connections overlap.
+    """
+
+    def __init__(self, wsgi_application, threads=WSGI_THREADS):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        instance = WsgiToAsgiInstance(self.wsgi_application)
+        instance.run_wsgi_app = sync_to_async(
+            _run_wsgi_app.__get__(instance), thread_sensitive=False, executor=self.executor
+        )
+        await instance(scope, receive, send)
+
+
+# The plain function behind WsgiToAsgiInstance.run_wsgi_app (a sync_to_async wrapper)
+_run_wsgi_app = vars(WsgiToAsgiInstance)['run_wsgi_app'].func
+
+flask_asgi = ThreadedWsgiToAsgi(create_app())
+
+
+async def read_json(receive):
+    """
+    Read the full request body and decode it as JSON
+    """
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return fastjson.loads(body or b'null')
+
+
+async def send_json(send, payload, status=200):
+    await send_body(send, fastjson.dumps(payload), status)
+
+
+async def send_body(send, body, status=200, headers=()):
+    """
+    Send an already-encoded JSON body
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            (b'access-control-allow-origin', b'*'),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def chatbot_message(scope, receive, send):
+    """
+    Async version of POST /api/chatbot/message
+    Recorded in the same request metrics as the Flask routes (see metrics.py)
+    """
+    token = metrics.begin_request()
+    try:
+        data = await read_json(receive)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        metrics.end_request(token, 'POST', scope['path'], 400)
+        await send_json(send, {"error": "Request body must be a JSON object"}, status=400)
+        return
+
+    draft = draft_reply(data.get('message', ''))
+    tools_used = await think_async(draft[3])
+    _, body = finish_reply(draft, reply_dynamic(data.get('context_id')), tools_used)
+    headers = []
+    if compression.compressible('application/json', len(body)):
+        headers.append((b'vary', b'Accept-Encoding'))
+        encoding = compression.negotiate(dict(scope.get('headers', [])).get(b'accept-encoding', b'').decode('latin-1'))
+        if encoding:
+            with metrics.phase("compress"):
+                body = compression.compress(body, encoding)
+            headers.append((b'content-encoding', encoding.encode('ascii')))
+    timing = metrics.end_request(token, 'POST', scope['path'], 200, len(body))
+    await send_body(send, body, headers=[
+        *headers,
+        (b'server-timing', timing.encode('ascii')),
+        (b'timing-allow-origin', b'*'),
+    ])
+
+
+async def chatbot_message_stream(scope, receive, send):
+    """
+    Async version of POST /api/chatbot/message/stream (NDJSON, see api/chatbot.py)
+    Tokens are paced with asyncio.sleep, so an open stream costs no thread,
+    while the reply's tools run as a task alongside; the recorded request
+    duration is the time to the first line
+    """
+    token = metrics.begin_request()
+    try:
+        data = await read_json(receive)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        metrics.end_request(token, 'POST', scope['path'], 400)
+        await send_json(send, {"error": "Request body must be a JSON object"}, status=400)
+        return
+
+    draft = draft_reply(data.get('message', ''))
+    dynamic = reply_dynamic(data.get('context_id'))
+    pending = asyncio.ensure_future(tools.run_async(draft[3])) if CHATBOT_RUN_TOOLS and draft[3] else None
+    lines = chatbot_stream_lines({**draft[1], **dynamic})
+    timing = metrics.end_request(token, 'POST', scope['path'], 200)
+
+    response_data = None
+    disconnected, watcher = watch_disconnect(receive)
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', STREAM_MIMETYPE.encode('ascii')),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                (b'access-control-allow-origin', b'*'),
+                (b'server-timing', timing.encode('ascii')),
+                (b'timing-allow-origin', b'*'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': lines[0], 'more_body': True})
+        for line in lines[1:]:
+            if CHATBOT_STREAM_RATE > 0:
+                await asyncio.sleep(1 / CHATBOT_STREAM_RATE)
+            if disconnected.is_set():
+                return
+            await send({'type': 'http.response.body', 'body': line, 'more_body': True})
+        response_data, _ = finish_reply(draft, dynamic, await pending if pending else None)
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': chatbot_stream_trailer(response_data)})
+    finally:
+        watcher.cancel()
+        if response_data is None:  # Client went away; record the reply without waiting on its tools
+            ran = pending is not None and pending.done() and not pending.cancelled()
+            if pending is not None and not ran:
+                pending.cancel()
+            finish_reply(draft, dynamic, pending.result() if ran else None)
+
+
+def watch_disconnect(receive):
+    """
+    Event set when the client disconnects, and the task waiting for it
+    (cancel it when the response is done). Call after reading the body
+    """
+    disconnected = asyncio.Event()
+
+    async def watch():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    return disconnected, asyncio.create_task(watch())
+
+
+async def agent_events_stream(scope, receive, send, agent_id=DEFAULT_AGENT_ID):
+    """
+    Async version of GET /api/agent/[<agent_id>/]events (Server-Sent Events)
+    """
+    runtime = get_runtime()
+    if not runtime.exists(agent_id):
+        await send_json(send, {"error": f"Agent '{agent_id}' not found"}, status=404)
+        return
+
+    headers = dict(scope.get('headers', []))
+    query = parse_qs(scope.get('query_string', b'').decode())
+    last_event_id = headers.get(b'last-event-id', b'').decode() or query.get('last_event_id', [None])[0]
+    cursor, opening = open_agent_event_stream(agent_id, last_event_id)
+    agent_events = runtime.events(agent_id)
+
+    disconnected, watcher = watch_disconnect(receive)
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                (b'access-control-allow-origin', b'*'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': opening.encode(), 'more_body': True})
+
+        idle = 0.0
+        while not disconnected.is_set():
+            events = agent_events.since(cursor)
+            if events is None:
+                break  # Fell too far behind; client reconnects and gets a snapshot
+            if events:
+                chunk = ''.join(format_sse(*event) for event in events)
+                cursor = events[-1][0]
+                idle = 0.0
+            elif idle >= SSE_KEEPALIVE_SECONDS:
+                chunk = ": keep-alive\n\n"
+                idle = 0.0
+            else:
+                await asyncio.sleep(SSE_POLL_SECONDS)
+                idle += SSE_POLL_SECONDS
+                continue
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+
+
+async def lifespan(scope, receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            storage.close_storage()  # Flush buffered history writes
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+# Routes served on the event loop (for the enabled route groups); everything else goes to Flask
+ASYNC_ROUTES = [
+    (method, pattern, handler)
+    for api, method, pattern, handler in [
+        ('chatbot', 'POST', re.compile(r'/api/chatbot/message'), chatbot_message),
+        ('chatbot', 'POST', re.compile(r'/api/chatbot/message/stream'), chatbot_message_stream),
+        ('agent', 'GET', re.compile(r'/api/agent/(?:(?P<agent_id>[^/]+)/)?events'), agent_events_stream),
+    ]
+    if api in ENABLED_APIS
+]
+
+
+def match_async_route(method, path):
+    for route_method, pattern, handler in ASYNC_ROUTES:
+        match = pattern.fullmatch(path)
+        if route_method == method and match:
+            return handler, {key: value for key, value in match.groupdict().items() if value is not None}
+    return None, None
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(scope, receive, send)
+        return
+
+    if scope['type'] == 'http':
+        handler, params = match_async_route(scope['method'], scope['path'])
+        if handler:
+            await handler(scope, receive, send, **params)
+            return
+
+    await flask_asgi(scope, receive, send)
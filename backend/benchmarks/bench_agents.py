@@ -0,0 +1,52 @@
+"""
+Run many concurrent agents on the shared scheduler (see agents.py)
+
+    cd backend
+    python benchmarks/bench_agents.py [--agents 10000] [--tick 2.0] [--clock scaled:100]
+
+Reports how long it takes to start the agents, how long until every agent
+has finished its plan, and the thread count (which stays constant).
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import AgentRuntime  # noqa: E402
+from clock import make_clock  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--agents', type=int, default=10000)
+    parser.add_argument('--tick', type=float, default=2.0)
+    parser.add_argument('--clock', default='real', help="real or scaled:<factor> (see clock.py)")
+    args = parser.parse_args()
+
+    clock = make_clock(args.clock)
+    if clock.manual:
+        parser.error("--clock manual has no scheduler to measure")
+    runtime = AgentRuntime(MemoryStorage(), tick_seconds=args.tick, clock=clock)
+
+    start = time.perf_counter()
+    for i in range(args.agents):
+        runtime.start(f"agent-{i}", f"Review module {i}", "full-auto")
+    started = time.perf_counter() - start
+    print(f"Started {args.agents} agents in {started:.2f}s ({args.agents / started:,.0f}/s)")
+    print(f"Threads: {threading.active_count()}")
+
+    while runtime.running_count():
+        time.sleep(args.tick / 2 / getattr(clock, 'scale', 1))
+        print(f"  {runtime.running_count():>6} running, threads: {threading.active_count()}")
+
+    total = time.perf_counter() - start
+    steps = sum(runtime.get_state(f"agent-{i}")["action_count"] for i in range(args.agents))
+    print(f"All agents finished in {total:.1f}s ({steps:,} log entries, {steps / total:,.0f}/s)")
+
+
+if __name__ == '__main__':
+    main()
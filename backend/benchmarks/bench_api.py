@@ -0,0 +1,316 @@
+"""
+Latency and throughput of the API endpoints, with saved baselines
+
+    cd backend
+    python benchmarks/bench_api.py                  # in-process, Flask test client
+    python benchmarks/bench_api.py --mode socket    # local threaded server, real HTTP
+    python benchmarks/bench_api.py --mode socket --url http://127.0.0.1:5000
+    python benchmarks/bench_api.py --save           # record these results as the baseline
+
+Scenarios: the chat message endpoint (simulated think time off), a batch of
+100 messages, a page of 100 history entries, status and action log of an agent with a large log,
+long DMI trends, and the deployment decision. Each reports requests/s and
+p50/p95/p99 latency and is compared with the baseline saved for the mode
+(benchmarks/baselines/api-<mode>.json); a p95 or throughput change beyond
+--tolerance counts as a regression and the run exits with status 1.
+
+Requests send Accept-Encoding like a browser (--accept-encoding), and each
+scenario also reports its response size uncompressed (raw) and as sent
+(wire). The *_fields scenarios fetch sparse fieldsets (?fields=).
+
+Against a running server (--url), start it with CHATBOT_LATENCY=off.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ['CHATBOT_LATENCY'] = 'off'  # Before the app reads it
+
+BASELINE_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'baselines')
+BENCH_AGENT = 'bench-large-log'
+HISTORY_MESSAGES = 100
+BATCH_TOPICS = ("authentication", "the UI", "deployment", "testing", "performance")
+
+# name, method, path, JSON body
+SCENARIOS = [
+    ("chatbot_message", "POST", "/api/chatbot/message",
+     {"message": "How does authentication work?", "context_id": "bench"}),
+    ("chatbot_message_batch_100", "POST", "/api/chatbot/message/batch",
+     {"messages": [f"Question {i} about {BATCH_TOPICS[i % len(BATCH_TOPICS)]}" for i in range(100)],
+      "simulate_latency": False}),
+    ("chatbot_history", "GET", "/api/chatbot/history?context_id=bench-history&limit=100", None),
+    ("chatbot_history_fields", "GET", "/api/chatbot/history?context_id=bench-history&limit=100"
+                                      "&fields=user,assistant.message,assistant.confidence,timestamp", None),
+    ("agent_status_large_log", "GET", f"/api/agent/{BENCH_AGENT}/status", None),
+    ("agent_status_fields", "GET", f"/api/agent/{BENCH_AGENT}/status?fields=status,current_goal,subtasks", None),
+    ("agent_action_log_page", "GET", f"/api/agent/{BENCH_AGENT}/action-log?limit=500", None),
+    ("dmi_trend_10y_daily", "GET", "/api/dmi/trend?metric=build_time&days=3650", None),
+    ("dmi_trend_1y_hourly", "GET", "/api/dmi/trend?metric=build_time&days=365&resolution=hour", None),
+    ("dmi_trend_1y_hourly_fields", "GET", "/api/dmi/trend?metric=build_time&days=365&resolution=hour"
+                                          "&fields=date,value", None),
+    ("dmi_decision", "GET", "/api/dmi/decision", None),
+]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+class TestClientTransport:
+    """
+    Requests through Flask's test client: no sockets, one thread
+    """
+
+    concurrency = 1
+
+    def __init__(self, accept_encoding=None):
+        from app import app
+        self.client = app.test_client()
+        self.accept_encoding = accept_encoding
+
+    def connect(self):
+        return self
+
+    def request(self, method, path, body=None, accept_encoding=None):
+        """
+        Returns (status, response body size in bytes as sent)
+        """
+        encoding = accept_encoding or self.accept_encoding
+        headers = {'Accept-Encoding': encoding} if encoding else {}
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, len(response.get_data())
+
+    def close(self):
+        pass
+
+
+class SocketTransport:
+    """
+    Requests over HTTP/1.1 keep-alive connections, one per client thread
+    Without a URL, serves the app on a local port from a background thread
+    """
+
+    def __init__(self, url=None, concurrency=8, accept_encoding=None):
+        self.concurrency = concurrency
+        self.accept_encoding = accept_encoding
+        self.server = None
+        if url is None:
+            from werkzeug.serving import make_server
+            from app import app
+            logging.getLogger('werkzeug').setLevel(logging.WARNING)  # No line per request
+            self.server = make_server('127.0.0.1', 0, app, threaded=True)
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            self.host, self.port = '127.0.0.1', self.server.server_port
+        else:
+            parts = urlsplit(url)
+            self.host, self.port = parts.hostname, parts.port or 80
+
+    def connect(self):
+        return _Connection(self.host, self.port, self.accept_encoding)
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+class _Connection:
+    def __init__(self, host, port, accept_encoding=None):
+        self.conn = http.client.HTTPConnection(host, port, timeout=60)
+        self.accept_encoding = accept_encoding
+
+    def request(self, method, path, body=None, accept_encoding=None):
+        payload = json.dumps(body) if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload else {}
+        encoding = accept_encoding or self.accept_encoding
+        if encoding:
+            headers['Accept-Encoding'] = encoding
+        self.conn.request(method, path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        return response.status, len(response.read())
+
+    def close(self):
+        self.conn.close()
+
+
+def prepare(transport, log_entries):
+    """
+    Give the benchmark agent a long action log (each modify logs one entry)
+    and fill a conversation for the history scenario
+    """
+    conn = transport.connect()
+    for i in range(HISTORY_MESSAGES):
+        conn.request("POST", "/api/chatbot/message", {"message": f"Question {i} about authentication",
+                                                      "context_id": "bench-history"})
+    conn.request("POST", f"/api/agent/{BENCH_AGENT}/start", {"goal": "Benchmark", "autonomy_level": "supervised"})
+    conn.request("POST", f"/api/agent/{BENCH_AGENT}/pause")
+    for i in range(log_entries):
+        conn.request("POST", f"/api/agent/{BENCH_AGENT}/modify", {"goal": f"Benchmark step {i}"})
+    conn.close()
+
+
+def run_scenario(transport, method, path, body, requests, warmup):
+    """
+    Issue `requests` requests split across the transport's client threads
+    Returns (latencies in seconds, error count, wall time)
+    """
+    per_thread = [([], [0]) for _ in range(transport.concurrency)]
+
+    def worker(latencies, errors, count):
+        conn = transport.connect()
+        for _ in range(count):
+            start = time.perf_counter()
+            try:
+                ok = conn.request(method, path, body)[0] < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = transport.connect()
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[0] += 1
+        conn.close()
+
+    worker([], [0], warmup)
+    counts = [requests // transport.concurrency + (i < requests % transport.concurrency)
+              for i in range(transport.concurrency)]
+    threads = [threading.Thread(target=worker, args=(*per_thread[i], counts[i])) for i in range(transport.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for thread_latencies, _ in per_thread for latency in thread_latencies)
+    return latencies, sum(errors[0] for _, errors in per_thread), elapsed
+
+
+def response_sizes(transport, method, path, body):
+    """
+    (uncompressed, as sent) body size of one response
+    """
+    conn = transport.connect()
+    raw = conn.request(method, path, body, accept_encoding='identity')[1]
+    wire = conn.request(method, path, body)[1]
+    conn.close()
+    return raw, wire
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Scenario names whose p95 rose or throughput fell by more than tolerance
+    """
+    flagged = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance) or result["rps"] < base["rps"] / (1 + tolerance):
+            flagged.append(name)
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mode', choices=('client', 'socket'), default='client')
+    parser.add_argument('--url', help='Server to benchmark in socket mode (default: start one in-process)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads in socket mode')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--log-entries', type=int, default=5000, help='Action log size of the benchmark agent')
+    parser.add_argument('--only', action='append', help='Scenario name, repeatable')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--accept-encoding', default='gzip, deflate, br',
+                        help="Accept-Encoding sent with each request ('identity' for none)")
+    parser.add_argument('--save', action='store_true', help='Save the results as the baseline for this mode')
+    args = parser.parse_args()
+
+    if args.mode == 'client':
+        transport = TestClientTransport(args.accept_encoding)
+    else:
+        transport = SocketTransport(args.url, args.concurrency, args.accept_encoding)
+
+    baseline_path = os.path.join(BASELINE_DIR, f"api-{args.mode}.json")
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)["results"]
+
+    try:
+        start = time.perf_counter()
+        prepare(transport, args.log_entries)
+        print(f"Mode: {args.mode}, concurrency {transport.concurrency}, {args.requests} requests per scenario "
+              f"(agent log of {args.log_entries} entries built in {time.perf_counter() - start:.1f}s)\n")
+        print(f"{'scenario':<26} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} "
+              f"{'raw KB':>8} {'wire KB':>8} {'p95 vs base':>12}")
+
+        results = {}
+        for name, method, path, body in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            results[name] = result = summarize(*run_scenario(transport, method, path, body, args.requests, args.warmup))
+            result["raw_bytes"], result["wire_bytes"] = response_sizes(transport, method, path, body)
+            base = baseline.get(name)
+            delta = f"{(result['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%" if base and base["p95_ms"] else "-"
+            print(f"{name:<26} {result['rps']:>8,.0f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                  f"{result['p99_ms']:>8.2f} {result['errors']:>7} {result['raw_bytes'] / 1024:>8.1f} "
+                  f"{result['wire_bytes'] / 1024:>8.1f} {delta:>12}")
+    finally:
+        transport.close()
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump({
+                "meta": {
+                    "recorded_at": datetime.now().isoformat(timespec='seconds'),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cpus": os.cpu_count(),
+                    "mode": args.mode,
+                    "concurrency": transport.concurrency,
+                    "requests": args.requests,
+                    "accept_encoding": args.accept_encoding,
+                    "log_entries": args.log_entries
+                },
+                "results": {**baseline, **results}
+            }, f, indent=2)
+        print(f"\nSaved baseline to {os.path.relpath(baseline_path)}")
+        return
+
+    flagged = regressions(results, baseline, args.tolerance)
+    if flagged:
+        print(f"\nRegressions beyond {args.tolerance:.0%} of baseline: {', '.join(flagged)}")
+        sys.exit(1)
+    if baseline:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline")
+    else:
+        print("\nNo baseline for this mode yet; record one with --save")
+
+
+if __name__ == '__main__':
+    main()
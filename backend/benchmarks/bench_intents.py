@@ -0,0 +1,75 @@
+"""
+Per-message intent classification time: compiled router vs keyword scan
+
+    cd backend
+    python benchmarks/bench_intents.py [--length 10000] [--messages 200]
+
+The keyword scan is the previous if/elif chain of
+any(word in msg_lower for word in [...]) checks, driven by the same table.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intents  # noqa: E402
+from intents import IntentRouter  # noqa: E402
+
+FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def keyword_scan(intents, msg_lower):
+    for intent in intents:
+        if any(word in msg_lower for word in intent["keywords"]):
+            return intent
+    return None
+
+
+def make_messages(router, count, length):
+    keywords = [keyword for intent in router.intents for keyword in intent["keywords"]]
+    messages = []
+    for i in range(count):
+        words = []
+        while sum(len(word) + 1 for word in words) < length:
+            words.append(random.choice(FILLER))
+        if i % 2:
+            # Half the messages end with a keyword (worst case for the scan)
+            words.append(random.choice(keywords))
+        messages.append(" ".join(words))
+    return messages
+
+
+def time_per_message(classify, messages):
+    start = time.perf_counter()
+    for message in messages:
+        classify(message)
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--length', type=int, default=10000, help="characters per message")
+    args = parser.parse_args()
+
+    random.seed(42)
+    router = IntentRouter()
+    messages = make_messages(router, args.messages, args.length)
+
+    for message in messages:
+        assert router.classify(message) is keyword_scan(router.intents, message)
+
+    scan_us = time_per_message(lambda m: keyword_scan(router.intents, m), messages)
+    router_us = time_per_message(router.classify, messages)
+
+    matcher = "aho-corasick" if intents.ahocorasick else "priority scan"
+    print(f"{args.messages} messages of ~{args.length} chars")
+    print(f"keyword scan:    {scan_us:10.1f} us/message")
+    print(f"compiled router: {router_us:10.1f} us/message ({scan_us / router_us:.1f}x, {matcher})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Append / read throughput for each storage backend (see storage.py)
+
+    cd backend
+    python benchmarks/bench_storage.py [--messages 20000] [--contexts 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import MemoryStorage, SQLiteStorage  # noqa: E402
+
+
+def sample_entry(i):
+    return {
+        "user": f"benchmark message {i}",
+        "assistant": {"message": "x" * 200, "confidence": 0.9, "sources": [], "tools_used": []},
+        "timestamp": "2026-01-01T00:00:00"
+    }
+
+
+def bench(name, store, messages, contexts, reads):
+    start = time.perf_counter()
+    for i in range(messages):
+        store.append_message(f"ctx_{i % contexts}", sample_entry(i))
+    store.flush()
+    append_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(reads):
+        store.history_page(f"ctx_{i % contexts}", limit=10)
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(reads):
+        with store.agent_transaction("bench", dict) as state:
+            state["step"] = i
+    agent_seconds = time.perf_counter() - start
+
+    store.close()
+    print(f"{name:<8} {messages / append_seconds:>14,.0f} {reads / read_seconds:>14,.0f} "
+          f"{reads / agent_seconds:>16,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--contexts', type=int, default=100)
+    parser.add_argument('--reads', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.messages} appends across {args.contexts} contexts, {args.reads} page reads / agent updates\n")
+    print(f"{'backend':<8} {'appends/s':>14} {'page reads/s':>14} {'agent updates/s':>16}")
+
+    bench('memory', MemoryStorage(per_context=100, max_contexts=args.contexts),
+          args.messages, args.contexts, args.reads)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench('sqlite', SQLiteStorage(os.path.join(tmp, 'bench.db'), per_context=100),
+              args.messages, args.contexts, args.reads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+HTTP load test against a running server
+
+    cd backend
+    CHATBOT_LATENCY=off gunicorn -c gunicorn.conf.py &
+    python benchmarks/load_test.py [--url http://127.0.0.1:5000] [--concurrency 32] [--duration 10]
+
+Each client thread keeps one keep-alive connection and cycles through the
+request mix (GET /api/health, GET /api/agent/status, POST
+/api/chatbot/message, GET /api/dmi/metrics by default; repeat --path to
+choose your own). Reports requests/s and latency percentiles per route.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    'GET /api/health',
+    'GET /api/agent/status',
+    'POST /api/chatbot/message',
+    'GET /api/dmi/metrics',
+]
+
+CHAT_BODY = json.dumps({"message": "How does authentication work?", "context_id": "load-test"})
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def client(host, port, routes, deadline, results, errors):
+    """
+    Issue requests until the deadline, recording into this thread's own dicts
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = 0
+    while time.perf_counter() < deadline:
+        method, path = routes[i % len(routes)]
+        i += 1
+        body = CHAT_BODY if method == 'POST' else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            ok = False
+        elapsed = time.perf_counter() - start
+        key = f"{method} {path}"
+        if ok:
+            results.setdefault(key, []).append(elapsed)
+        else:
+            errors[key] = errors.get(key, 0) + 1
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--path', action='append', help="'METHOD /path', repeatable")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    routes = [tuple(spec.split(' ', 1)) for spec in (args.path or DEFAULT_PATHS)]
+    per_thread = [({}, {}) for _ in range(args.concurrency)]
+
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(url.hostname, url.port or 80, routes[i:] + routes[:i],
+                                                     deadline, *per_thread[i]))
+               for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results = {f"{method} {path}": [] for method, path in routes}
+    errors = {key: 0 for key in results}
+    for thread_results, thread_errors in per_thread:
+        for key, latencies in thread_results.items():
+            results[key].extend(latencies)
+        for key, count in thread_errors.items():
+            errors[key] += count
+
+    total = sum(len(latencies) for latencies in results.values())
+    print(f"{args.concurrency} clients, {elapsed:.1f}s: {total:,} requests, {total / elapsed:,.0f} req/s, "
+          f"{sum(errors.values())} errors\n")
+    print(f"{'route':<28} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for key, latencies in results.items():
+        latencies.sort()
+        print(f"{key:<28} {len(latencies) / elapsed:>8,.0f} {percentile(latencies, 50) * 1000:>8.1f} "
+              f"{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors[key]:>7}")
+
+
+if __name__ == '__main__':
+    main()
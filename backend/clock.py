@@ -0,0 +1,102 @@
+"""
+Clocks for the agent simulator: real, scaled or manually stepped time
+
+    AGENT_CLOCK=real        Wall-clock time (default)
+    AGENT_CLOCK=scaled:100  Time runs 100x faster: a 2 s tick every 20 ms
+    AGENT_CLOCK=manual      Time stands still until advanced, e.g. by
+                            POST /api/agent/advance {"seconds": 10}
+
+The agent runtime takes every timestamp from clock.now() and schedules
+ticks on clock.monotonic(), so a four-subtask run that takes most of a
+minute in real time finishes in well under a second when scaled, and
+tests can step it tick by tick (see tests/test_agent_lifecycle.py).
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class RealClock:
+    """
+    Wall-clock time
+    """
+
+    manual = False
+
+    def now(self):
+        return datetime.now()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def wait(self, condition, timeout):
+        """
+        condition.wait() for timeout seconds of clock time (None = until notified)
+        """
+        return condition.wait(timeout)
+
+
+class ScaledClock(RealClock):
+    """
+    Wall-clock time running scale times faster, from the moment it is created
+    """
+
+    def __init__(self, scale):
+        if scale <= 0:
+            raise ValueError("Clock scale must be positive")
+        self.scale = scale
+        self._start = datetime.now()
+        self._origin = time.monotonic()
+
+    def now(self):
+        return self._start + timedelta(seconds=self.monotonic())
+
+    def monotonic(self):
+        return (time.monotonic() - self._origin) * self.scale
+
+    def wait(self, condition, timeout):
+        return condition.wait(timeout / self.scale if timeout is not None else None)
+
+
+class ManualClock:
+    """
+    Time that only moves when advanced; ticks then run in the advancing
+    thread (see AgentRuntime.advance_clock), so runs are deterministic
+    """
+
+    manual = True
+
+    def __init__(self, start=None):
+        self._start = start or datetime.now()
+        self._elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def now(self):
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self):
+        return self._elapsed
+
+    def advance(self, seconds):
+        self.advance_to(self._elapsed + seconds)
+
+    def advance_to(self, elapsed):
+        """
+        Move to elapsed seconds since the start (never backwards)
+        """
+        with self._lock:
+            self._elapsed = max(self._elapsed, elapsed)
+
+
+def make_clock(spec):
+    """
+    Clock for an AGENT_CLOCK value: "real", "scaled:<factor>" or "manual"
+    """
+    mode, _, factor = spec.strip().lower().partition(':')
+    if mode == 'real':
+        return RealClock()
+    if mode == 'scaled':
+        return ScaledClock(float(factor or 100))
+    if mode == 'manual':
+        return ManualClock()
+    raise ValueError(f"Unknown AGENT_CLOCK '{spec}' (expected real, scaled:<factor> or manual)")
@@ -0,0 +1,54 @@
+"""
+Negotiated response compression (brotli or gzip)
+
+    COMPRESS_MIN_BYTES=1024   Bodies smaller than this are sent as-is (0 = off)
+    COMPRESS_LEVEL=1          gzip level, 1 (fastest) - 9 (smallest)
+    COMPRESS_BROTLI_QUALITY=2 brotli quality, 0 (fastest) - 11 (smallest)
+
+brotli is used when the Brotli package is installed and the client accepts
+it; otherwise gzip. Only JSON and text bodies are compressed, never event
+streams (each event must reach the client as soon as it is written).
+
+Bodies are compressed per request, so the defaults favour speed: on the
+large agent log, trend and history bodies, brotli 2 takes ~0.2 ms for
+9-14x, while gzip 6 takes twice that for less (benchmarks/bench_api.py
+reports the bytes).
+"""
+import gzip
+import os
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # Optional C extension
+    brotli = None
+
+MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 1))
+BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 2))
+
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+COMPRESSIBLE_TYPES = ('application/json', 'text/plain', 'text/html', 'text/css', 'application/javascript')
+
+
+def compressible(mimetype, size):
+    """
+    Whether a body is worth compressing (responses then vary on Accept-Encoding)
+    """
+    return bool(MIN_BYTES) and size >= MIN_BYTES and mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate(accept_encoding):
+    """
+    Best encoding the client accepts (Accept-Encoding header value), or None
+    """
+    if not accept_encoding:
+        return None
+    return parse_accept_header(accept_encoding).best_match(ENCODINGS)
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
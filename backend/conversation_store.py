@@ -0,0 +1,101 @@
+"""
+Bounded conversation history, indexed by context_id
+
+Each context keeps a ring buffer of its most recent messages. Contexts are
+evicted least-recently-used once max_contexts is reached, and lazily after
+ttl_seconds without activity. A global ring buffer backs the "recent
+messages across all conversations" view.
+
+Every message gets a sequence number within its view, so a page is found by
+offset arithmetic rather than scanning: cost is O(limit), not O(history).
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class _Ring:
+    """
+    Fixed-size buffer of entries with contiguous sequence numbers (1, 2, 3...)
+    """
+
+    def __init__(self, maxlen):
+        self.entries = deque(maxlen=maxlen)
+        self.total = 0
+        self.last_seen = time.monotonic()
+
+    def append(self, entry):
+        self.entries.append(entry)
+        self.total += 1
+        self.last_seen = time.monotonic()
+
+    def page(self, limit, before=None):
+        """
+        Up to `limit` entries older than sequence number `before` (newest page
+        when omitted), oldest first, plus the cursor for the next older page
+        """
+        first_seq = self.total - len(self.entries) + 1
+        end_seq = self.total + 1 if before is None else max(first_seq, min(before, self.total + 1))
+        start_seq = max(first_seq, end_seq - limit)
+
+        page = [self.entries[seq - first_seq] for seq in range(start_seq, end_seq)]
+        next_cursor = start_seq if start_seq > first_seq else None
+        return page, next_cursor
+
+
+class ConversationHistory:
+    """
+    Thread-safe store for chatbot exchanges
+    """
+
+    def __init__(self, per_context=100, max_contexts=1000, ttl_seconds=3600, recent=100):
+        self.per_context = per_context
+        self.max_contexts = max_contexts
+        self.ttl_seconds = ttl_seconds
+        self._contexts = OrderedDict()  # context_id -> _Ring, least recently used first
+        self._recent = _Ring(recent)
+        self._lock = threading.Lock()
+
+    def append(self, context_id, entry):
+        with self._lock:
+            ring = self._contexts.get(context_id)
+            if ring is None:
+                ring = self._contexts[context_id] = _Ring(self.per_context)
+            else:
+                self._contexts.move_to_end(context_id)
+            ring.append(entry)
+            self._recent.append(entry)
+            self._evict()
+
+    def page(self, context_id=None, limit=10, before=None):
+        """
+        Returns (entries, next_cursor, total_messages) for one context, or for
+        the global recent view when context_id is None
+        """
+        with self._lock:
+            self._evict()
+            if context_id is None:
+                ring = self._recent
+            else:
+                ring = self._contexts.get(context_id)
+                if ring is None:
+                    return [], None, 0
+                self._contexts.move_to_end(context_id)
+                ring.last_seen = time.monotonic()
+            entries, next_cursor = ring.page(limit, before)
+            return entries, next_cursor, ring.total
+
+    def __len__(self):
+        return self._recent.total
+
+    def _evict(self):
+        """
+        Drop idle contexts (TTL) and least recently used ones over the cap
+        Caller must hold the lock
+        """
+        expired_before = time.monotonic() - self.ttl_seconds
+        while self._contexts:
+            context_id, ring = next(iter(self._contexts.items()))
+            if len(self._contexts) <= self.max_contexts and ring.last_seen >= expired_before:
+                break
+            del self._contexts[context_id]
@@ -0,0 +1,192 @@
+"""
+Append-only log of DMI deployment decisions
+
+Entries get increasing ids and are appended in time order (a timestamp
+earlier than the previous entry's, e.g. after the wall clock stepped back,
+is clamped to it), so a time range maps to an id range by bisecting the
+timestamp list, and each recommendation keeps a sorted id list for filtered
+queries. Pages are sliced from those ranges (newest first, `before`
+cursor), so reads cost O(log n + page size) however long the log gets.
+
+The log lives in memory, about 5 KB per entry with its encoding, so it
+keeps the newest max_entries and drops the oldest in chunks as it grows;
+ids of dropped entries are never reused, and the summary covers the entries
+kept.
+
+Summary statistics (accuracy, average confidence, calibration buckets) are
+updated as decisions and outcomes are recorded rather than recomputed.
+Each entry is also kept JSON-encoded (fastjson.Fragment), re-encoded only
+when its outcome changes, so pages are served without serializing entries.
+"""
+import bisect
+import threading
+
+import fastjson
+
+CORRECT_OUTCOMES = ("success", "correct")
+OUTCOMES = ("success", "correct", "partial", "incorrect")
+PENDING = "pending"
+CALIBRATION_BUCKETS = 10  # Confidence buckets of width 0.1
+
+
+class DecisionLog:
+    """
+    In-process decision log with time-range / recommendation indexes
+    """
+
+    def __init__(self, max_entries=20000):
+        self.max_entries = max_entries
+        self._first_id = 0  # id of _entries[0]; ids below it were dropped
+        self._entries = []  # id == _first_id + index
+        self._encoded = []  # fastjson.Fragment per entry
+        self._timestamps = []
+        self._by_recommendation = {}  # recommendation -> sorted ids
+        self._lock = threading.Lock()
+        self._last_key = None
+        self.version = 0  # Bumped by every append and outcome change
+
+        self._confidence_sum = 0.0
+        self._resolved = 0
+        self._correct = 0
+        self._buckets = [[0, 0, 0.0] for _ in range(CALIBRATION_BUCKETS)]  # resolved, correct, confidence sum
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def _next_id(self):
+        return self._first_id + len(self._entries)
+
+    # ----- writes -----
+
+    def append(self, entry, key=None):
+        """
+        Record a decision and return it with its id
+        With a key, a decision for the same key as the previous one is skipped
+        (returns None) - one entry per metric snapshot, not per page refresh
+        """
+        with self._lock:
+            if key is not None and key == self._last_key:
+                return None
+            self._last_key = key
+
+            entry = {**entry, "id": self._next_id}
+            if self._timestamps and entry["timestamp"] < self._timestamps[-1]:
+                entry["timestamp"] = self._timestamps[-1]  # Keep the index in time order
+            entry.setdefault("actual_outcome", PENDING)
+            self._encoded.append(fastjson.fragment(entry))
+            self._entries.append(entry)
+            self._timestamps.append(entry["timestamp"])
+            self._by_recommendation.setdefault(entry["recommendation"], []).append(entry["id"])
+            self._confidence_sum += entry["confidence"]
+            self._count_outcome(entry, 1)
+            self.version += 1
+            if len(self._entries) > self.max_entries + self.max_entries // 10:
+                self._drop_oldest(len(self._entries) - self.max_entries)
+            return entry
+
+    def _drop_oldest(self, count):
+        """
+        Forget the oldest count entries and take them out of the statistics
+        Caller must hold the lock
+        """
+        for entry in self._entries[:count]:
+            self._confidence_sum -= entry["confidence"]
+            self._count_outcome(entry, -1)
+        del self._entries[:count]
+        del self._encoded[:count]
+        del self._timestamps[:count]
+        self._first_id += count
+        for recommendation, ids in list(self._by_recommendation.items()):
+            del ids[:bisect.bisect_left(ids, self._first_id)]
+            if not ids:
+                del self._by_recommendation[recommendation]
+
+    def record_outcome(self, decision_id, outcome, details=None):
+        """
+        Set (or correct) the actual outcome of a decision
+        Returns the updated entry, or None for an unknown (or dropped) id
+        """
+        if outcome not in OUTCOMES:
+            raise ValueError(f"actual_outcome must be one of {', '.join(OUTCOMES)}")
+        with self._lock:
+            index = decision_id - self._first_id
+            if not 0 <= index < len(self._entries):
+                return None
+            old = self._entries[index]
+            updated = {**old, "actual_outcome": outcome}
+            if details is not None:
+                updated["outcome_details"] = details
+            self._count_outcome(old, -1)
+            self._count_outcome(updated, 1)
+            self._encoded[index] = fastjson.fragment(updated)
+            self._entries[index] = updated  # Swap, so readers never see a half-updated entry
+            self.version += 1
+            return updated
+
+    def _count_outcome(self, entry, sign):
+        if entry["actual_outcome"] == PENDING:
+            return
+        correct = entry["actual_outcome"] in CORRECT_OUTCOMES
+        bucket = self._buckets[min(int(entry["confidence"] * CALIBRATION_BUCKETS), CALIBRATION_BUCKETS - 1)]
+        bucket[0] += sign
+        bucket[1] += sign * correct
+        bucket[2] += sign * entry["confidence"]
+        self._resolved += sign
+        self._correct += sign * correct
+
+    # ----- reads -----
+
+    def page(self, since=None, until=None, recommendation=None, before=None, limit=20, encoded=False):
+        """
+        Newest-first page of decisions in [since, until) (ISO timestamps)
+        Returns (entries, next_cursor, matching total); pass next_cursor back
+        as `before` for the next page. With encoded=True the entries are
+        pre-encoded fastjson.Fragment values, for responses
+        """
+        with self._lock:
+            first = self._first_id
+            timestamps = self._timestamps
+            lo = first + (bisect.bisect_left(timestamps, since) if since else 0)
+            hi = first + (bisect.bisect_left(timestamps, until) if until else len(timestamps))
+            if before is not None:
+                hi = min(hi, max(before, first))
+            lo = min(lo, hi)
+
+            if recommendation is None:
+                start = max(lo, hi - limit)
+                ids = range(hi - 1, start - 1, -1)
+                total = hi - lo
+                next_cursor = start if start > lo else None
+            else:
+                index = self._by_recommendation.get(recommendation, [])
+                a, b = bisect.bisect_left(index, lo), bisect.bisect_left(index, hi)
+                start = max(a, b - limit)
+                ids = index[start:b][::-1]
+                total = b - a
+                next_cursor = index[start] if start > a else None
+
+            source = self._encoded if encoded else self._entries
+            return [source[i - first] for i in ids], next_cursor, total
+
+    def entries(self):
+        return list(self._entries)
+
+    def summary(self):
+        total = len(self._entries)
+        return {
+            "total_decisions": total,
+            "resolved_decisions": self._resolved,
+            "correct_decisions": self._correct,
+            "accuracy": round(self._correct / self._resolved * 100, 1) if self._resolved else 0,
+            "avg_confidence": round(self._confidence_sum / total, 2) if total else 0,
+            "calibration": [
+                {
+                    "confidence_range": [i / CALIBRATION_BUCKETS, (i + 1) / CALIBRATION_BUCKETS],
+                    "decisions": resolved,
+                    "avg_confidence": round(confidence / resolved, 3),
+                    "accuracy": round(correct / resolved, 3)
+                }
+                for i, (resolved, correct, confidence) in enumerate(self._buckets) if resolved
+            ]
+        }
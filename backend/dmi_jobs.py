@@ -0,0 +1,142 @@
+"""
+Process pool for CPU-heavy DMI work (long synthetic trends, large decision batches)
+
+    DMI_JOB_WORKERS=1     Worker processes (default: half the CPUs, at least 1)
+    DMI_JOB_QUEUE=16      Jobs queued or running at once; more are refused
+    DMI_JOB_RESULTS=100   Finished jobs kept for polling, oldest dropped first
+
+Generating a multi-year hourly series or scoring and explaining a big
+decision batch holds the GIL for tens to hundreds of milliseconds, which
+stalls the chat and agent-status requests on the process's other threads.
+Views hand such oversized requests to this pool instead and answer 202 with
+a job id at once; GET /api/dmi/jobs/<id> answers 202 until the job is done,
+then with the response the view would have sent. Workers return the encoded
+JSON body, so not even serialization is left to the serving process.
+
+The pool is built on first use (so preloaded gunicorn workers each get
+their own) and spawns its processes rather than forking a process that is
+running threads. Jobs live in the process that accepted them, like the
+metric store: run one gunicorn worker, or route a client's polls to the
+worker that took its job.
+"""
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+import fastjson
+
+
+class QueueFull(Exception):
+    pass
+
+
+def run_job(fn, args):
+    """
+    Worker side of a job: fn(*args), encoded
+    """
+    return fastjson.dumps(fn(*args))
+
+
+class Job:
+    """
+    A submitted job and its future
+    """
+
+    __slots__ = ("id", "kind", "submitted_at", "future")
+
+    def __init__(self, kind, future):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.submitted_at = datetime.now().isoformat()
+        self.future = future
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def describe(self):
+        info = {"job_id": self.id, "kind": self.kind, "status": self.status, "submitted_at": self.submitted_at}
+        if info["status"] == "failed":
+            info["error"] = str(self.future.exception()) or type(self.future.exception()).__name__
+        return info
+
+
+class JobPool:
+    """
+    Bounded process pool with pollable jobs
+    """
+
+    def __init__(self, workers=1, max_queued=16, keep=100):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.keep = keep
+        self._executor = None
+        self._jobs = OrderedDict()  # job id -> Job, oldest first
+        self._active = 0  # Queued or running
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def submit(self, kind, fn, *args):
+        """
+        Queue fn(*args) (top-level function, picklable arguments, returns a
+        JSON-serializable result); returns the Job. Raises QueueFull when
+        max_queued jobs are already waiting or running
+        """
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._lock:
+            if self._active >= self.max_queued:
+                raise QueueFull(f"{self._active} DMI jobs already queued or running")
+            try:
+                future = self._pool().submit(run_job, fn, args)
+            except BrokenProcessPool:  # A worker died; start over with a fresh pool
+                self._executor = None
+                future = self._pool().submit(run_job, fn, args)
+            self._active += 1
+            job = Job(kind, future)
+            self._jobs[job.id] = job
+            self._evict()
+        future.add_done_callback(self._finished)
+        return job
+
+    def _finished(self, future):
+        with self._lock:
+            self._active -= 1
+
+    def _evict(self):
+        done = [job_id for job_id, job in self._jobs.items() if job.future.done()]
+        for job_id in done[:max(0, len(done) - self.keep)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_jobs():
+    """
+    Shared job pool for this process, built on first use
+    """
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                _jobs = JobPool(
+                    workers=int(os.environ.get('DMI_JOB_WORKERS', max(1, (os.cpu_count() or 2) // 2))),
+                    max_queued=int(os.environ.get('DMI_JOB_QUEUE', 16)),
+                    keep=int(os.environ.get('DMI_JOB_RESULTS', 100))
+                )
+    return _jobs
@@ -0,0 +1,135 @@
+"""
+Declarative deployment-decision rules for the DMI dashboard
+
+The rule table (dmi_rules.json, or DMI_RULES_PATH) has:
+    checks              metric/op/threshold tests that raise a critical issue,
+                        a warning or a confidence factor
+    outcomes            in priority order: the first whose minimum critical /
+                        warning counts are met decides the recommendation
+    changes             "what changed" notes
+    supporting_factors  metrics echoed back with a healthy/warning status
+
+The table is compiled into NumPy comparisons over metric columns, so a batch
+of snapshots is scored with one pass per check rather than one Python call
+per snapshot. A missing metric (NaN) never triggers a check.
+"""
+import json
+import os
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dmi_rules.json')
+
+OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+class DecisionRules:
+    """
+    Compiled rule table: vectorized scoring plus full single-snapshot explanations
+    """
+
+    def __init__(self, table):
+        self.checks = table["checks"]
+        self.outcomes = table["outcomes"]
+        self.changes = table["changes"]
+        self.factors = table["supporting_factors"]
+        for rule in self.checks + self.changes:
+            if rule["op"] not in OPS:
+                raise ValueError(f"Unknown operator {rule['op']!r} in rule for {rule['metric']}")
+
+        self.metrics = sorted({rule["metric"] for rule in self.checks + self.changes + self.factors})
+        kinds = np.array([check["kind"] for check in self.checks])
+        self._critical = kinds == "critical"
+        self._warning = kinds == "warning"
+        self._recommendations = np.array([outcome["recommendation"] for outcome in self.outcomes])
+        self._urgencies = np.array([outcome["urgency"] for outcome in self.outcomes])
+        self._confidences = np.array([outcome["confidence"] for outcome in self.outcomes])
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def columns(self, snapshots):
+        """
+        Metric columns (float arrays, NaN where missing) from a list of snapshot dicts
+        """
+        return {
+            metric: np.array([snapshot.get(metric, np.nan) for snapshot in snapshots], dtype=float)
+            for metric in self.metrics
+        }
+
+    def _fire(self, rules, columns, n):
+        fired = np.zeros((len(rules), n), dtype=bool)
+        for i, rule in enumerate(rules):
+            column = columns.get(rule["metric"])
+            if column is not None:
+                fired[i] = OPS[rule["op"]](column, rule["threshold"])
+        return fired
+
+    def score(self, columns):
+        """
+        Score every snapshot in a set of equal-length metric columns
+        Returns arrays: outcome index, recommendation, urgency, confidence,
+        critical and warning counts
+        """
+        n = len(next(iter(columns.values()))) if columns else 0
+        fired = self._fire(self.checks, columns, n)
+        critical = fired[self._critical].sum(axis=0)
+        warnings = fired[self._warning].sum(axis=0)
+
+        conditions = [(critical >= outcome["min_critical"]) & (warnings >= outcome["min_warnings"])
+                      for outcome in self.outcomes]
+        outcome = np.select(conditions, np.arange(len(self.outcomes)), default=len(self.outcomes) - 1)
+        return {
+            "outcome": outcome,
+            "recommendation": self._recommendations[outcome],
+            "urgency": self._urgencies[outcome],
+            "confidence": self._confidences[outcome],
+            "critical": critical,
+            "warnings": warnings
+        }
+
+    def decide(self, snapshot):
+        """
+        Full decision for one snapshot: recommendation plus why / what changed
+        """
+        columns = {metric: np.array([snapshot.get(metric, np.nan)], dtype=float) for metric in self.metrics}
+        outcome = self.outcomes[int(self.score(columns)["outcome"][0])]
+        fired = self._fire(self.checks, columns, 1)[:, 0]
+
+        why = {"critical_issues": [], "warnings": [], "confidence_factors": []}
+        flagged = set()
+        for check, hit in zip(self.checks, fired):
+            if not hit:
+                continue
+            message = check["message"].format(value=snapshot[check["metric"]])
+            if check["kind"] == "critical":
+                why["critical_issues"].append(message)
+                flagged.add(check["metric"])
+            elif check["kind"] == "warning":
+                why["warnings"].append(message)
+                flagged.add(check["metric"])
+            else:
+                why["confidence_factors"].append(message)
+
+        changed = self._fire(self.changes, columns, 1)[:, 0]
+        what_changed = [change["message"] for change, hit in zip(self.changes, changed) if hit]
+
+        return {
+            "recommendation": outcome["recommendation"],
+            "confidence": outcome["confidence"],
+            "reasoning": outcome["reasoning"],
+            "urgency": outcome["urgency"],
+            "what_changed": what_changed or ["Metrics remain stable with no significant changes"],
+            "why": why,
+            "supporting_factors": [
+                {
+                    "metric": factor["name"],
+                    "value": factor["format"].format(value=snapshot[factor["metric"]]) if factor["format"]
+                    else snapshot[factor["metric"]],
+                    "status": "warning" if factor["metric"] in flagged else "healthy"
+                }
+                for factor in self.factors if factor["metric"] in snapshot
+            ]
+        }
@@ -0,0 +1,162 @@
+"""
+Synthetic DMI metric series (NumPy)
+
+A series is an AR(1) level that drifts and slowly reverts to the metric's
+baseline, plus per-point jitter and occasional injected anomalies - the whole
+thing built with array ops, so multi-year hourly series take milliseconds.
+Dates are real calendar timestamps ending now.
+
+Long series are reduced for charts with min/max bucket downsampling, which
+keeps every spike visible (unlike averaging) at a fixed point count.
+"""
+from datetime import datetime
+
+import numpy as np
+
+METRIC_CONFIGS = {
+    "build_time": {"base": 4.0, "variance": 0.8, "unit": "min", "min": 0.0},
+    "test_pass_rate": {"base": 90, "variance": 5, "unit": "%", "min": 0.0, "max": 100.0},
+    "deployment_frequency": {"base": 20, "variance": 8, "unit": "per week", "min": 0.0},
+    "code_coverage": {"base": 75, "variance": 5, "unit": "%", "min": 0.0, "max": 100.0},
+    "bug_count": {"base": 15, "variance": 6, "unit": "count", "min": 0.0}
+}
+
+# resolution -> (NumPy time unit of one step, unit dates are printed in)
+RESOLUTIONS = {
+    "day": ('D', 'D'),
+    "hour": ('h', 'm'),
+}
+
+MAX_DAYS = 3650
+ANOMALY_RATE_PER_DAY = 0.1
+DRIFT_GAIN = 0.7  # Share of each day's deviation carried into the level
+REVERSION_HALF_LIFE_DAYS = 30
+
+
+def ar1(innovations, phi, start=0.0, block=256):
+    """
+    x[i] = phi * x[i-1] + innovations[i], with x[-1] = start
+
+    Solved in closed form per block (x = phi^i * cumsum(e * phi^-i)); blocks
+    keep phi^-i from overflowing on long series.
+    """
+    out = np.empty_like(innovations, dtype=float)
+    powers = phi ** np.arange(1, block + 1)
+    carry = start
+    for begin in range(0, len(innovations), block):
+        chunk = innovations[begin:begin + block]
+        p = powers[:len(chunk)]
+        out[begin:begin + len(chunk)] = p * (carry + np.cumsum(chunk / p))
+        carry = out[begin + len(chunk) - 1]
+    return out
+
+
+def simulate(metric, n, resolution="day", rng=None, state=None):
+    """
+    n more points of a metric's series as (values, anomaly flags, state)
+    Pass the returned state back in to continue the same series later
+    """
+    config = METRIC_CONFIGS.get(metric, METRIC_CONFIGS["test_pass_rate"])
+    unit, _ = RESOLUTIONS[resolution]
+    step_days = np.timedelta64(1, unit) / np.timedelta64(1, 'D')
+    rng = rng if rng is not None else np.random.default_rng()
+    offset, last_noise = state if state is not None else (None, 0.0)
+
+    variance = config["variance"]
+    noise = rng.uniform(-variance / 2, variance / 2, n)
+    is_anomaly = rng.random(n) < ANOMALY_RATE_PER_DAY * step_days
+    noise[is_anomaly] += rng.uniform(-variance, variance, is_anomaly.sum())
+
+    # Level follows the previous points' deviations, reverting to the baseline
+    phi = 0.5 ** (step_days / REVERSION_HALF_LIFE_DAYS)
+    gain = DRIFT_GAIN * np.sqrt(step_days)
+    innovations = np.empty(n)
+    innovations[0] = 0.0 if offset is None else gain * last_noise
+    innovations[1:] = gain * noise[:-1]
+    level = ar1(innovations, phi, start=0.0 if offset is None else offset)
+
+    values = np.clip(config["base"] + level + noise, config.get("min", -np.inf), config.get("max", np.inf))
+    return values, is_anomaly, (level[-1], noise[-1])
+
+
+def series_length(days, resolution="day"):
+    """
+    Number of points in a generated series of days at resolution
+    """
+    unit, _ = RESOLUTIONS[resolution]
+    return max(1, int(round(days * (np.timedelta64(1, 'D') / np.timedelta64(1, unit)))))
+
+
+def generate_series(metric, days=14, resolution="day", seed=None, end=None):
+    """
+    (timestamps, values, anomaly flags) for a metric as NumPy arrays
+    """
+    unit, _ = RESOLUTIONS[resolution]
+    step = np.timedelta64(1, unit)
+    n = series_length(days, resolution)
+    values, is_anomaly, _ = simulate(metric, n, resolution, np.random.default_rng(seed))
+
+    end = np.datetime64(end or datetime.now(), unit)
+    timestamps = end - step * np.arange(n - 1, -1, -1)
+    return timestamps, values, is_anomaly
+
+
+def minmax_downsample(values, points):
+    """
+    Indices of the points to keep: the min and max of each of points/2
+    equal buckets, plus both endpoints, in order
+    """
+    n = len(values)
+    if n <= points:
+        return np.arange(n)
+
+    buckets = max(1, points // 2)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = values
+    rows = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    rows_ok = offsets < n
+    lows = np.nanargmin(rows[rows_ok], axis=1) + offsets[rows_ok]
+    highs = np.nanargmax(rows[rows_ok], axis=1) + offsets[rows_ok]
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def format_trend(timestamps, values, is_anomaly, resolution="day", points=500, fields=None):
+    """
+    Chart-ready trend: list of {date, value, is_anomaly} dicts, downsampled
+    to about `points` entries
+    fields limits the keys of each point (only those columns are built)
+    """
+    keep = minmax_downsample(values, points)
+
+    _, date_unit = RESOLUTIONS[resolution]
+    if fields is None:
+        dates = np.datetime_as_string(timestamps[keep], unit=date_unit).tolist()
+        rounded = np.round(values[keep], 2).tolist()
+        flags = is_anomaly[keep].tolist()
+        return [
+            {"date": date, "value": value, "is_anomaly": flag}
+            for date, value, flag in zip(dates, rounded, flags)
+        ]
+
+    trend = [{} for _ in keep]
+    columns = (
+        ("date", lambda: np.datetime_as_string(timestamps[keep], unit=date_unit).tolist()),
+        ("value", lambda: np.round(values[keep], 2).tolist()),
+        ("is_anomaly", lambda: is_anomaly[keep].tolist())
+    )
+    for key, column in columns:
+        if key in fields:
+            for point, value in zip(trend, column()):  # Column-wise fill beats dict(zip()) per point
+                point[key] = value
+    return trend
+
+
+def trend_points(metric, days=14, resolution="day", points=500, seed=None, fields=None):
+    """
+    Chart-ready trend for a freshly generated series, and the series length
+    before downsampling
+    """
+    timestamps, values, is_anomaly = generate_series(metric, days, resolution, seed)
+    return format_trend(timestamps, values, is_anomaly, resolution, points, fields), len(values)
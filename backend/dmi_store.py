@@ -0,0 +1,363 @@
+"""
+Time-series store behind the DMI dashboard metrics
+
+Each of the five metrics keeps hourly samples (seeded with DMI_HISTORY_DAYS
+of synthetic history, see dmi_series.py) and a new sample is appended every
+DMI_SAMPLE_SECONDS. Everything the endpoints read is maintained
+incrementally on append:
+
+- a rolling window (mean, stddev, and percentiles from a histogram sketch)
+- an index of anomaly points (samples more than ANOMALY_Z standard
+  deviations from the rolling mean)
+- daily rollups for day-resolution trends
+
+so metrics, trend and decision requests read precomputed summaries instead
+of recomputing them.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+import dmi_series
+
+METRIC_KEYS = ("build_time", "test_pass_rate", "deployment_frequency", "code_coverage", "bug_count")
+
+HOUR = np.timedelta64(1, 'h')
+DAY = np.timedelta64(1, 'D')
+
+WINDOW_HOURS = 7 * 24  # Rolling window for mean / stddev / percentiles
+PREVIOUS_LAG_HOURS = 7 * 24  # "previous" is the value one week earlier
+ANOMALY_Z = 3.0
+ANOMALY_MIN_SAMPLES = 24  # Don't flag anything until the window has a day of data
+SKETCH_BINS = 256
+MAX_CATCHUP_SAMPLES = 24 * 365  # Samples appended per sync at most
+
+
+class _Growable:
+    """
+    Append-only NumPy array with amortized O(1) appends
+    Views taken before a resize stay valid, so readers never see a torn array
+    """
+
+    def __init__(self, initial, dtype=None):
+        initial = np.asarray(initial, dtype=dtype)
+        self._data = np.empty(max(16, len(initial) * 2), dtype=initial.dtype)
+        self._data[:len(initial)] = initial
+        self._n = len(initial)
+
+    def append(self, value):
+        if self._n == len(self._data):
+            grown = np.empty(len(self._data) * 2, dtype=self._data.dtype)
+            grown[:self._n] = self._data[:self._n]
+            self._data = grown
+        self._data[self._n] = value
+        self._n += 1
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def view(self):
+        return self._data[:self._n]
+
+
+class RollingWindow:
+    """
+    Last `size` values with O(1) push, mean and stddev
+    Percentiles come from a fixed-bin histogram sketch over [low, high] that
+    supports eviction, so they cost O(bins) regardless of window size
+    """
+
+    def __init__(self, size, low, high, bins=SKETCH_BINS):
+        self.size = size
+        self.count = 0
+        self._ring = np.zeros(size)
+        self._head = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._low = low
+        self._width = (high - low) / bins
+        self._bins = np.zeros(bins, dtype=np.int64)
+
+    def _bin(self, value):
+        return min(max(int((value - self._low) / self._width), 0), len(self._bins) - 1)
+
+    def fill(self, values):
+        """
+        Reset the window to the last `size` of values (vectorized)
+        """
+        values = np.asarray(values, dtype=float)[-self.size:]
+        self.count = len(values)
+        self._ring[:self.count] = values
+        self._head = self.count % self.size
+        self._resum()
+        index = np.clip(((values - self._low) / self._width).astype(int), 0, len(self._bins) - 1)
+        self._bins = np.bincount(index, minlength=len(self._bins)).astype(np.int64)
+
+    def _resum(self):
+        live = self._ring[:self.count]
+        self._sum = float(live.sum())
+        self._sumsq = float((live * live).sum())
+
+    def push(self, value):
+        if self.count == self.size:
+            old = self._ring[self._head]
+            self._sum -= old
+            self._sumsq -= old * old
+            self._bins[self._bin(old)] -= 1
+        else:
+            self.count += 1
+        self._ring[self._head] = value
+        self._sum += value
+        self._sumsq += value * value
+        self._bins[self._bin(value)] += 1
+        self._head = (self._head + 1) % self.size
+        if self._head == 0:
+            self._resum()  # Drop accumulated floating point drift once per lap
+
+    @property
+    def mean(self):
+        return self._sum / self.count if self.count else 0.0
+
+    @property
+    def stddev(self):
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        return max(0.0, self._sumsq / self.count - mean * mean) ** 0.5
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self._bins), q / 100 * self.count))
+        return self._low + (min(index, len(self._bins) - 1) + 0.5) * self._width
+
+
+def rolling_anomalies(values, window=WINDOW_HOURS):
+    """
+    Flags for every point more than ANOMALY_Z stddevs from the mean of the
+    `window` points before it (vectorized twin of MetricSeries.append)
+    """
+    n = len(values)
+    flags = np.zeros(n, dtype=bool)
+    if n <= ANOMALY_MIN_SAMPLES:
+        return flags
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    sumsqs = np.concatenate(([0.0], np.cumsum(values * values)))
+    index = np.arange(ANOMALY_MIN_SAMPLES, n)
+    start = np.maximum(0, index - window)
+    count = index - start
+    mean = (sums[index] - sums[start]) / count
+    std = np.sqrt(np.maximum(0.0, (sumsqs[index] - sumsqs[start]) / count - mean * mean))
+    flags[index] = (std > 0) & (np.abs(values[index] - mean) > ANOMALY_Z * std)
+    return flags
+
+
+class MetricSeries:
+    """
+    Hourly samples for one metric plus its incrementally maintained summaries
+    Callers of append() hold `lock`; trend reads take it
+    """
+
+    def __init__(self, metric, timestamps, values, lock=None):
+        self.metric = metric
+        self._lock = lock or threading.Lock()
+        self.config = dmi_series.METRIC_CONFIGS[metric]
+        values = np.asarray(values, dtype=float)
+
+        self._timestamps = _Growable(timestamps, dtype='datetime64[h]')
+        self._values = _Growable(values)
+        self._anomalies = _Growable(np.flatnonzero(rolling_anomalies(values)), dtype=np.int64)
+
+        spread = 4 * self.config["variance"]
+        self._window = RollingWindow(WINDOW_HOURS,
+                                     max(self.config.get("min", -np.inf), self.config["base"] - spread),
+                                     min(self.config.get("max", np.inf), self.config["base"] + spread))
+        self._window.fill(values)
+
+        days = self._timestamps.view.astype('datetime64[D]')
+        self._first_day = days[0]
+        day_index = ((days - self._first_day) // DAY).astype(int)
+        flags = np.zeros(len(values))
+        flags[self._anomalies.view] = 1
+        self._day_sum = _Growable(np.bincount(day_index, weights=values))
+        self._day_count = _Growable(np.bincount(day_index).astype(float))
+        self._day_anomalies = _Growable(np.bincount(day_index, weights=flags))
+
+        self._summary = self._summarize()
+
+    def append(self, timestamp, value):
+        """
+        Add the next hourly sample; O(1) apart from the percentile lookups
+        """
+        window = self._window
+        index = len(self._values)
+        if (window.count >= ANOMALY_MIN_SAMPLES and window.stddev > 0
+                and abs(value - window.mean) > ANOMALY_Z * window.stddev):
+            self._anomalies.append(index)
+            is_anomaly = True
+        else:
+            is_anomaly = False
+
+        self._timestamps.append(timestamp)
+        self._values.append(value)
+        window.push(value)
+
+        day = int((np.datetime64(timestamp, 'D') - self._first_day) // DAY)
+        while len(self._day_sum) <= day:
+            self._day_sum.append(0.0)
+            self._day_count.append(0.0)
+            self._day_anomalies.append(0.0)
+        self._day_sum.view[day] += value
+        self._day_count.view[day] += 1
+        self._day_anomalies.view[day] += is_anomaly
+
+        self._summary = self._summarize()
+
+    def _summarize(self):
+        values = self._values.view
+        anomalies = self._anomalies.view
+        window = self._window
+        first_in_window = len(values) - window.count
+        return {
+            "current": float(values[-1]),
+            "previous": float(values[max(0, len(values) - 1 - PREVIOUS_LAG_HOURS)]),
+            "timestamp": str(self._timestamps.view[-1]),
+            "window": {
+                "hours": WINDOW_HOURS,
+                "mean": round(float(window.mean), 2),
+                "stddev": round(float(window.stddev), 2),
+                "p50": round(window.percentile(50), 2),
+                "p90": round(window.percentile(90), 2),
+                "p95": round(window.percentile(95), 2),
+                "anomalies": int(len(anomalies) - np.searchsorted(anomalies, first_in_window))
+            }
+        }
+
+    @property
+    def summary(self):
+        return self._summary
+
+    @property
+    def hours(self):
+        return len(self._values)
+
+    def trend(self, days, resolution="day"):
+        """
+        (timestamps, values, anomaly flags) for the last `days` days, as hourly
+        samples or daily means
+        """
+        with self._lock:
+            if resolution == "hour":
+                n = min(days * 24, len(self._values))
+                start = len(self._values) - n
+                anomalies = self._anomalies.view
+                flags = np.zeros(n, dtype=bool)
+                flags[anomalies[np.searchsorted(anomalies, start):] - start] = True
+                return self._timestamps.view[-n:], self._values.view[-n:], flags
+
+            # Today's rollup is updated in place, so compute from it before letting go
+            n = min(days, len(self._day_sum))
+            sums = self._day_sum.view[-n:]
+            counts = self._day_count.view[-n:]
+            means = np.divide(sums, counts, out=np.full(n, np.nan), where=counts > 0)
+            dates = self._first_day + np.arange(len(self._day_sum) - n, len(self._day_sum)) * DAY
+            return dates, means, self._day_anomalies.view[-n:] > 0
+
+    def anomaly_points(self, days):
+        """
+        Anomalies in the last `days` days as {date, value} dicts
+        """
+        with self._lock:
+            start = max(0, len(self._values) - days * 24)
+            anomalies = self._anomalies.view
+            index = anomalies[np.searchsorted(anomalies, start):]
+            timestamps, values = self._timestamps.view, self._values.view
+        dates = np.datetime_as_string(timestamps[index], unit='m').tolist()
+        values = np.round(values[index], 2).tolist()
+        return [{"date": date, "value": value} for date, value in zip(dates, values)]
+
+
+class DMIStore:
+    """
+    All metric series plus the clock that extends them
+
+    Sample k (after the seeded history) is due DMI_SAMPLE_SECONDS * k after
+    the store was created and is stamped one hour after the previous sample,
+    so with the default of 3600 metric time tracks wall-clock time; lower it
+    to watch the dashboard move.
+    """
+
+    def __init__(self, history_days=365, sample_seconds=3600, seed=None):
+        self.sample_seconds = sample_seconds
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self.version = 0  # Bumped whenever samples are appended
+
+        n = max(history_days * 24, PREVIOUS_LAG_HOURS + 1)
+        end = np.datetime64(datetime.now(), 'h')
+        timestamps = end - np.arange(n - 1, -1, -1) * HOUR
+        self._series = {}
+        self._states = {}
+        for key in METRIC_KEYS:
+            values, _, self._states[key] = dmi_series.simulate(key, n, "hour", self._rng)
+            self._series[key] = MetricSeries(key, timestamps, values, self._lock)
+        self._last_timestamp = end
+        self._started = time.monotonic()
+        self._emitted = 0
+
+    def sync(self):
+        """
+        Append the samples that have come due since the last call
+        """
+        due = int((time.monotonic() - self._started) / self.sample_seconds)
+        if due <= self._emitted:
+            return
+        with self._lock:
+            count = min(due - self._emitted, MAX_CATCHUP_SAMPLES)
+            if count <= 0:
+                return
+            for key, series in self._series.items():
+                values, _, self._states[key] = dmi_series.simulate(key, count, "hour", self._rng, self._states[key])
+                for i, value in enumerate(values.tolist(), 1):
+                    series.append(self._last_timestamp + i * HOUR, value)
+            self._last_timestamp += count * HOUR
+            self._emitted = due
+            self.version += 1
+
+    def series(self, metric):
+        self.sync()
+        return self._series[metric]
+
+    def summaries(self):
+        """
+        (version, {metric: summary}) read together under the store lock, so
+        a version always tags the summaries it was bumped for
+        """
+        self.sync()
+        with self._lock:
+            return self.version, {key: series.summary for key, series in self._series.items()}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Shared store, built on first use (seeding the history takes a moment)
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                seed = os.environ.get('DMI_SEED')
+                _store = DMIStore(
+                    history_days=int(os.environ.get('DMI_HISTORY_DAYS', 365)),
+                    sample_seconds=float(os.environ.get('DMI_SAMPLE_SECONDS', 3600)),
+                    seed=int(seed) if seed else None
+                )
+    return _store
@@ -0,0 +1,68 @@
+"""
+Agent state deltas for the Server-Sent Events stream (/api/agent/events)
+
+Every change the agent makes (subtask progress, new log entry, status
+change) is published as a small event with a monotonically increasing id.
+Events are kept in a bounded ring buffer so a reconnecting client can send
+Last-Event-ID and receive only what it missed.
+"""
+import threading
+from collections import deque
+from itertools import islice
+
+import fastjson
+
+
+class AgentEventBus:
+    """
+    Bounded, thread-safe buffer of agent events
+    """
+
+    def __init__(self, maxlen=1000):
+        self._events = deque(maxlen=maxlen)
+        self._last_id = 0
+        self._cond = threading.Condition()
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, event_type, data):
+        """
+        Record an event; data is serialized immediately so later mutation
+        of the agent state cannot leak into already-published events
+        """
+        payload = fastjson.dumps(data).decode('utf-8')
+        with self._cond:
+            self._last_id += 1
+            self._events.append((self._last_id, event_type, payload))
+            self._cond.notify_all()
+            return self._last_id
+
+    def since(self, last_id):
+        """
+        Events newer than last_id, or None if some have already been evicted
+        (the client must then start over from a full snapshot)
+        """
+        with self._cond:
+            if last_id == self._last_id:
+                return []
+            if last_id > self._last_id:
+                # Id from before a server restart
+                return None
+            oldest = self._events[0][0] if self._events else self._last_id + 1
+            if last_id < oldest - 1:
+                return None
+            # Ids are contiguous, so the first missed event sits at a known offset
+            return list(islice(self._events, max(0, last_id - oldest + 1), None))
+
+    def wait(self, last_id, timeout):
+        """
+        Block until an event newer than last_id is published (or timeout)
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._last_id > last_id, timeout)
+
+
+def format_sse(event_id, event_type, payload):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
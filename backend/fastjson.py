@@ -0,0 +1,100 @@
+"""
+JSON encoding for API responses, with pre-encoded fragments
+
+With orjson installed, encoding goes through its C encoder; without it, the
+stdlib encoder with compact separators. Either way dumps() returns UTF-8
+bytes, ready to be a response body.
+
+Parts of a payload that rarely change (an intent's sources and tools, a
+stored history entry, a logged decision) can be encoded once and wrapped in
+a Fragment. A Fragment embedded anywhere in a later payload is copied into
+the output verbatim instead of being re-encoded:
+
+    sources = fragment(intent["sources"])            # once, at load
+    dumps({"sources": sources, "confidence": 0.82})  # per request
+
+members() and splice() do the same for the fields of an object: encode the
+static fields once, then add the dynamic ones per request.
+"""
+import json
+import re
+import uuid
+
+try:
+    import orjson
+except ImportError:  # Optional C extension
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    Fragment = orjson.Fragment
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj):
+        """
+        Compact JSON encoding of obj (bytes)
+        """
+        return orjson.dumps(obj, option=_OPTIONS)
+
+    loads = orjson.loads
+
+else:
+    class Fragment:
+        """
+        Already-encoded JSON, embedded as-is by dumps()
+        """
+
+        __slots__ = ("contents",)
+
+        def __init__(self, contents):
+            self.contents = contents.encode('utf-8') if isinstance(contents, str) else contents
+
+    # Fragments are encoded as placeholder strings, then substituted; the
+    # per-process token keeps a user string from ever matching a placeholder
+    _PLACEHOLDER = f"\x00fragment-{uuid.uuid4().hex}-"
+    _PLACEHOLDER_RE = re.compile(re.escape(json.dumps(_PLACEHOLDER)[:-1]) + r'(\d+)"')
+
+    def dumps(obj):
+        """
+        Compact JSON encoding of obj (bytes)
+        """
+        fragments = []
+
+        def default(value):
+            if isinstance(value, Fragment):
+                fragments.append(value.contents.decode('utf-8'))
+                return f"{_PLACEHOLDER}{len(fragments) - 1}"
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default)
+        if fragments:
+            text = _PLACEHOLDER_RE.sub(lambda match: fragments[int(match.group(1))], text)
+        return text.encode('utf-8')
+
+    loads = json.loads
+
+
+def fragment(obj):
+    """
+    obj encoded once, for embedding in later payloads
+    """
+    return Fragment(dumps(obj))
+
+
+def members(obj):
+    """
+    The encoded fields of a dict without the surrounding braces, for splice()
+    """
+    return dumps(obj)[1:-1]
+
+
+def splice(static, dynamic):
+    """
+    Encoded object made of pre-encoded members plus the dynamic fields
+    """
+    if not static:
+        return dumps(dynamic)
+    if not dynamic:
+        return b'{' + static + b'}'
+    return b'{' + static + b',' + dumps(dynamic)[1:]
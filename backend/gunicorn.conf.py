@@ -0,0 +1,60 @@
+"""
+Gunicorn settings, all overridable from the environment
+
+    gunicorn -c gunicorn.conf.py
+
+SERVER_MODE             wsgi (default): threaded Flask workers (gthread)
+                        asgi: uvicorn workers running asgi:app, so chats and
+                        event streams wait on the event loop, not a thread
+WEB_CONCURRENCY         Worker processes (default 1). STORAGE_BACKEND=sqlite
+                        shares history and agent state between workers, but
+                        the agent event bus and scheduler, the DMI store and
+                        decision log and the response cache are still per
+                        process, so several workers aren't consistent yet
+GUNICORN_THREADS        Threads per gthread worker (default 16)
+GUNICORN_KEEPALIVE      Seconds to hold idle keep-alive connections (default 5)
+GUNICORN_TIMEOUT        Seconds before a silent worker is restarted (default 60)
+GUNICORN_GRACEFUL_TIMEOUT
+                        Seconds in-flight requests get to finish on shutdown
+                        or reload (default 30)
+GUNICORN_MAX_REQUESTS   Recycle workers after this many requests (default 0, off)
+"""
+import os
+
+mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+if mode not in ('wsgi', 'asgi'):
+    raise ValueError(f"Unknown SERVER_MODE: {mode}")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+if mode == 'asgi':
+    wsgi_app = 'asgi:app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'wsgi:app'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Import the app once in the master so workers fork with it loaded (storage
+# connections and background threads are created lazily per process)
+preload_app = True
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def worker_exit(server, worker):
+    """
+    Flush buffered history writes before a worker goes away
+    """
+    import storage
+    storage.close_storage()
@@ -0,0 +1,130 @@
+"""
+Keyword intent router for the chatbot
+
+Intent rules live in a JSON table (intents.json, or CHATBOT_INTENTS_PATH),
+listed in priority order: the first intent with any keyword appearing in the
+message wins. The table is compiled once into a matcher and reloaded
+automatically when the file changes.
+
+With pyahocorasick installed the matcher is an Aho-Corasick automaton that
+finds every keyword in a single pass over the message. Without it, keywords
+are checked in priority order with `in` - CPython's substring search beats a
+combined `re` alternation for a table this size (see benchmarks/bench_intents.py).
+
+Each intent's fixed reply lists (sources, tools_used) are also kept
+pre-encoded under intent["encoded"], so replies embed them without
+re-serializing (see fastjson.py).
+"""
+import json
+import os
+import threading
+import time
+
+import fastjson
+
+try:
+    import ahocorasick
+except ImportError:  # Optional C extension
+    ahocorasick = None
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intents.json')
+ENCODED_FIELDS = ("sources", "tools_used")
+
+
+def compile_intents(intents):
+    """
+    Build a matcher for an ordered list of intents
+    Returns a function mapping a lower-cased message to the winning intent index
+    """
+    keyword_intent = {}
+    for index, intent in enumerate(intents):
+        for keyword in intent["keywords"]:
+            keyword_intent.setdefault(keyword.lower(), index)
+
+    # A keyword containing another keyword of equal or higher priority can never
+    # change the outcome ("authentication" already implies "auth")
+    keyword_intent = {
+        keyword: index for keyword, index in keyword_intent.items()
+        if not any(other != keyword and other in keyword and keyword_intent[other] <= index
+                   for other in keyword_intent)
+    }
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword, index in keyword_intent.items():
+            automaton.add_word(keyword, index)
+        automaton.make_automaton()
+
+        def match(msg_lower):
+            best = None
+            for _, index in automaton.iter(msg_lower):
+                if best is None or index < best:
+                    best = index
+                    if best == 0:
+                        break
+            return best
+    else:
+        ordered = sorted(keyword_intent.items(), key=lambda item: item[1])
+
+        def match(msg_lower):
+            for keyword, index in ordered:
+                if keyword in msg_lower:
+                    return index
+            return None
+
+    return match
+
+
+class IntentRouter:
+    """
+    Single-pass classifier over a hot-reloadable intent table
+    """
+
+    def __init__(self, path=DEFAULT_PATH, reload_interval=1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.version = 0  # Bumped on every (re)load
+        self._load()
+
+    def _load(self):
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path) as f:
+            intents = json.load(f)["intents"]
+        for intent in intents:
+            intent["encoded"] = {field: fastjson.fragment(intent[field]) for field in ENCODED_FIELDS}
+
+        # Swap in the new table atomically; readers never see a half-built one
+        self._compiled = (intents, compile_intents(intents))
+        self._mtime = mtime
+        self.version += 1
+
+    def maybe_reload(self):
+        """
+        Reload the table if the file changed (checked at most once per interval)
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                if os.stat(self.path).st_mtime != self._mtime:
+                    self._load()
+            except (OSError, ValueError, KeyError):
+                pass  # Keep serving the last good table while the file is being edited
+
+    def classify(self, msg_lower):
+        """
+        Winning intent dict for a lower-cased message, or None
+        """
+        self.maybe_reload()
+        intents, match = self._compiled
+        index = match(msg_lower)
+        return intents[index] if index is not None else None
+
+    @property
+    def intents(self):
+        return self._compiled[0]
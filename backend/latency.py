@@ -0,0 +1,91 @@
+"""
+Latency profiles for simulated chatbot "think time"
+
+Configured with the CHATBOT_LATENCY environment variable:
+    off                     No delay
+    fixed:0.8               Always wait 0.8 seconds
+    uniform:0.5,1.5         Random delay between 0.5 and 1.5 seconds (default)
+    replay:latencies.json   Sample from a recorded distribution (JSON list of seconds)
+
+The same profile drives both serving modes: sleep() blocks the calling
+thread (Flask / WSGI) and async_sleep() awaits on the event loop (asgi.py).
+"""
+import asyncio
+import json
+import os
+import random
+import time
+
+DEFAULT_SPEC = 'uniform:0.5,1.5'
+
+
+class LatencyProfile:
+    """
+    Source of simulated delays, in seconds
+    """
+
+    def __init__(self, mode='uniform', low=0.5, high=1.5, samples=None):
+        if mode not in ('off', 'fixed', 'uniform', 'replay'):
+            raise ValueError(f"Unknown latency mode: {mode}")
+        if mode == 'replay' and not samples:
+            raise ValueError("Replay latency profile needs at least one recorded sample")
+        self.mode = mode
+        self.low = low
+        self.high = high
+        self.samples = list(samples or [])
+
+    def sample(self):
+        if self.mode == 'off':
+            return 0.0
+        if self.mode == 'fixed':
+            return self.low
+        if self.mode == 'replay':
+            return random.choice(self.samples)
+        return random.uniform(self.low, self.high)
+
+    def sleep(self):
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def async_sleep(self):
+        delay = self.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def describe(self):
+        if self.mode == 'fixed':
+            return {"mode": "fixed", "seconds": self.low}
+        if self.mode == 'uniform':
+            return {"mode": "uniform", "low": self.low, "high": self.high}
+        if self.mode == 'replay':
+            return {"mode": "replay", "samples": len(self.samples)}
+        return {"mode": "off"}
+
+
+def parse_profile(spec):
+    """
+    Build a LatencyProfile from a spec string such as 'uniform:0.5,1.5'
+    """
+    mode, _, args = spec.strip().partition(':')
+    mode = mode.lower()
+
+    if mode in ('', 'off', 'none', '0'):
+        return LatencyProfile('off')
+    if mode == 'fixed':
+        return LatencyProfile('fixed', low=float(args))
+    if mode == 'uniform':
+        low, high = (float(v) for v in args.split(','))
+        return LatencyProfile('uniform', low=min(low, high), high=max(low, high))
+    if mode == 'replay':
+        with open(args) as f:
+            samples = [float(v) for v in json.load(f)]
+        return LatencyProfile('replay', samples=samples)
+
+    raise ValueError(f"Unknown latency profile: {spec}")
+
+
+def profile_from_env():
+    return parse_profile(os.environ.get('CHATBOT_LATENCY', DEFAULT_SPEC))
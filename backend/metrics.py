@@ -0,0 +1,153 @@
+"""
+Request metrics in Prometheus text format, plus per-request Server-Timing
+
+Histograms kept for the life of the process:
+    http_request_duration_seconds{method, route, status}
+    http_response_size_bytes{method, route}
+    http_request_phase_seconds{phase}   sleep (simulated think time), tools
+                                        (simulated tool calls), overlap (tool
+                                        time during the think time), intent
+                                        (keyword matching), serialize (JSON
+                                        encoding), compress (gzip/brotli),
+                                        lock (agent lock waits)
+    agent_lock_wait_seconds             every agent lock acquisition, including
+                                        the scheduler's
+
+Code that wants a phase timed wraps it in `with phase("name"):`. Inside a
+request the duration is also collected for that request's Server-Timing
+header (see begin_request / end_request); outside one it only feeds the
+histogram. Nothing here depends on Flask, so agents.py and the async entry
+point record into the same registry.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+LOCK_BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram keyed by label values
+    """
+
+    def __init__(self, name, help, buckets, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((values, list(counts), total) for values, (counts, total) in self._series.items())
+        for values, counts, total in series:
+            labels = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.labels, values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_duration = Histogram("http_request_duration_seconds", "Request latency",
+                             LATENCY_BUCKETS, ("method", "route", "status"))
+response_size = Histogram("http_response_size_bytes", "Response body size",
+                          SIZE_BUCKETS, ("method", "route"))
+phase_duration = Histogram("http_request_phase_seconds", "Time spent in each request phase",
+                           LATENCY_BUCKETS, ("phase",))
+lock_wait = Histogram("agent_lock_wait_seconds", "Time spent waiting for an agent lock", LOCK_BUCKETS)
+
+REGISTRY = (request_duration, response_size, phase_duration, lock_wait)
+
+_phases = contextvars.ContextVar('request_phases', default=None)
+
+
+def begin_request():
+    """
+    Start collecting phases for the current request; returns a token for end_request
+    """
+    return _phases.set([]), time.perf_counter()
+
+
+def end_request(token, method, route, status, size=None):
+    """
+    Record the finished request; returns its Server-Timing header value
+    """
+    reset_token, start = token
+    elapsed = time.perf_counter() - start
+    phases = _phases.get() or []
+    _phases.reset(reset_token)
+
+    request_duration.observe(elapsed, method, route, str(status))
+    if size is not None:
+        response_size.observe(size, method, route)
+    return server_timing(phases, elapsed)
+
+
+def record_phase(name, seconds):
+    phase_duration.observe(seconds, name)
+    phases = _phases.get()
+    if phases is not None:
+        phases.append((name, seconds))
+
+
+@contextmanager
+def phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def observe_lock_wait(seconds):
+    lock_wait.observe(seconds)
+    record_phase("lock", seconds)
+
+
+def server_timing(phases, total):
+    """
+    Server-Timing header value: one entry per phase (repeats summed) plus total
+    """
+    durations = {}
+    for name, seconds in phases:
+        durations[name] = durations.get(name, 0.0) + seconds
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in durations.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def render():
+    """
+    All metrics in Prometheus text exposition format
+    """
+    lines = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
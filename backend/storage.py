@@ -0,0 +1,466 @@
+"""
+Pluggable storage for chatbot history and agent state
+
+    STORAGE_BACKEND=memory   In-process (default); state is lost on restart and
+                             every worker process has its own copy
+    STORAGE_BACKEND=sqlite   SQLite in WAL mode at STORAGE_PATH (default
+                             mock_api.db); survives restarts and is shared by
+                             all worker processes on the host
+
+Both backends expose the same interface:
+    append_message(context_id, entry)    entry may embed fastjson.Fragment values
+    history_page(context_id=None, limit=10, before=None) -> (entries, next_cursor, total)
+                                         entries are JSON bytes (encoded once, at append)
+    load_agent_state(agent_id) -> dict or None (read-only)
+    agent_snapshot(agent_id) -> AgentSnapshot or None
+    list_agents() -> list of agent ids
+    agent_transaction(agent_id, default) -> context manager yielding the state to mutate
+    append_action(agent_id, entry)       entry["seq"] increases by one per append
+    trim_actions(agent_id, before_seq)   drop entries older than before_seq
+    action_log_page(agent_id, since=0, limit=100) -> (entries with seq > since, has_more)
+    flush(), close()
+
+Agent action logs are append-only and kept outside the agent state, so a
+long-running agent's state (and each transaction on it) stays small.
+
+Agent state is copy-on-write: a transaction mutates a fresh copy and, on
+commit, publishes a new AgentSnapshot in place of the old one. Readers
+take the current snapshot without locking and never see a half-applied
+update; the snapshot also carries the state's JSON encoding, so status
+responses are not re-serialized per poll.
+
+Encoding goes through fastjson.py (orjson when installed).
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import fastjson
+from conversation_store import ConversationHistory
+
+
+class AgentSnapshot:
+    """
+    Published agent state: never mutated once created
+    version increases by one with every committed transaction
+    """
+
+    __slots__ = ("version", "state", "body")
+
+    def __init__(self, version, state, body):
+        self.version = version
+        self.state = state
+        self.body = body  # JSON encoding of state (bytes)
+
+
+class MemoryStorage:
+    """
+    Process-local storage backed by plain Python objects
+    """
+
+    def __init__(self, per_context=100, max_contexts=1000, ttl_seconds=3600):
+        self.history = ConversationHistory(per_context, max_contexts, ttl_seconds)
+        self._agents = {}  # agent_id -> AgentSnapshot
+        self._actions = {}  # agent_id -> entries, contiguous ascending seq
+        self._lock = threading.RLock()
+
+    def append_message(self, context_id, entry):
+        self.history.append(context_id, fastjson.dumps(entry))
+
+    def history_page(self, context_id=None, limit=10, before=None):
+        return self.history.page(context_id, limit, before)
+
+    def load_agent_state(self, agent_id):
+        snapshot = self._agents.get(agent_id)
+        return snapshot.state if snapshot is not None else None
+
+    def agent_snapshot(self, agent_id):
+        return self._agents.get(agent_id)
+
+    def list_agents(self):
+        return list(self._agents)
+
+    @contextmanager
+    def agent_transaction(self, agent_id, default):
+        with self._lock:
+            current = self._agents.get(agent_id)
+            state = fastjson.loads(current.body) if current is not None else default()
+            yield state
+            version = current.version + 1 if current is not None else 1
+            self._agents[agent_id] = AgentSnapshot(version, state, fastjson.dumps(state))
+
+    def append_action(self, agent_id, entry):
+        with self._lock:
+            self._actions.setdefault(agent_id, []).append(entry)
+
+    def trim_actions(self, agent_id, before_seq):
+        with self._lock:
+            entries = self._actions.get(agent_id, [])
+            self._actions[agent_id] = [entry for entry in entries if entry["seq"] >= before_seq]
+
+    def action_log_page(self, agent_id, since=0, limit=100):
+        entries = self._actions.get(agent_id, [])
+        if not entries:
+            return [], False
+        start = max(0, since - entries[0]["seq"] + 1)
+        return entries[start:start + limit], len(entries) > start + limit
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage:
+    """
+    SQLite (WAL) storage shared by every process that opens the same file
+
+    Message appends are buffered and written in batches by a background
+    thread (one transaction + executemany per batch), which also applies the
+    same bounds as ConversationHistory: per_context messages per context, at
+    most max_contexts contexts (least recently written dropped first) and
+    none idle for more than ttl_seconds. Agent state is written
+    synchronously inside BEGIN IMMEDIATE so concurrent workers serialize
+    their read-modify-write cycles.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            context_id TEXT NOT NULL,
+            body TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS messages_context ON messages (context_id, id);
+        CREATE TABLE IF NOT EXISTS message_counts (
+            context_id TEXT PRIMARY KEY,
+            total INTEGER NOT NULL,
+            last_seen REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS agent_state (
+            agent_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            body TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS agent_actions (
+            agent_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (agent_id, seq)
+        ) WITHOUT ROWID;
+    """
+
+    # Statements are kept as constants so sqlite3's per-connection statement
+    # cache reuses the prepared form instead of re-parsing
+    INSERT_MESSAGE = "INSERT INTO messages (context_id, body) VALUES (?, ?)"
+    COUNT_MESSAGES = ("INSERT INTO message_counts (context_id, total, last_seen) VALUES (?, ?, ?) "
+                      "ON CONFLICT (context_id) DO UPDATE SET total = total + excluded.total, "
+                      "last_seen = excluded.last_seen")
+    PRUNE_CONTEXT = ("DELETE FROM messages WHERE context_id = ? AND id <= "
+                     "(SELECT id FROM messages WHERE context_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)")
+    # Contexts idle since before ? plus the least recently written beyond the first ? (the '*' row excluded)
+    STALE_CONTEXTS = ("SELECT context_id FROM message_counts WHERE context_id != ? AND last_seen < ? "
+                      "UNION SELECT context_id FROM ("
+                      "SELECT context_id FROM message_counts WHERE context_id != ? "
+                      "ORDER BY last_seen DESC LIMIT -1 OFFSET ?)")
+    DROP_MESSAGES = "DELETE FROM messages WHERE context_id = ?"
+    DROP_COUNT = "DELETE FROM message_counts WHERE context_id = ?"
+    PAGE_CONTEXT = "SELECT id, body FROM messages WHERE context_id = ? AND id < ? ORDER BY id DESC LIMIT ?"
+    PAGE_ALL = "SELECT id, body FROM messages WHERE id < ? ORDER BY id DESC LIMIT ?"
+    OLDER_CONTEXT = "SELECT 1 FROM messages WHERE context_id = ? AND id < ? LIMIT 1"
+    OLDER_ALL = "SELECT 1 FROM messages WHERE id < ? LIMIT 1"
+    TOTAL = "SELECT total FROM message_counts WHERE context_id = ?"
+    LIST_AGENTS = "SELECT agent_id FROM agent_state ORDER BY agent_id"
+    LOAD_AGENT = "SELECT version, CASE WHEN version != ? THEN body END FROM agent_state WHERE agent_id = ?"
+    SAVE_AGENT = ("INSERT INTO agent_state (agent_id, version, body) VALUES (?, 1, ?) "
+                  "ON CONFLICT (agent_id) DO UPDATE SET version = version + 1, body = excluded.body")
+    INSERT_ACTION = "INSERT OR REPLACE INTO agent_actions (agent_id, seq, body) VALUES (?, ?, ?)"
+    TRIM_ACTIONS = "DELETE FROM agent_actions WHERE agent_id = ? AND seq < ?"
+    PAGE_ACTIONS = "SELECT body FROM agent_actions WHERE agent_id = ? AND seq > ? ORDER BY seq LIMIT ?"
+
+    ALL_CONTEXTS = '*'
+
+    def __init__(self, path='mock_api.db', per_context=100, max_contexts=1000, ttl_seconds=3600,
+                 pool_size=4, batch_size=200, flush_interval=0.05):
+        self.path = path
+        self.per_context = per_context
+        self.max_contexts = max_contexts
+        self.ttl_seconds = ttl_seconds
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending = []
+        self._pending_lock = threading.Condition()
+        self._agent_cache = {}  # agent_id -> AgentSnapshot
+        self._txn = threading.local()  # Connection of this thread's open agent transaction
+        self._pid = None
+        self._closed = False
+
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        if 'last_seen' not in [row[1] for row in conn.execute("PRAGMA table_info(message_counts)")]:
+            # Database from before context eviction
+            conn.execute("ALTER TABLE message_counts ADD COLUMN last_seen REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS message_counts_seen ON message_counts (last_seen)")
+        conn.close()
+
+    # ----- connections -----
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_process(self):
+        """
+        Connections and the writer thread must not cross a fork (gunicorn
+        preloads the app), so they are created lazily per process
+        """
+        if self._pid == os.getpid():
+            return
+        with self._pending_lock:
+            if self._pid == os.getpid():
+                return
+            self._pool = queue.LifoQueue()
+            self._pool_created = 0
+            self._pending = []
+            self._agent_cache = {}
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+            self._pid = os.getpid()
+
+    @contextmanager
+    def _connection(self):
+        self._ensure_process()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pending_lock:
+                grow = self._pool_created < self.pool_size
+                if grow:
+                    self._pool_created += 1
+            conn = self._connect() if grow else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    # ----- chatbot history -----
+
+    def append_message(self, context_id, entry):
+        self._ensure_process()
+        row = (context_id, fastjson.dumps(entry).decode('utf-8'), time.time())
+        with self._pending_lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._pending_lock.notify()
+
+    def history_page(self, context_id=None, limit=10, before=None):
+        self.flush()  # Read-your-writes for this process
+        before = before if before is not None else 2 ** 63 - 1
+        with self._connection() as conn:
+            if context_id is None:
+                rows = conn.execute(self.PAGE_ALL, (before, limit)).fetchall()
+            else:
+                rows = conn.execute(self.PAGE_CONTEXT, (context_id, before, limit)).fetchall()
+            total = conn.execute(self.TOTAL, (context_id or self.ALL_CONTEXTS,)).fetchone()
+
+            next_cursor = None
+            if rows:
+                oldest = rows[-1][0]
+                older = (conn.execute(self.OLDER_ALL, (oldest,)) if context_id is None
+                         else conn.execute(self.OLDER_CONTEXT, (context_id, oldest))).fetchone()
+                next_cursor = oldest if older else None
+
+        entries = [body.encode('utf-8') for _, body in reversed(rows)]
+        return entries, next_cursor, total[0] if total else 0
+
+    def flush(self):
+        self._ensure_process()
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write_batch(batch)
+
+    def _write_loop(self):
+        while not self._closed:
+            with self._pending_lock:
+                self._pending_lock.wait_for(lambda: len(self._pending) >= self.batch_size or self._closed,
+                                            self.flush_interval)
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        counts = {}  # context_id -> [messages, time of the last one]
+        for context_id, _, seen in batch:
+            count = counts.setdefault(context_id, [0, seen])
+            count[0] += 1
+            count[1] = seen
+
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(self.INSERT_MESSAGE, [(context_id, body) for context_id, body, _ in batch])
+                conn.executemany(self.COUNT_MESSAGES,
+                                 [(context_id, total, seen) for context_id, (total, seen) in counts.items()]
+                                 + [(self.ALL_CONTEXTS, len(batch), batch[-1][2])])
+                conn.executemany(self.PRUNE_CONTEXT,
+                                 [(context_id, context_id, self.per_context) for context_id in counts])
+                stale = conn.execute(self.STALE_CONTEXTS, (self.ALL_CONTEXTS, time.time() - self.ttl_seconds,
+                                                           self.ALL_CONTEXTS, self.max_contexts)).fetchall()
+                conn.executemany(self.DROP_MESSAGES, stale)
+                conn.executemany(self.DROP_COUNT, stale)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # ----- agent state -----
+
+    def load_agent_state(self, agent_id):
+        snapshot = self.agent_snapshot(agent_id)
+        return snapshot.state if snapshot is not None else None
+
+    def agent_snapshot(self, agent_id):
+        """
+        Current snapshot, re-decoded only when another writer has changed it
+        """
+        cached = self._agent_cache.get(agent_id)
+        with self._connection() as conn:
+            row = conn.execute(self.LOAD_AGENT, (cached.version if cached else 0, agent_id)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None:
+            cached = self._agent_cache[agent_id] = AgentSnapshot(row[0], fastjson.loads(row[1]), row[1].encode('utf-8'))
+        return cached
+
+    def list_agents(self):
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(self.LIST_AGENTS)]
+
+    @contextmanager
+    def agent_transaction(self, agent_id, default):
+        cached = self._agent_cache.get(agent_id)
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(self.LOAD_AGENT, (cached.version if cached else 0, agent_id)).fetchone()
+                if row is None:
+                    version, state = 0, default()
+                elif row[1] is None:
+                    version, state = cached.version, fastjson.loads(cached.body)
+                else:
+                    version, state = row[0], fastjson.loads(row[1])
+                self._txn.conn = conn
+                yield state
+                body = fastjson.dumps(state)
+                conn.execute(self.SAVE_AGENT, (agent_id, body.decode('utf-8')))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._txn.conn = None
+        self._agent_cache[agent_id] = AgentSnapshot(version + 1, state, body)
+
+    @contextmanager
+    def _action_connection(self):
+        """
+        Log writes join the agent transaction they are made in, if any
+        """
+        conn = getattr(self._txn, 'conn', None)
+        if conn is not None:
+            yield conn
+        else:
+            with self._connection() as conn:
+                yield conn
+
+    def append_action(self, agent_id, entry):
+        with self._action_connection() as conn:
+            conn.execute(self.INSERT_ACTION, (agent_id, entry["seq"], fastjson.dumps(entry).decode('utf-8')))
+
+    def trim_actions(self, agent_id, before_seq):
+        with self._action_connection() as conn:
+            conn.execute(self.TRIM_ACTIONS, (agent_id, before_seq))
+
+    def action_log_page(self, agent_id, since=0, limit=100):
+        with self._connection() as conn:
+            rows = conn.execute(self.PAGE_ACTIONS, (agent_id, since, limit + 1)).fetchall()
+        return [fastjson.loads(body) for body, in rows[:limit]], len(rows) > limit
+
+    def close(self):
+        """
+        Flush pending messages, stop the writer thread and close this
+        process's pooled connections; the next call opens them again
+        """
+        if self._pid != os.getpid():
+            return  # Nothing opened in this process
+        with self._pending_lock:
+            self._closed = True
+            self._pending_lock.notify()
+        self._writer.join()
+        self.flush()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._pid = None
+        self._closed = False
+
+
+def create_storage():
+    """
+    Build the storage backend selected by STORAGE_BACKEND
+    """
+    backend = os.environ.get('STORAGE_BACKEND', 'memory').lower()
+    per_context = int(os.environ.get('CHAT_HISTORY_PER_CONTEXT', 100))
+
+    if backend == 'memory':
+        return MemoryStorage(
+            per_context=per_context,
+            max_contexts=int(os.environ.get('CHAT_HISTORY_MAX_CONTEXTS', 1000)),
+            ttl_seconds=int(os.environ.get('CHAT_HISTORY_TTL_SECONDS', 3600))
+        )
+    if backend == 'sqlite':
+        return SQLiteStorage(
+            path=os.environ.get('STORAGE_PATH', 'mock_api.db'),
+            per_context=per_context,
+            max_contexts=int(os.environ.get('CHAT_HISTORY_MAX_CONTEXTS', 1000)),
+            ttl_seconds=int(os.environ.get('CHAT_HISTORY_TTL_SECONDS', 3600)),
+            pool_size=int(os.environ.get('STORAGE_POOL_SIZE', 4))
+        )
+
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    Shared storage backend for this process, built on first use (so
+    preloaded gunicorn workers each open their own)
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def close_storage():
+    """
+    Flush and close the shared backend, if one was ever opened
+    """
+    if _storage is not None:
+        _storage.close()
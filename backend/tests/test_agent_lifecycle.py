@@ -0,0 +1,150 @@
+"""
+Agent lifecycle on a manual clock: start, ticks, pause/resume, stop and a
+full run to completion, stepped deterministically in milliseconds
+
+    python -m unittest discover -s tests
+"""
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import AgentRuntime  # noqa: E402
+from clock import ManualClock, RealClock, ScaledClock, make_clock  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+START = datetime(2025, 1, 6, 9, 0)
+TICK = 2.0
+GOAL = "Audit security of the login flow"
+
+
+def manual_runtime(seed=7):
+    return AgentRuntime(MemoryStorage(), tick_seconds=TICK, clock=ManualClock(START), rng=random.Random(seed))
+
+
+def at(seconds):
+    return (START + timedelta(seconds=seconds)).isoformat()
+
+
+class AgentLifecycleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = manual_runtime()
+        self.threads = threading.active_count()
+
+    def test_start_waits_for_first_tick(self):
+        state = self.runtime.start("a", GOAL, "supervised")
+        self.assertEqual(state["status"], "running")
+        self.assertEqual(state["started_at"], at(0))
+        self.assertEqual([t["status"] for t in state["subtasks"]], ["pending"] * 4)
+
+        self.assertEqual(self.runtime.advance_clock(TICK - 0.5), 0)
+        self.assertEqual(self.runtime.get_state("a")["subtasks"][0]["status"], "pending")
+
+        self.assertEqual(self.runtime.advance_clock(0.5), 1)
+        state = self.runtime.get_state("a")
+        self.assertEqual(state["subtasks"][0]["status"], "in_progress")
+        self.assertEqual(state["last_update"], at(TICK))
+        self.assertEqual(state["action_log"][-1]["timestamp"], at(TICK))
+
+    def test_runs_to_completion(self):
+        self.runtime.start("a", GOAL, "full-auto")
+        ticks = self.runtime.advance_clock(600)
+
+        state = self.runtime.get_state("a")
+        self.assertEqual(state["status"], "stopped")
+        self.assertTrue(all(t["status"] == "completed" and t["progress"] == 100 for t in state["subtasks"]))
+        self.assertEqual(state["action_log"][-1]["action"], "All tasks completed successfully")
+        self.assertEqual(state["last_update"], at(ticks * TICK))
+        self.assertEqual(self.runtime.running_count(), 0)
+        self.assertEqual(self.runtime.clock.now(), START + timedelta(seconds=600))
+        # No scheduler thread on a manual clock
+        self.assertEqual(threading.active_count(), self.threads)
+
+    def test_same_seed_same_run(self):
+        logs = []
+        for _ in range(2):
+            runtime = manual_runtime(seed=3)
+            runtime.start("a", GOAL, "full-auto")
+            runtime.advance_clock(600)
+            logs.append(runtime.action_log_page("a", limit=500)[0])
+        self.assertEqual(logs[0], logs[1])
+
+    def test_pause_and_resume(self):
+        self.runtime.start("a", GOAL, "semi-auto")
+        self.runtime.advance_clock(TICK)
+        self.runtime.pause("a")
+        paused = self.runtime.get_state("a")
+
+        self.runtime.advance_clock(10 * TICK)
+        self.assertEqual(self.runtime.get_state("a"), paused)
+
+        self.runtime.resume("a")
+        self.runtime.resume("a")  # Queued once, so still one step per tick
+        self.assertEqual(self.runtime.advance_clock(TICK), 1)
+        self.assertEqual(self.runtime.get_state("a")["last_update"], at(12 * TICK))
+
+    def test_idle_ticks_keep_the_version(self):
+        self.runtime.start("a", GOAL, "supervised")
+        self.runtime.pause("a")
+        version = self.runtime.get_snapshot("a").version
+        self.assertFalse(self.runtime.advance("a"))
+        self.assertEqual(self.runtime.get_snapshot("a").version, version)
+        self.assertFalse(self.runtime.advance("never-started"))
+        self.assertFalse(self.runtime.exists("never-started"))
+
+    def test_stop(self):
+        self.runtime.start("a", GOAL, "supervised")
+        self.runtime.advance_clock(3 * TICK)
+        state = self.runtime.stop("a")
+        self.assertEqual((state["status"], state["subtasks"]), ("stopped", []))
+        self.runtime.advance_clock(10 * TICK)
+        self.assertEqual(self.runtime.running_count(), 0)
+        self.assertEqual(self.runtime.get_state("a")["action_log"][-1]["action"], "Agent stopped by user")
+
+    def test_agents_tick_in_due_order(self):
+        self.runtime.start("a", GOAL, "supervised")
+        self.runtime.advance_clock(1)
+        self.runtime.start("b", GOAL, "supervised")
+        self.assertEqual(self.runtime.advance_clock(TICK), 2)
+        self.assertEqual(self.runtime.get_state("a")["last_update"], at(TICK))
+        self.assertEqual(self.runtime.get_state("b")["last_update"], at(1 + TICK))
+
+    def test_only_manual_clock_advances(self):
+        runtime = AgentRuntime(MemoryStorage(), tick_seconds=TICK, clock=RealClock())
+        with self.assertRaises(ValueError):
+            runtime.advance_clock(TICK)
+
+
+class ScaledClockTest(unittest.TestCase):
+
+    def test_full_run_faster_than_real_time(self):
+        runtime = AgentRuntime(MemoryStorage(), tick_seconds=TICK, clock=ScaledClock(1000))
+        runtime.start("a", GOAL, "full-auto")
+        deadline = time.monotonic() + 5
+        while runtime.running_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        state = runtime.get_state("a")
+        self.assertEqual(state["status"], "stopped")
+        self.assertGreaterEqual(datetime.fromisoformat(state["last_update"]) - datetime.fromisoformat(state["started_at"]),
+                                timedelta(seconds=10 * TICK))
+
+
+class MakeClockTest(unittest.TestCase):
+
+    def test_specs(self):
+        self.assertIsInstance(make_clock("real"), RealClock)
+        self.assertEqual(make_clock("scaled:50").scale, 50)
+        self.assertEqual(make_clock("scaled").scale, 100)
+        self.assertTrue(make_clock("manual").manual)
+        with self.assertRaises(ValueError):
+            make_clock("warp")
+
+
+if __name__ == '__main__':
+    unittest.main()
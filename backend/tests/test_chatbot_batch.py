@@ -0,0 +1,71 @@
+"""
+POST /api/chatbot/message/batch: body validation (400), the size limit
+(413), and one NDJSON reply line per message, in order
+
+    python -m unittest discover -s tests
+"""
+import json
+import os
+import sys
+import unittest
+import uuid
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import chatbot  # noqa: E402
+from app import app  # noqa: E402
+from storage import get_storage  # noqa: E402
+
+
+class BatchValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def post(self, body):
+        return self.client.post('/api/chatbot/message/batch', json=body)
+
+    def test_bad_bodies(self):
+        for body in ([], {"messages": "hi"}, {"messages": [1]}, {"messages": [{"message": 5}]},
+                     {"messages": [{"message": "hi", "context_id": 0}]},
+                     {"messages": [{"message": "hi", "context_id": ["a"]}]}):
+            with self.subTest(body=body):
+                response = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.get_json())
+
+    def test_not_json(self):
+        response = self.client.post('/api/chatbot/message/batch', data="messages", content_type="text/plain")
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_many_messages(self):
+        with mock.patch.object(chatbot, 'MESSAGE_BATCH_MAX', 3):
+            self.assertEqual(self.post({"messages": ["a"] * 4, "simulate_latency": False}).status_code, 413)
+            self.assertEqual(self.post({"messages": ["a"] * 3, "simulate_latency": False}).status_code, 200)
+
+
+class BatchReplyTest(unittest.TestCase):
+
+    def test_one_line_per_message_in_order(self):
+        context_id = f"ctx_test_{uuid.uuid4().hex}"
+        messages = ["how does routing work", {"message": "tell me about agents", "context_id": context_id},
+                    {"context_id": context_id}, "ui"]
+        with mock.patch.object(chatbot, 'BATCH_LINES_PER_CHUNK', 3):
+            response = app.test_client().post('/api/chatbot/message/batch',
+                                              json={"messages": messages, "simulate_latency": False})
+        self.assertEqual(response.mimetype, chatbot.STREAM_MIMETYPE)
+        lines = [json.loads(line) for line in response.data.splitlines()]
+
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2, 3])
+        self.assertEqual([line["response_type"] for line in (lines[0], lines[3])], ["uncertain", "confident"])
+        self.assertEqual((lines[1]["context_id"], lines[2]["context_id"]), (context_id, context_id))
+        self.assertEqual(lines[2]["response_type"], "low_confidence")  # Empty message
+
+        entries, _, total = get_storage().history_page(context_id)
+        self.assertEqual(total, 2)
+        self.assertEqual([json.loads(entry)["user"] for entry in entries], ["tell me about agents", ""])
+
+
+if __name__ == '__main__':
+    unittest.main()
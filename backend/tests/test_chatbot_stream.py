@@ -0,0 +1,146 @@
+"""
+Streamed chat replies (NDJSON): the meta line comes first, the tokens join
+back into the message, and the done trailer comes last with the measured
+tools - from the Flask route and from the async entry point
+
+    python -m unittest discover -s tests
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import unittest
+import uuid
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asgi  # noqa: E402
+import fastjson  # noqa: E402
+import tools  # noqa: E402
+from api import chatbot  # noqa: E402
+from app import app  # noqa: E402
+from storage import get_storage  # noqa: E402
+
+MESSAGE = "How does the routing work here?"
+
+
+def patch_fast(test, run_tools):
+    """
+    Unpaced tokens, and tools that take a few milliseconds
+    """
+    for target, name, value in [(chatbot, 'CHATBOT_STREAM_RATE', 0), (asgi, 'CHATBOT_STREAM_RATE', 0),
+                                (chatbot, 'CHATBOT_RUN_TOOLS', run_tools), (asgi, 'CHATBOT_RUN_TOOLS', run_tools),
+                                (tools, 'JITTER', (0.01, 0.02)), (tools, 'SLOW_RATE', 0)]:
+        patcher = mock.patch.object(target, name, value)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+class StreamFramingMixin:
+
+    def assert_framing(self, body, context_id, tools_ran):
+        self.assertTrue(body.endswith(b'\n'))
+        lines = [json.loads(line) for line in body.splitlines()]
+        meta, tokens, done = lines[0], lines[1:-1], lines[-1]
+
+        self.assertEqual(meta["type"], "meta")
+        self.assertEqual(meta["context_id"], context_id)
+        self.assertEqual(set(meta), {"type", "confidence", "response_type", "sources", "can_correct",
+                                     "context_id", "timestamp"})
+        self.assertTrue(tokens)
+        self.assertTrue(all(token["type"] == "token" for token in tokens))
+        self.assertEqual(done["type"], "done")
+        self.assertEqual(set(done), {"type", "tools_used", "alternative_interpretations"})
+        if tools_ran:
+            self.assertTrue(all(call["execution_time_ms"] < 100 for call in done["tools_used"]))
+
+        entries, _, _ = get_storage().history_page(context_id, limit=1)
+        recorded = json.loads(entries[0])["assistant"]
+        self.assertEqual("".join(token["text"] for token in tokens), recorded["message"])
+        self.assertEqual(done["tools_used"], recorded["tools_used"])
+
+
+class FlaskStreamTest(StreamFramingMixin, unittest.TestCase):
+
+    def stream(self, run_tools):
+        patch_fast(self, run_tools)
+        context_id = f"ctx_test_{uuid.uuid4().hex}"
+        response = app.test_client().post('/api/chatbot/message/stream',
+                                          json={"message": MESSAGE, "context_id": context_id})
+        self.assertEqual(response.mimetype, chatbot.STREAM_MIMETYPE)
+        return response.data, context_id
+
+    def test_framing(self):
+        body, context_id = self.stream(run_tools=False)
+        self.assert_framing(body, context_id, tools_ran=False)
+
+    def test_framing_with_tools(self):
+        body, context_id = self.stream(run_tools=True)
+        self.assert_framing(body, context_id, tools_ran=True)
+
+
+class AsgiStreamTest(StreamFramingMixin, unittest.TestCase):
+
+    def stream(self, body, disconnect=False):
+        sent = []
+        requested = asyncio.Event()
+        first_line = asyncio.Event()
+
+        async def receive():
+            if not requested.is_set():
+                requested.set()
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            if disconnect:  # Client goes away after the meta line
+                await first_line.wait()
+                return {'type': 'http.disconnect'}
+            await asyncio.Event().wait()  # Client never disconnects
+
+        async def send(message):
+            sent.append(message)
+            if message.get('body'):
+                first_line.set()
+
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/chatbot/message/stream',
+                 'headers': [], 'query_string': b''}
+        asyncio.run(asgi.app(scope, receive, send))
+        return sent[0]['status'], b''.join(message.get('body', b'') for message in sent[1:]), sent[-1]
+
+    def test_framing_with_tools(self):
+        patch_fast(self, run_tools=True)
+        context_id = f"ctx_test_{uuid.uuid4().hex}"
+        status, body, last = self.stream(json.dumps({"message": MESSAGE, "context_id": context_id}).encode())
+        self.assertEqual(status, 200)
+        self.assertFalse(last.get('more_body', False))
+        self.assert_framing(body, context_id, tools_ran=True)
+
+    def test_disconnect_does_not_wait_for_tools(self):
+        patch_fast(self, run_tools=True)
+        # Paced tokens, so the disconnect lands mid-stream, and tools far slower than the test
+        for target, name, value in [(asgi, 'CHATBOT_STREAM_RATE', 50), (tools, 'JITTER', (100, 100)),
+                                    (tools, 'MODELS', {}), (tools, 'DEFAULT_MODEL', (0, None)),
+                                    (tools, 'DEFAULT_TIMEOUT_MS', 600000)]:
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        context_id = f"ctx_test_{uuid.uuid4().hex}"
+        start = time.monotonic()
+        _, body, _ = self.stream(json.dumps({"message": MESSAGE, "context_id": context_id}).encode(),
+                                 disconnect=True)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertNotIn(b'"done"', body)
+
+        entries, _, _ = get_storage().history_page(context_id, limit=1)
+        recorded = json.loads(entries[0])["assistant"]
+        modelled = fastjson.loads(fastjson.dumps(chatbot.draft_reply(MESSAGE)[1]["tools_used"]))
+        self.assertEqual(recorded["tools_used"], modelled)
+
+    def test_bad_body(self):
+        status, body, _ = self.stream(b'[1, 2]')
+        self.assertEqual(status, 400)
+        self.assertIn(b'error', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Version ETags are per process: a worker forked from a preloaded app must not
+hand out tags that match another worker's
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import conditional  # noqa: E402
+
+
+class ProcessTokenTest(unittest.TestCase):
+
+    def test_stable_within_a_process(self):
+        self.assertEqual(conditional.version_etag(3), conditional.version_etag(3))
+        self.assertNotEqual(conditional.version_etag(3), conditional.version_etag(4))
+
+    def test_changes_with_the_pid(self):
+        token = conditional.process_token()
+        with mock.patch.object(conditional.os, 'getpid', return_value=os.getpid() + 1):
+            self.assertNotEqual(conditional.process_token(), token)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "needs os.fork")
+    def test_forked_child_gets_its_own_token(self):
+        parent = conditional.version_etag(0)  # Drawn before the fork, like a preloaded master
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, conditional.version_etag(0).encode('ascii'))
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            child = pipe.read()
+        os.waitpid(pid, 0)
+        self.assertTrue(child.endswith("-0"))
+        self.assertNotEqual(child, parent)
+        self.assertEqual(conditional.version_etag(0), parent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Bounded conversation history: per-context rings, cursors, and LRU / TTL
+eviction of contexts
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conversation_store  # noqa: E402
+from conversation_store import ConversationHistory  # noqa: E402
+
+
+class RingTest(unittest.TestCase):
+
+    def test_pages_walk_back_by_cursor(self):
+        history = ConversationHistory(per_context=10)
+        for i in range(7):
+            history.append("a", i)
+
+        # Sequence numbers start at 1, so entry i has seq i + 1
+        self.assertEqual(history.page("a", limit=3), ([4, 5, 6], 5, 7))
+        self.assertEqual(history.page("a", limit=3, before=5), ([1, 2, 3], 2, 7))
+        self.assertEqual(history.page("a", limit=3, before=2), ([0], None, 7))
+
+    def test_keeps_last_per_context(self):
+        history = ConversationHistory(per_context=3)
+        for i in range(5):
+            history.append("a", i)
+
+        self.assertEqual(history.page("a", limit=10), ([2, 3, 4], None, 5))
+        # Nothing is left before a cursor that points into the trimmed part
+        self.assertEqual(history.page("a", limit=10, before=1), ([], None, 5))
+
+    def test_recent_view_spans_contexts(self):
+        history = ConversationHistory(recent=3)
+        for i, context_id in enumerate("abab"):
+            history.append(context_id, i)
+
+        self.assertEqual(history.page(None, limit=10), ([1, 2, 3], None, 4))
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.page("missing"), ([], None, 0))
+
+
+class EvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(conversation_store.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_least_recently_used_context_goes_first(self):
+        history = ConversationHistory(max_contexts=2)
+        history.append("a", 1)
+        history.append("b", 2)
+        history.page("a")  # Reading counts as use
+        history.append("c", 3)
+
+        self.assertEqual(history.page("a")[0], [1])
+        self.assertEqual(history.page("b"), ([], None, 0))
+        self.assertEqual(history.page("c")[0], [3])
+
+    def test_idle_contexts_expire(self):
+        history = ConversationHistory(ttl_seconds=60)
+        history.append("a", 1)
+        self.now += 30
+        history.append("b", 2)
+        self.now += 40
+
+        self.assertEqual(history.page("a"), ([], None, 0))
+        self.assertEqual(history.page("b")[0], [2])
+        self.now += 61
+        self.assertEqual(history.page("b"), ([], None, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
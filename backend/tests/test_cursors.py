@@ -0,0 +1,116 @@
+"""
+Cursor paging over HTTP: the agent action log (since / next_since) and the
+chatbot history (before / next_cursor)
+
+    python -m unittest discover -s tests
+"""
+import os
+import random
+import sys
+import unittest
+import uuid
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import ACTION_LOG_TAIL, AgentRuntime  # noqa: E402
+from api import agent, chatbot  # noqa: E402
+from app import app  # noqa: E402
+from clock import ManualClock  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+GOAL = "Audit security of the login flow"
+
+
+class ActionLogCursorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = AgentRuntime(MemoryStorage(), tick_seconds=2.0, clock=ManualClock(datetime(2025, 1, 6, 9)),
+                                    rng=random.Random(7))
+        patcher = mock.patch.object(agent, '_runtime', self.runtime)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def page(self, **params):
+        response = self.client.get('/api/agent/a/action-log', query_string=params)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_pages_follow_next_since(self):
+        self.runtime.start("a", GOAL, "full-auto")
+        self.runtime.advance_clock(600)
+        total = self.runtime.get_state("a")["action_count"]
+
+        seqs, since = [], 0
+        while True:
+            page = self.page(since=since, limit=4)
+            seqs += [entry["seq"] for entry in page["actions"]]
+            since = page["next_since"]
+            self.assertEqual(page["total_actions"], total)
+            if not page["has_more"]:
+                break
+        self.assertEqual(seqs, list(range(1, total + 1)))
+        self.assertEqual(self.page(since=since)["actions"], [])
+        self.assertEqual(self.page(since=since)["next_since"], since)
+
+    def test_full_log_beyond_the_inline_tail(self):
+        self.runtime.start("a", GOAL, "full-auto")
+        for _ in range(ACTION_LOG_TAIL):
+            self.runtime.modify("a", GOAL)
+        state = self.runtime.get_state("a")
+        self.assertEqual(len(state["action_log"]), ACTION_LOG_TAIL)
+
+        page = self.page(limit=500)
+        self.assertEqual(len(page["actions"]), ACTION_LOG_TAIL + 1)
+        self.assertEqual(page["actions"][-ACTION_LOG_TAIL:], state["action_log"])
+
+    def test_restart_starts_a_new_log_with_later_seqs(self):
+        self.runtime.start("a", GOAL, "supervised")
+        self.runtime.stop("a")
+        last = self.page()["next_since"]
+        self.runtime.start("a", GOAL, "supervised")
+
+        page = self.page()
+        self.assertEqual([entry["seq"] for entry in page["actions"]], [last + 1])
+        self.assertEqual(page["total_actions"], 1)
+
+    def test_unknown_agent(self):
+        self.assertEqual(self.client.get('/api/agent/nobody/action-log').status_code, 404)
+
+
+class HistoryCursorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.context_id = f"ctx_test_{uuid.uuid4().hex}"
+        for i in range(7):
+            chatbot.chatbot_reply(f"message {i}", self.context_id)
+
+    def page(self, **params):
+        response = self.client.get('/api/chatbot/history', query_string={"context_id": self.context_id, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_pages_follow_next_cursor(self):
+        pages, cursor = [], None
+        while True:
+            page = self.page(limit=3, **({"before": cursor} if cursor else {}))
+            pages.append([entry["user"] for entry in page["history"]])
+            self.assertEqual(page["total_messages"], 7)
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, [["message 4", "message 5", "message 6"],
+                                 ["message 1", "message 2", "message 3"],
+                                 ["message 0"]])
+
+    def test_entries_embed_the_reply(self):
+        entry = self.page(limit=1)["history"][0]
+        self.assertEqual(entry["assistant"]["context_id"], self.context_id)
+        self.assertEqual(self.page(limit=1, fields="user")["history"], [{"user": "message 6"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
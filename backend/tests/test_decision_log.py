@@ -0,0 +1,152 @@
+"""
+DecisionLog: time-range and recommendation paging, outcome statistics and
+calibration buckets, out-of-order timestamps and the retention cap
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastjson  # noqa: E402
+from decision_log import DecisionLog  # noqa: E402
+
+RECOMMENDATIONS = ("deploy", "hold", "investigate")
+
+
+def decision(i, recommendation=None, confidence=0.8):
+    return {
+        "timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}",
+        "recommendation": recommendation or RECOMMENDATIONS[i % 3],
+        "confidence": confidence
+    }
+
+
+def filled(count, **kwargs):
+    log = DecisionLog(**kwargs)
+    for i in range(count):
+        log.append(decision(i))
+    return log
+
+
+def walk(log, **query):
+    """
+    Ids of every page in turn, following next_cursor, and the first page's
+    matching total
+    """
+    ids, totals, before = [], [], None
+    while True:
+        entries, before, total = log.page(before=before, limit=4, **query)
+        ids += [entry["id"] for entry in entries]
+        totals.append(total)
+        if before is None:
+            return ids, totals[0]
+
+
+class PagingTest(unittest.TestCase):
+
+    def test_newest_first_by_cursor(self):
+        ids, total = walk(filled(10))
+        self.assertEqual((ids, total), (list(range(9, -1, -1)), 10))
+
+    def test_time_range(self):
+        log = filled(100)
+        entries, _, total = log.page(since=decision(20)["timestamp"], until=decision(30)["timestamp"], limit=100)
+        self.assertEqual(([entry["id"] for entry in entries], total), (list(range(29, 19, -1)), 10))
+
+    def test_recommendation_index(self):
+        log = filled(30)
+        ids, total = walk(log, recommendation="hold")
+        self.assertEqual((ids, total), (list(range(28, 0, -3)), 10))
+        ids, total = walk(log, recommendation="hold", since=decision(10)["timestamp"])
+        self.assertEqual(ids, [28, 25, 22, 19, 16, 13, 10])
+        self.assertEqual(log.page(recommendation="rollback"), ([], None, 0))
+
+    def test_encoded_entries(self):
+        log = filled(3)
+        log.record_outcome(1, "success")
+        (encoded,), _, _ = log.page(before=2, limit=1, encoded=True)
+        self.assertEqual(fastjson.loads(fastjson.dumps(encoded))["actual_outcome"], "success")
+
+    def test_key_skips_repeats(self):
+        log = DecisionLog()
+        self.assertIsNotNone(log.append(decision(0), key=1))
+        self.assertIsNone(log.append(decision(1), key=1))
+        self.assertIsNotNone(log.append(decision(2), key=2))
+        self.assertEqual(len(log), 2)
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def test_accuracy_and_calibration(self):
+        log = DecisionLog()
+        for i, confidence in enumerate((0.95, 0.92, 0.55, 0.5)):
+            log.append(decision(i, confidence=confidence))
+        log.record_outcome(0, "success")
+        log.record_outcome(1, "incorrect")
+        log.record_outcome(2, "correct")
+
+        summary = log.summary()
+        self.assertEqual((summary["total_decisions"], summary["resolved_decisions"], summary["correct_decisions"]),
+                         (4, 3, 2))
+        self.assertEqual((summary["accuracy"], summary["avg_confidence"]), (66.7, 0.73))
+        self.assertEqual(summary["calibration"], [
+            {"confidence_range": [0.5, 0.6], "decisions": 1, "avg_confidence": 0.55, "accuracy": 1.0},
+            {"confidence_range": [0.9, 1.0], "decisions": 2, "avg_confidence": 0.935, "accuracy": 0.5},
+        ])
+
+    def test_correcting_an_outcome(self):
+        log = filled(1)
+        log.record_outcome(0, "incorrect")
+        log.record_outcome(0, "success")
+        self.assertEqual((log.summary()["resolved_decisions"], log.summary()["accuracy"]), (1, 100.0))
+
+    def test_full_confidence_lands_in_the_top_bucket(self):
+        log = filled(0)
+        log.append(decision(0, confidence=1.0))
+        log.record_outcome(0, "success")
+        self.assertEqual(log.summary()["calibration"][0]["confidence_range"], [0.9, 1.0])
+
+    def test_bad_outcomes(self):
+        log = filled(1)
+        with self.assertRaises(ValueError):
+            log.record_outcome(0, "great")
+        self.assertIsNone(log.record_outcome(5, "success"))
+
+
+class OrderAndRetentionTest(unittest.TestCase):
+
+    def test_earlier_timestamp_is_clamped(self):
+        log = filled(5)
+        entry = log.append(decision(2))  # Wall clock stepped back
+        self.assertEqual(entry["timestamp"], decision(4)["timestamp"])
+        self.assertEqual(log.page(limit=1)[0][0]["id"], 5)
+        _, _, total = log.page(since=decision(4)["timestamp"])
+        self.assertEqual(total, 2)
+
+    def test_oldest_entries_dropped(self):
+        log = filled(100, max_entries=20)
+        self.assertLessEqual(len(log), 22)
+        ids, total = walk(log)
+        self.assertEqual(ids, list(range(99, 99 - len(log), -1)))
+        self.assertEqual(total, len(log))
+        self.assertEqual(walk(log, recommendation="deploy")[0], [i for i in ids if i % 3 == 0])
+        self.assertEqual(log.summary()["total_decisions"], len(log))
+
+        self.assertIsNone(log.record_outcome(0, "success"))
+        self.assertEqual(log.record_outcome(99, "success")["id"], 99)
+        self.assertEqual(log.summary()["resolved_decisions"], 1)
+
+    def test_dropped_outcomes_leave_the_summary(self):
+        log = filled(1, max_entries=2)
+        log.record_outcome(0, "success")
+        for i in range(1, 5):
+            log.append(decision(i))
+        summary = log.summary()
+        self.assertEqual((summary["resolved_decisions"], summary["calibration"]), (0, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+POST /api/dmi/decision/batch input validation: metric values must be
+numbers or null, answered with a 400 rather than a server error
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+
+
+class DecisionBatchValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def post(self, body):
+        return self.client.post('/api/dmi/decision/batch', json=body)
+
+    def test_non_numeric_value(self):
+        response = self.post({"snapshots": [{"test_pass_rate": "abc"}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.get_json())
+
+    def test_numeric_string_with_explain(self):
+        response = self.post({"snapshots": [{"test_pass_rate": "95"}], "explain": True})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bool_value(self):
+        self.assertEqual(self.post({"snapshots": [{"bug_count": True}]}).status_code, 400)
+
+    def test_null_counts_as_missing(self):
+        response = self.post({"snapshots": [{"test_pass_rate": None, "build_time": 3.2, "bug_count": 4}],
+                              "explain": True})
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()["results"][0]
+        self.assertNotIn("Test Pass Rate", [factor["metric"] for factor in result["explanation"]["supporting_factors"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
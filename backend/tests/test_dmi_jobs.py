@@ -0,0 +1,106 @@
+"""
+DMI background jobs: JobPool results, failures and the queue limit, and the
+202 -> poll -> result flow through /api/dmi/trend and /api/dmi/jobs/<id>
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dmi_jobs  # noqa: E402
+import fastjson  # noqa: E402
+from api import dmi  # noqa: E402
+from app import app  # noqa: E402
+from dmi_jobs import JobPool, QueueFull  # noqa: E402
+
+
+def small_pool(test, **kwargs):
+    pool = JobPool(**kwargs)
+
+    def shut_down():
+        if pool._executor is not None:
+            pool._executor.shutdown(cancel_futures=True)
+    test.addCleanup(shut_down)
+    return pool
+
+
+class JobPoolTest(unittest.TestCase):
+
+    def test_result_is_encoded(self):
+        job = small_pool(self).submit("sort", sorted, [3, 1, 2])
+        self.assertEqual(fastjson.loads(job.future.result(timeout=30)), [1, 2, 3])
+        self.assertEqual(job.describe()["status"], "done")
+
+    def test_failure_described(self):
+        job = small_pool(self).submit("parse", int, "x")
+        job.future.exception(timeout=30)
+        info = job.describe()
+        self.assertEqual(info["status"], "failed")
+        self.assertIn("invalid literal", info["error"])
+
+    def test_queue_full(self):
+        pool = small_pool(self, max_queued=1)
+        job = pool.submit("wait", time.sleep, 0.2)
+        with self.assertRaises(QueueFull):
+            pool.submit("wait", time.sleep, 0)
+        job.future.result(timeout=30)
+        while pool._active:  # The done callback frees the slot
+            time.sleep(0.01)
+        pool.submit("wait", time.sleep, 0).future.result(timeout=30)
+
+    def test_finished_jobs_evicted(self):
+        pool = small_pool(self, keep=1)
+        first = pool.submit("sort", sorted, [1])
+        first.future.result(timeout=30)
+        second = pool.submit("sort", sorted, [2])
+        second.future.result(timeout=30)
+        third = pool.submit("sort", sorted, [3])  # Keeps the newest finished job and the running one
+        self.assertIsNone(pool.get(first.id))
+        self.assertIs(pool.get(second.id), second)
+        self.assertIs(pool.get(third.id), third)
+
+
+class JobEndpointTest(unittest.TestCase):
+
+    URL = '/api/dmi/trend?metric=unknown_metric&days=30&resolution=hour&seed=7'
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_trend_job_polled_to_result(self):
+        inline = self.client.get(self.URL).get_json()
+        inline.pop("timestamp")
+        with mock.patch.object(dmi_jobs, '_jobs', small_pool(self)), mock.patch.object(dmi, 'TREND_INLINE_POINTS', 10):
+            response = self.client.get(self.URL)
+            self.assertEqual(response.status_code, 202)
+            self.assertIn("Retry-After", response.headers)
+            status_url = response.get_json()["status_url"]
+            self.assertEqual(response.headers["Location"], status_url)
+
+            deadline = time.monotonic() + 30
+            while response.status_code == 202 and time.monotonic() < deadline:
+                time.sleep(0.05)
+                response = self.client.get(status_url)
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        result.pop("timestamp")
+        self.assertEqual(result, inline)
+
+    def test_queue_full_is_503(self):
+        with mock.patch.object(dmi_jobs, '_jobs', small_pool(self, max_queued=0)), \
+                mock.patch.object(dmi, 'TREND_INLINE_POINTS', 10):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], str(dmi.JOB_RETRY_SECONDS))
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get('/api/dmi/jobs/nope').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
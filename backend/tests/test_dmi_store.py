@@ -0,0 +1,72 @@
+"""
+DMI store reads racing an append: trend, anomaly and summary reads wait for
+the store lock, so they never pair a new timestamp with an old value or a
+version with the summaries before it
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dmi_store import HOUR, DMIStore  # noqa: E402
+
+
+class TrendDuringAppendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = DMIStore(history_days=2, seed=1)
+        self.series = self.store._series["build_time"]
+
+    def read_mid_append(self, read):
+        """
+        Run read() in a thread while an append is half done (timestamp in,
+        value not yet) under the store lock; returns its result
+        """
+        result = []
+        with self.store._lock:
+            self.series._timestamps.append(self.series._timestamps.view[-1] + HOUR)
+            reader = threading.Thread(target=lambda: result.append(read()))
+            reader.start()
+            reader.join(0.05)
+            self.assertTrue(reader.is_alive())
+            self.series._values.append(42.0)
+        reader.join()
+        return result[0]
+
+    def test_hourly_trend_stays_aligned(self):
+        timestamps, values, flags = self.read_mid_append(lambda: self.series.trend(30, "hour"))
+        self.assertEqual(len(timestamps), len(values))
+        self.assertEqual(len(values), len(flags))
+        self.assertEqual(timestamps[-1], self.series._timestamps.view[-1])
+        self.assertEqual(values[-1], 42.0)
+
+    def test_daily_trend_lengths_match(self):
+        dates, means, anomalous = self.read_mid_append(lambda: self.series.trend(30, "day"))
+        self.assertEqual(len(dates), len(means))
+        self.assertEqual(len(means), len(anomalous))
+        self.assertFalse(np.isnan(means).all())
+
+    def test_summaries_match_their_version(self):
+        result = []
+        with self.store._lock:
+            self.store.version += 1
+            reader = threading.Thread(target=lambda: result.append(self.store.summaries()))
+            reader.start()
+            reader.join(0.05)
+            self.assertTrue(reader.is_alive())
+            self.series.append(self.series._timestamps.view[-1] + HOUR, 42.0)
+        reader.join()
+        version, summaries = result[0]
+        self.assertEqual(version, self.store.version)
+        self.assertEqual(summaries["build_time"]["current"], 42.0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
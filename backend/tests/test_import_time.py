@@ -0,0 +1,49 @@
+"""
+Cold-start budget for the API: `import app` (all route groups enabled)
+measured with `python -X importtime`
+
+    python -m unittest discover -s tests
+
+IMPORT_BUDGET_MS overrides the budget on slow machines.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', 350))
+RUNS = 3  # Best of, to ride out a noisy machine
+
+# Built on first use, never at import (see api/__init__.py)
+LAZY_MODULES = ("numpy", "dmi_series", "dmi_store", "dmi_rules")
+
+
+def import_app(code="import app"):
+    """
+    Run code in a fresh interpreter; returns (cumulative import time of app
+    in ms, stdout)
+    """
+    env = {**os.environ, "ENABLED_APIS": "all"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == "app":
+            return int(cumulative) / 1000, result.stdout
+    raise AssertionError("app import not found in -X importtime output")
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_import_within_budget(self):
+        best = min(import_app()[0] for _ in range(RUNS))
+        self.assertLess(best, IMPORT_BUDGET_MS, f"import app took {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+    def test_heavy_modules_load_lazily(self):
+        _, stdout = import_app(f"import sys, app; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+        self.assertEqual(stdout.strip(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
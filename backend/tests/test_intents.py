@@ -0,0 +1,102 @@
+"""
+IntentRouter against the if/elif keyword chain it replaced: every keyword,
+and every pair of keywords from different intents, must pick the intent
+the chain picked, with either matcher (Aho-Corasick or the `in` fallback)
+
+    python -m unittest discover -s tests
+"""
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intents  # noqa: E402
+from intents import IntentRouter  # noqa: E402
+
+# The original chain in chatbot_message, in order: (intent, keywords)
+BASELINE = [
+    ("this_interface", ['ui', 'interface', 'design', 'this']),
+    ("authentication", ['authentication', 'auth', 'login', 'user']),
+    ("confidence", ['confidence', 'trust', 'certain']),
+    ("routing", ['routing', 'route', 'navigation']),
+    ("agents", ['agent', 'autonomous', 'supervision', 'wednesday']),
+    ("subtasks", ['subtask', 'progress', 'task breakdown']),
+    ("action_log", ['action log', 'explainability', 'transparency']),
+    ("autonomy", ['autonomy', 'supervised', 'semi-auto', 'full-auto']),
+    ("angular_components", ['component', 'angular']),  # Only without 'ui', which the first branch takes anyway
+    ("codebase", ['codebase', 'entire', 'explain all']),
+    ("best_practices", ['best practice', 'practices']),
+]
+
+
+def baseline_intent(msg_lower):
+    for name, keywords in BASELINE:
+        if any(word in msg_lower for word in keywords):
+            if name == "angular_components" and 'ui' in msg_lower:
+                continue
+            return name
+    return None
+
+
+def messages():
+    keywords = [keyword for _, words in BASELINE for keyword in words]
+    yield from keywords
+    for first, second in itertools.permutations(keywords, 2):
+        yield f"tell me about {first} and {second}"
+    yield from ["hello there", "what is the weather", "build pipeline", "a quick guide", "SEMI-AUTO mode", ""]
+
+
+class IntentRouterTest(unittest.TestCase):
+
+    def assert_matches_baseline(self, router):
+        for message in messages():
+            msg_lower = message.lower()
+            intent = router.classify(msg_lower)
+            with self.subTest(message=message):
+                self.assertEqual(intent["name"] if intent else None, baseline_intent(msg_lower))
+
+    def test_automaton_matches_baseline(self):
+        if intents.ahocorasick is None:
+            self.skipTest("pyahocorasick not installed")
+        self.assert_matches_baseline(IntentRouter())
+
+    def test_fallback_matches_baseline(self):
+        with mock.patch.object(intents, 'ahocorasick', None):
+            self.assert_matches_baseline(IntentRouter())
+
+    def test_table_fields(self):
+        intent = IntentRouter().classify("routing")
+        self.assertEqual((intent["response_type"], intent["confidence"]), ("uncertain", [0.7, 0.82]))
+        self.assertEqual(set(intent["encoded"]), {"sources", "tools_used"})
+
+
+class ReloadTest(unittest.TestCase):
+
+    def test_reloads_when_the_file_changes(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "intents.json")
+        shutil.copy(intents.DEFAULT_PATH, path)
+        router = IntentRouter(path, reload_interval=0)
+        self.assertIsNone(router.classify("kubernetes"))
+
+        with open(path) as f:
+            table = json.load(f)
+        table["intents"][0]["keywords"].append("kubernetes")
+        with open(path, "w") as f:
+            json.dump(table, f)
+        os.utime(path, (time.time() + 5, time.time() + 5))
+
+        self.assertEqual(router.classify("kubernetes")["name"], "this_interface")
+        self.assertEqual(router.version, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
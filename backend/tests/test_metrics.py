@@ -0,0 +1,84 @@
+"""
+Request metrics: histogram buckets in Prometheus text format, per-request
+phases and the Server-Timing header, and /api/metrics
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics  # noqa: E402
+from app import app  # noqa: E402
+from metrics import Histogram  # noqa: E402
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_buckets_are_cumulative_with_inclusive_bounds(self):
+        histogram = Histogram("test_seconds", "Test", (0.1, 1.0), ("route",))
+        for value in (0.05, 0.1, 0.5, 1.0, 3.0):
+            histogram.observe(value, "/a")
+
+        self.assertEqual(histogram.render(), [
+            "# HELP test_seconds Test",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{route="/a",le="0.1"} 2',
+            'test_seconds_bucket{route="/a",le="1.0"} 4',
+            'test_seconds_bucket{route="/a",le="+Inf"} 5',
+            'test_seconds_sum{route="/a"} 4.65',
+            'test_seconds_count{route="/a"} 5',
+        ])
+
+    def test_series_per_label_values(self):
+        histogram = Histogram("test_bytes", "Test", (10,), ("method", "route"))
+        histogram.observe(5, "POST", "/b")
+        histogram.observe(50, "GET", "/a")
+        lines = histogram.render()
+        self.assertIn('test_bytes_count{method="GET",route="/a"} 1', lines)
+        self.assertLess(lines.index('test_bytes_count{method="GET",route="/a"} 1'),
+                        lines.index('test_bytes_count{method="POST",route="/b"} 1'))
+
+    def test_unlabelled_and_escaped(self):
+        histogram = Histogram("test_wait", "Test", (1,))
+        histogram.observe(2)
+        self.assertEqual(histogram.render()[-2:], ["test_wait_sum 2.0", "test_wait_count 1"])
+
+        labelled = Histogram("test_escape", "Test", (1,), ("route",))
+        labelled.observe(0, 'a"b\\c')
+        self.assertIn('test_escape_count{route="a\\"b\\\\c"} 1', labelled.render())
+
+
+class ServerTimingTest(unittest.TestCase):
+
+    def test_phases_summed_per_request(self):
+        token = metrics.begin_request()
+        metrics.record_phase("serialize", 0.001)
+        metrics.record_phase("sleep", 0.25)
+        metrics.record_phase("serialize", 0.002)
+        timing = metrics.end_request(token, "GET", "/test", 200, 10)
+
+        entries = timing.split(", ")
+        self.assertEqual(entries[:2], ["serialize;dur=3.00", "sleep;dur=250.00"])
+        self.assertTrue(entries[-1].startswith("total;dur="))
+
+    def test_phases_outside_a_request_only_feed_the_histogram(self):
+        with metrics.phase("test_outside"):
+            pass
+        self.assertIn('le="+Inf"} 1', "\n".join(line for line in metrics.phase_duration.render()
+                                              if 'phase="test_outside"' in line))
+
+    def test_endpoint_and_header(self):
+        client = app.test_client()
+        self.assertIn("total;dur=", client.get('/api/health').headers["Server-Timing"])
+        response = client.get('/api/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/plain")
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/api/health",status="200"}',
+                      response.get_data(as_text=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
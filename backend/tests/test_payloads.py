@@ -0,0 +1,102 @@
+"""
+Payload trimming and compression: ?fields= selection, Accept-Encoding
+negotiation, and which responses get compressed
+
+    python -m unittest discover -s tests
+"""
+import gzip
+import os
+import sys
+import unittest
+import uuid
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import compression  # noqa: E402
+from api import chatbot  # noqa: E402
+from api.fields import parse_fields, select  # noqa: E402
+from app import app  # noqa: E402
+
+
+class FieldsTest(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_fields("a, b.c,b.d,,e."), {"a": None, "b": {"c": None, "d": None}, "e": None})
+        # A whole value wins over paths into it, in either order
+        self.assertEqual(parse_fields("b,b.c"), {"b": None})
+        self.assertEqual(parse_fields("b.c,b"), {"b": None})
+
+    def test_select(self):
+        state = {
+            "status": "running",
+            "subtasks": [{"id": 1, "status": "done", "progress": 100}, {"id": 2, "status": "pending"}],
+            "meta": {"owner": "x", "tags": ["a"]},
+            "count": 3
+        }
+        self.assertEqual(select(state, parse_fields("status,subtasks.status,meta.tags,missing,count.x")), {
+            "status": "running",
+            "subtasks": [{"status": "done"}, {"status": "pending"}],
+            "meta": {"tags": ["a"]},
+            "count": 3
+        })
+        self.assertIs(select(state, None), state)
+
+    def test_history_entries_trimmed_envelope_kept(self):
+        context_id = f"ctx_test_{uuid.uuid4().hex}"
+        chatbot.chatbot_reply("how does routing work", context_id)
+        body = app.test_client().get('/api/chatbot/history', query_string={
+            "context_id": context_id, "fields": "user,assistant.response_type"
+        }).get_json()
+        self.assertEqual(body["history"], [{"user": "how does routing work",
+                                            "assistant": {"response_type": "uncertain"}}])
+        self.assertEqual(body["total_messages"], 1)
+
+
+class NegotiateTest(unittest.TestCase):
+
+    def test_preference(self):
+        self.assertIsNone(compression.negotiate(None))
+        self.assertIsNone(compression.negotiate(""))
+        self.assertIsNone(compression.negotiate("identity"))
+        self.assertEqual(compression.negotiate("gzip, deflate"), "gzip")
+        self.assertIsNone(compression.negotiate("gzip;q=0"))
+        self.assertEqual(compression.negotiate("*"), compression.ENCODINGS[0])
+
+    def test_brotli_when_available(self):
+        with mock.patch.object(compression, 'ENCODINGS', ('br', 'gzip')):
+            self.assertEqual(compression.negotiate("gzip, deflate, br"), "br")
+            self.assertEqual(compression.negotiate("br;q=0.5, gzip"), "gzip")
+        with mock.patch.object(compression, 'ENCODINGS', ('gzip',)):
+            self.assertIsNone(compression.negotiate("br"))
+
+    def test_compressible(self):
+        with mock.patch.object(compression, 'MIN_BYTES', 1024):
+            self.assertTrue(compression.compressible("application/json", 1024))
+            self.assertFalse(compression.compressible("application/json", 1023))
+            self.assertFalse(compression.compressible("text/event-stream", 10 ** 6))
+        with mock.patch.object(compression, 'MIN_BYTES', 0):
+            self.assertFalse(compression.compressible("application/json", 10 ** 6))
+
+
+class CompressedResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_large_json_compressed(self):
+        plain = self.client.get('/api/dmi/trend?days=30')
+        response = self.client.get('/api/dmi/trend?days=30', headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertLess(len(response.data), len(plain.data))
+        self.assertIn(b'"trend"', gzip.decompress(response.data))
+        self.assertNotIn("Content-Encoding", plain.headers)
+
+    def test_small_json_left_alone(self):
+        response = self.client.get('/api/health', headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+ResponseCache LRU, TTL and counters, and the deterministic chatbot replies
+it backs
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastjson  # noqa: E402
+import response_cache  # noqa: E402
+from api import chatbot  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch.object(response_cache.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire(self):
+        cache = ResponseCache(ttl_seconds=10)
+        cache.put("a", 1)
+        self.now += 10
+        self.assertEqual(cache.get("a"), 1)
+        self.now += 0.5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_stats(self):
+        cache = ResponseCache(max_entries=8, ttl_seconds=60)
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(cache.stats(), {"entries": 1, "max_entries": 8, "ttl_seconds": 60,
+                                         "hits": 2, "misses": 1, "hit_rate": 0.667})
+        cache.clear()
+        self.assertEqual((cache.stats()["entries"], cache.hits, cache.misses), (0, 0, 0))
+
+
+class DeterministicReplyTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(chatbot, 'CHATBOT_DETERMINISTIC', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        chatbot.response_cache.clear()
+        self.addCleanup(chatbot.response_cache.clear)
+
+    def reply(self, message):
+        _, body = chatbot.chatbot_reply(message, "ctx_cache_test")
+        decoded = fastjson.loads(body)
+        del decoded["timestamp"]
+        return decoded
+
+    def test_repeat_message_served_from_cache(self):
+        first = self.reply("How does  routing work?")
+        second = self.reply("  How does routing work? ")
+        self.assertEqual(first, second)
+        self.assertEqual(first["context_id"], "ctx_cache_test")
+        self.assertEqual((chatbot.response_cache.hits, chatbot.response_cache.misses), (1, 1))
+
+    def test_same_message_same_reply_after_clear(self):
+        first = self.reply("tell me something new")
+        chatbot.response_cache.clear()
+        self.assertEqual(self.reply("tell me something new"), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Storage backends side by side: history paging and per-context trimming,
+agent transactions (commit and rollback) and, for SQLite, data surviving a
+reopen
+
+    python -m unittest discover -s tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastjson  # noqa: E402
+from agents import new_agent_state  # noqa: E402
+from storage import MemoryStorage, SQLiteStorage  # noqa: E402
+
+
+class StorageContract:
+    """
+    Behaviour both backends share; subclasses set up self.store
+    """
+
+    def read(self, context_id=None, limit=10, before=None):
+        entries, next_cursor, total = self.store.history_page(context_id, limit, before)
+        return [fastjson.loads(entry)["i"] for entry in entries], next_cursor, total
+
+    def test_history_pages_back_to_the_oldest(self):
+        for i in range(5):
+            self.store.append_message("a", {"i": i})
+            self.store.append_message("b", {"i": 100 + i})
+
+        page, cursor, total = self.read("a", limit=2)
+        self.assertEqual((page, total), ([3, 4], 5))
+        page, cursor, _ = self.read("a", limit=2, before=cursor)
+        self.assertEqual(page, [1, 2])
+        page, cursor, _ = self.read("a", limit=2, before=cursor)
+        self.assertEqual((page, cursor), ([0], None))
+
+        self.assertEqual(self.read(limit=2)[0], [4, 104])
+        self.assertEqual(self.read("missing"), ([], None, 0))
+
+    def test_history_trimmed_per_context(self):
+        for i in range(8):
+            self.store.append_message("a", {"i": i})
+        self.store.append_message("b", {"i": 100})
+
+        page, cursor, total = self.read("a", limit=10)
+        self.assertEqual((page, cursor, total), ([3, 4, 5, 6, 7], None, 8))
+        self.assertEqual(self.read("b")[0], [100])
+
+    def test_least_recent_context_evicted(self):
+        for context_id in ("a", "b", "c", "d"):
+            self.store.append_message(context_id, {"i": 0})
+            time.sleep(0.002)
+        self.assertEqual(self.read("a")[0], [])
+        self.assertEqual(self.read("d")[0], [0])
+
+    def test_transaction_commits(self):
+        with self.store.agent_transaction("x", new_agent_state) as state:
+            state["status"] = "running"
+            self.store.append_action("x", {"seq": 1, "action": "started"})
+        snapshot = self.store.agent_snapshot("x")
+        self.assertEqual((snapshot.version, snapshot.state["status"]), (1, "running"))
+        self.assertEqual(fastjson.loads(snapshot.body), snapshot.state)
+
+        with self.store.agent_transaction("x", new_agent_state) as state:
+            state["status"] = "paused"
+        self.assertEqual(self.store.agent_snapshot("x").version, 2)
+        self.assertEqual(self.store.load_agent_state("x")["status"], "paused")
+        self.assertEqual(self.store.list_agents(), ["x"])
+
+    def test_transaction_rolls_back(self):
+        with self.store.agent_transaction("x", new_agent_state) as state:
+            state["status"] = "running"
+        with self.assertRaises(RuntimeError):
+            with self.store.agent_transaction("x", new_agent_state) as state:
+                state["status"] = "broken"
+                raise RuntimeError("step failed")
+        snapshot = self.store.agent_snapshot("x")
+        self.assertEqual((snapshot.version, snapshot.state["status"]), (1, "running"))
+
+        with self.assertRaises(RuntimeError):
+            with self.store.agent_transaction("y", new_agent_state):
+                raise RuntimeError("never started")
+        self.assertIsNone(self.store.agent_snapshot("y"))
+
+    def test_action_log_paging_and_trim(self):
+        for seq in range(1, 8):
+            self.store.append_action("x", {"seq": seq})
+        entries, has_more = self.store.action_log_page("x", since=2, limit=3)
+        self.assertEqual(([entry["seq"] for entry in entries], has_more), ([3, 4, 5], True))
+        self.store.trim_actions("x", 6)
+        entries, has_more = self.store.action_log_page("x", limit=10)
+        self.assertEqual(([entry["seq"] for entry in entries], has_more), ([6, 7], False))
+
+
+class MemoryStorageTest(StorageContract, unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryStorage(per_context=5, max_contexts=3)
+
+
+class SQLiteStorageTest(StorageContract, unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "test.db")
+        self.store = self.open()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def open(self):
+        return SQLiteStorage(self.path, per_context=5, max_contexts=3, flush_interval=0.01)
+
+    def test_rollback_drops_actions_logged_in_it(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.agent_transaction("x", new_agent_state):
+                self.store.append_action("x", {"seq": 1})
+                raise RuntimeError("step failed")
+        self.assertEqual(self.store.action_log_page("x"), ([], False))
+
+    def test_action_log_survives_reopen(self):
+        with self.store.agent_transaction("x", new_agent_state) as state:
+            state["action_seq"] = 2
+            self.store.append_action("x", {"seq": 1, "action": "started"})
+            self.store.append_action("x", {"seq": 2, "action": "working"})
+        self.store.append_message("a", {"i": 0})
+        self.store.close()
+
+        self.store = self.open()
+        entries, _ = self.store.action_log_page("x")
+        self.assertEqual([entry["action"] for entry in entries], ["started", "working"])
+        self.assertEqual(self.store.load_agent_state("x")["action_seq"], 2)
+        self.assertEqual(self.read("a")[0], [0])
+
+    def test_idle_contexts_expire(self):
+        self.store.ttl_seconds = 0.05
+        self.store.append_message("a", {"i": 0})
+        self.store.flush()
+        time.sleep(0.1)
+        self.store.append_message("b", {"i": 1})
+        self.assertEqual(self.read("a")[0], [])
+        self.assertEqual(self.read("b")[0], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
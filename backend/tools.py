@@ -0,0 +1,154 @@
+"""
+Simulated chatbot tools, executed as concurrent asyncio tasks
+
+    CHATBOT_TOOLS=run           Run each reply's tools and report what they took
+                                (default, unless CHATBOT_LATENCY=off)
+    CHATBOT_TOOLS=off           Report the modelled timings without waiting
+    CHATBOT_TOOL_TIMEOUT_MS=800 Timeout for tools without their own (MODELS)
+
+Each tool call in a reply's tools_used (KnowledgeBaseSearch, CodeAnalyzer,
+...) becomes an awaitable with its own latency and failure model: it takes
+around the call's modelled execution_time_ms (occasionally several times
+that), fails at the tool's failure rate, and is abandoned at the tool's
+timeout. A reply's tools start together, so it waits for its slowest tool
+rather than the sum of them; tools_used then reports each tool's measured
+execution_time_ms and success, with "error": "timeout" or "failed" when
+it didn't succeed.
+
+Replies start their tools together with the simulated think time (see
+api/chatbot.py think), so a reply waits for the longer of the two. The
+async entry point (asgi.py) awaits them on its own loop; Flask threads hand
+their tools to one shared event loop thread through start(), so waiting
+tools cost a timer each rather than a thread.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+
+DEFAULT_TIMEOUT_MS = float(os.environ.get('CHATBOT_TOOL_TIMEOUT_MS', 800))
+JITTER = (0.7, 1.3)  # Latency spread around the modelled execution_time_ms
+SLOW_RATE = 0.05  # Share of calls that hit a slow path...
+SLOW_FACTOR = (2.0, 4.0)  # ...and take this many times longer
+
+# name -> (failure rate, timeout ms or None for DEFAULT_TIMEOUT_MS); unlisted tools fail 2% of the time
+MODELS = {
+    "KnowledgeBaseSearch": (0.02, None),
+    "CodeAnalyzer": (0.04, 1200),
+    "SemanticParser": (0.01, 500),
+    "QueryParser": (0.01, 300),
+    "ContextRetriever": (0.25, None),
+    "DocumentationSearcher": (0.02, None),
+    "DocumentSearch": (0.02, None),
+    "GuidelineParser": (0.01, None),
+    "ResearchPaperSearch": (0.05, 1500),
+    "ResearchDatabase": (0.05, 1500),
+    "CodebaseGrep": (0.01, None),
+    "ProjectScanner": (0.02, None),
+    "DependencyAnalyzer": (0.03, None),
+    "VulnerabilityScanner": (0.03, 1500),
+}
+DEFAULT_MODEL = (0.02, None)
+
+
+def enabled(think_time):
+    """
+    Whether replies run their tools (CHATBOT_TOOLS); by default whenever the
+    think time (a latency.LatencyProfile) is simulated too
+    """
+    setting = os.environ.get('CHATBOT_TOOLS', '').strip().lower()
+    if setting:
+        return setting not in ('off', '0', 'false', 'no')
+    return think_time.mode != 'off'
+
+
+class ToolFailed(Exception):
+    pass
+
+
+async def call_tool(call, rng=random):
+    """
+    One simulated tool call: sleep for its sampled latency, then fail at the
+    tool's failure rate. A call modelled as unsuccessful (e.g. an analysis
+    that found nothing) still takes its time and reports success false
+    """
+    failure_rate, _ = MODELS.get(call["name"], DEFAULT_MODEL)
+    seconds = call.get("execution_time_ms", 0) / 1000 * rng.uniform(*JITTER)
+    if rng.random() < SLOW_RATE:
+        seconds *= rng.uniform(*SLOW_FACTOR)
+    await asyncio.sleep(seconds)
+    if rng.random() < failure_rate:
+        raise ToolFailed(call["name"])
+    return call.get("success", True)
+
+
+async def execute(call, rng=random):
+    """
+    Run a call under its tool's timeout; returns its tools_used entry with
+    the measured time
+    """
+    _, timeout_ms = MODELS.get(call["name"], DEFAULT_MODEL)
+    start = time.perf_counter()
+    error = None
+    try:
+        success = await asyncio.wait_for(call_tool(call, rng), (timeout_ms or DEFAULT_TIMEOUT_MS) / 1000)
+    except asyncio.TimeoutError:
+        success, error = False, "timeout"
+    except ToolFailed:
+        success, error = False, "failed"
+
+    result = {**call, "execution_time_ms": round((time.perf_counter() - start) * 1000), "success": success}
+    if error:
+        result["error"] = error
+    return result
+
+
+async def run_async(calls, rng=random):
+    """
+    Run a reply's tool calls concurrently; results in call order
+    """
+    return list(await asyncio.gather(*(execute(call, rng) for call in calls)))
+
+
+async def run_timed(calls, rng=random):
+    """
+    run_async() and the seconds it took
+    """
+    start = time.perf_counter()
+    results = await run_async(calls, rng)
+    return results, time.perf_counter() - start
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop():
+    """
+    Event loop thread shared by every Flask thread, started on first use
+    (so each preloaded gunicorn worker starts its own)
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="chatbot-tools", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def start(calls, rng=random):
+    """
+    run_timed() on the tools thread, for threaded callers; returns a
+    concurrent.futures.Future of (results, seconds)
+    """
+    return asyncio.run_coroutine_threadsafe(run_timed(calls, rng), get_loop())
+
+
+def run(calls, rng=random):
+    """
+    Blocking run_async() for threaded callers
+    """
+    return start(calls, rng).result()[0]
@@ -0,0 +1,28 @@
+"""
+Production entry point
+
+    gunicorn -c gunicorn.conf.py
+
+create_app() returns the configured Flask app; gunicorn.conf.py serves it
+either as WSGI (threaded workers) or, with SERVER_MODE=asgi, through the
+async entry point in asgi.py (uvicorn workers).
+"""
+import os
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+
+def create_app():
+    """
+    Flask app configured for running behind a reverse proxy (e.g. Render)
+    """
+    from app import app
+
+    # Trust X-Forwarded-For / -Proto from this many proxy hops
+    proxy_hops = int(os.environ.get('PROXY_HOPS', 1))
+    if proxy_hops and not isinstance(app.wsgi_app, ProxyFix):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops, x_host=proxy_hops)
+    return app
+
+
+app = create_app()
@@ -4,9 +4,8 @@ import { FormsModule } from '@angular/forms';
 import { MaterialModule } from '../../material.module';
 import { AgentService } from '../../services/agent.service';
 import { ThemeService } from '../../services/theme.service';
-import { AgentState, AgentAction } from '../../models/agent.model';
-import { Observable, Subscription, interval } from 'rxjs';
-import { switchMap } from 'rxjs/operators';
+import { AgentState, AgentAction, AgentEvent, ACTION_LOG_TAIL } from '../../models/agent.model';
+import { Observable, Subscription } from 'rxjs';
 
 @Component({
   selector: 'app-agent',
@@ -36,7 +35,7 @@ export class AgentComponent implements OnInit, OnDestroy {
   showAllActions = false;
   isModifyingGoal = false;
   modifiedGoalInput = '';
-  statusPolling?: Subscription;
+  eventStream?: Subscription;
   theme$: Observable<'colorful' | 'dark'>;
 
   constructor() {
@@ -48,7 +47,7 @@ export class AgentComponent implements OnInit, OnDestroy {
   }
 
   ngOnDestroy(): void {
-    this.stopPolling();
+    this.stopEventStream();
   }
 
   /**
@@ -60,9 +59,9 @@ export class AgentComponent implements OnInit, OnDestroy {
         this.agentState = state;
         this.cdr.detectChanges();
         
-        // Resume polling if agent is running
+        // Resume live updates if agent is running
         if (state.status === 'running') {
-          this.startStatusPolling();
+          this.startEventStream();
         }
       },
       error: (error) => {
@@ -83,7 +82,7 @@ export class AgentComponent implements OnInit, OnDestroy {
       next: (state) => {
         this.agentState = state;
         this.cdr.detectChanges();
-        this.startStatusPolling();
+        this.startEventStream();
       },
       error: (error) => {
         console.error('Failed to start agent:', error);
@@ -99,7 +98,7 @@ export class AgentComponent implements OnInit, OnDestroy {
       next: (state) => {
         this.agentState = state;
         this.cdr.detectChanges();
-        this.stopPolling();
+        this.stopEventStream();
       },
       error: (error) => {
         console.error('Failed to pause agent:', error);
@@ -115,7 +114,7 @@ export class AgentComponent implements OnInit, OnDestroy {
       next: (state) => {
         this.agentState = state;
         this.cdr.detectChanges();
-        this.startStatusPolling();
+        this.startEventStream();
       },
       error: (error) => {
         console.error('Failed to resume agent:', error);
@@ -131,7 +130,7 @@ export class AgentComponent implements OnInit, OnDestroy {
       next: (state) => {
         this.agentState = state;
         this.cdr.detectChanges();
-        this.stopPolling();
+        this.stopEventStream();
       },
       error: (error) => {
         console.error('Failed to stop agent:', error);
@@ -177,38 +176,71 @@ export class AgentComponent implements OnInit, OnDestroy {
   }
 
   /**
-   * Start polling for status updates (every 2 seconds)
+   * Subscribe to agent state deltas (Server-Sent Events)
    */
-  private startStatusPolling(): void {
-    this.stopPolling(); // Ensure no duplicate polling
-    
-    this.statusPolling = interval(2000)
-      .pipe(
-        switchMap(() => this.agentService.getStatus())
-      )
-      .subscribe({
-        next: (state) => {
-          this.agentState = state;
-          this.cdr.detectChanges();
-          
-          // Stop polling if agent is no longer running
-          if (state.status !== 'running') {
-            this.stopPolling();
-          }
-        },
-        error: (error) => {
-          console.error('Status polling error:', error);
+  private startEventStream(): void {
+    this.stopEventStream(); // Ensure only one open stream
+
+    this.eventStream = this.agentService.streamEvents().subscribe({
+      next: (event) => {
+        this.applyAgentEvent(event);
+        this.cdr.detectChanges();
+
+        // Close the stream once the agent is no longer running
+        if (this.agentState.status !== 'running') {
+          this.stopEventStream();
         }
-      });
+      },
+      error: (error) => {
+        console.error('Agent event stream error:', error);
+      }
+    });
   }
 
   /**
-   * Stop status polling
+   * Close the agent event stream
    */
-  private stopPolling(): void {
-    if (this.statusPolling) {
-      this.statusPolling.unsubscribe();
-      this.statusPolling = undefined;
+  private stopEventStream(): void {
+    if (this.eventStream) {
+      this.eventStream.unsubscribe();
+      this.eventStream = undefined;
+    }
+  }
+
+  /**
+   * Merge a pushed delta into the local agent state
+   * Events are idempotent, so replays after a reconnect are harmless
+   */
+  private applyAgentEvent(event: AgentEvent): void {
+    switch (event.type) {
+      case 'snapshot':
+        this.agentState = event.data;
+        break;
+      case 'status':
+        this.agentState = { ...this.agentState, ...event.data };
+        break;
+      case 'subtask': {
+        const { subtask, last_update } = event.data;
+        this.agentState = {
+          ...this.agentState,
+          last_update,
+          subtasks: this.agentState.subtasks.map(t => t.id === subtask.id ? subtask : t)
+        };
+        break;
+      }
+      case 'log': {
+        const { seq, entry } = event.data;
+        if (seq <= (this.agentState.action_seq ?? 0)) {
+          break;  // Already in the snapshot
+        }
+        this.agentState = {
+          ...this.agentState,
+          action_log: [...this.agentState.action_log, entry].slice(-ACTION_LOG_TAIL),  // Same tail as the server keeps
+          action_seq: seq,
+          action_count: (this.agentState.action_count ?? this.agentState.action_log.length) + 1
+        };
+        break;
+      }
     }
   }
 
@@ -1,10 +1,18 @@
+/**
+ * Log entries kept in AgentState.action_log (ACTION_LOG_TAIL in backend/agents.py)
+ */
+export const ACTION_LOG_TAIL = 50;
+
 export interface AgentState {
   status: 'idle' | 'running' | 'paused' | 'stopped';
   current_goal: string | null;
   autonomy_level?: 'supervised' | 'semi-auto' | 'full-auto';
   subtasks: AgentSubtask[];
   started_at?: string;
-  action_log: AgentAction[];
+  last_update?: string | null;
+  action_log: AgentAction[];  // Latest entries only; page older ones via getActionLog
+  action_seq?: number;
+  action_count?: number;
 }
 
 export interface AgentSubtask {
@@ -15,6 +23,7 @@ export interface AgentSubtask {
 }
 
 export interface AgentAction {
+  seq?: number;
   timestamp: string;
   action: string;
   details: string;
@@ -32,4 +41,15 @@ export interface AgentModifyRequest {
 export interface AgentActionLog {
   actions: AgentAction[];
   total_actions: number;
+  next_since?: number;
+  has_more?: boolean;
 }
+
+/**
+ * Delta pushed on the /api/agent/events Server-Sent Events stream
+ */
+export type AgentEvent =
+  | { type: 'snapshot'; data: AgentState }
+  | { type: 'status'; data: Partial<AgentState> }
+  | { type: 'subtask'; data: { subtask: AgentSubtask; last_update: string } }
+  | { type: 'log'; data: { seq: number; entry: AgentAction } };
@@ -60,10 +60,11 @@ export interface DmiTrendResponse {
 }
 
 export interface DecisionLogEntry {
+  id?: number;
   timestamp: string;
   recommendation: 'deploy' | 'hold' | 'investigate' | 'rollback';
   confidence: number;
-  actual_outcome: 'success' | 'correct' | 'partial' | 'incorrect';
+  actual_outcome: 'success' | 'correct' | 'partial' | 'incorrect' | 'pending';
   outcome_details: string;
   metrics_snapshot: {
     test_pass_rate: number;
@@ -76,9 +77,18 @@ export interface DecisionLogResponse {
   decisions: DecisionLogEntry[];
   summary: {
     total_decisions: number;
+    resolved_decisions?: number;
     correct_decisions: number;
-    accuracy: number;
+    accuracy: number;  // Over resolved decisions
     avg_confidence: number;
+    calibration?: {
+      confidence_range: [number, number];
+      decisions: number;
+      avg_confidence: number;
+      accuracy: number;
+    }[];
   };
+  matching_decisions?: number;
+  next_cursor?: number | null;
   timestamp: string;
 }
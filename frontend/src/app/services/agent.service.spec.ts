@@ -3,7 +3,7 @@ import { HttpTestingController, provideHttpClientTesting } from '@angular/common
 import { provideHttpClient } from '@angular/common/http';
 import { firstValueFrom } from 'rxjs';
 import { AgentService } from './agent.service';
-import { AgentActionLog, AgentModifyRequest, AgentStartRequest, AgentState } from '../models/agent.model';
+import { AgentActionLog, AgentEvent, AgentModifyRequest, AgentStartRequest, AgentState } from '../models/agent.model';
 
 describe('AgentService', () => {
   let service: AgentService;
@@ -232,6 +232,15 @@ describe('AgentService', () => {
       expect(log.total_actions).toBe(2);
     });
 
+    it('should pass the since cursor as a query param', () => {
+      service.getActionLog(12).subscribe();
+
+      const req = httpMock.expectOne(`${baseUrl}/action-log?since=12`);
+      expect(req.request.method).toBe('GET');
+
+      req.flush({ actions: [], total_actions: 12, next_since: 12, has_more: false } as AgentActionLog);
+    });
+
     it('should handle error when getting action log', async () => {
       const promise = firstValueFrom(service.getActionLog());
       const req = httpMock.expectOne(`${baseUrl}/action-log`);
@@ -240,4 +249,69 @@ describe('AgentService', () => {
       await expect(promise).rejects.toThrow();
     });
   });
+
+  describe('streamEvents', () => {
+    class FakeEventSource {
+      static instances: FakeEventSource[] = [];
+      listeners: Record<string, (event: MessageEvent) => void> = {};
+      closed = false;
+
+      constructor(public url: string) {
+        FakeEventSource.instances.push(this);
+      }
+
+      addEventListener(type: string, listener: (event: MessageEvent) => void): void {
+        this.listeners[type] = listener;
+      }
+
+      emit(type: string, data: unknown): void {
+        this.listeners[type]({ data: JSON.stringify(data) } as MessageEvent);
+      }
+
+      close(): void {
+        this.closed = true;
+      }
+    }
+
+    beforeEach(() => {
+      FakeEventSource.instances = [];
+      vi.stubGlobal('EventSource', FakeEventSource);
+    });
+
+    afterEach(() => {
+      vi.unstubAllGlobals();
+    });
+
+    it('should open an EventSource on /api/agent/events', () => {
+      const subscription = service.streamEvents().subscribe();
+
+      expect(FakeEventSource.instances.length).toBe(1);
+      expect(FakeEventSource.instances[0].url).toBe(`${baseUrl}/events`);
+
+      subscription.unsubscribe();
+    });
+
+    it('should emit typed, parsed events', () => {
+      const events: AgentEvent[] = [];
+      const subscription = service.streamEvents().subscribe((event) => events.push(event));
+      const source = FakeEventSource.instances[0];
+
+      source.emit('snapshot', mockState);
+      source.emit('log', { seq: 1, entry: mockState.action_log[0] });
+
+      expect(events).toEqual([
+        { type: 'snapshot', data: mockState },
+        { type: 'log', data: { seq: 1, entry: mockState.action_log[0] } },
+      ]);
+
+      subscription.unsubscribe();
+    });
+
+    it('should close the EventSource on unsubscribe', () => {
+      const subscription = service.streamEvents().subscribe();
+      subscription.unsubscribe();
+
+      expect(FakeEventSource.instances[0].closed).toBe(true);
+    });
+  });
 });
@@ -1,7 +1,7 @@
 import { Injectable, inject } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable } from 'rxjs';
-import { AgentState, AgentStartRequest, AgentModifyRequest, AgentActionLog } from '../models/agent.model';
+import { AgentState, AgentStartRequest, AgentModifyRequest, AgentActionLog, AgentEvent } from '../models/agent.model';
 import { environment } from '../../environments/environment';
 
 @Injectable({
@@ -18,6 +18,26 @@ export class AgentService {
     return this.http.get<AgentState>(`${this.API_URL}/status`);
   }
 
+  /**
+   * Stream agent state deltas over Server-Sent Events
+   * The first event is a full snapshot; EventSource reconnects on its own and
+   * resumes from the last received event id
+   */
+  streamEvents(): Observable<AgentEvent> {
+    return new Observable<AgentEvent>((subscriber) => {
+      const source = new EventSource(`${this.API_URL}/events`);
+      const types: AgentEvent['type'][] = ['snapshot', 'status', 'subtask', 'log'];
+
+      types.forEach((type) => {
+        source.addEventListener(type, (event) => {
+          subscriber.next({ type, data: JSON.parse((event as MessageEvent).data) } as AgentEvent);
+        });
+      });
+
+      return () => source.close();
+    });
+  }
+
   /**
    * Start agent with a goal and autonomy level
    * @param goal - The goal for the agent to achieve
@@ -63,8 +83,10 @@ export class AgentService {
 
   /**
    * Get detailed action log for explainability
+   * @param since - Only return entries after this seq (pass the previous next_since)
    */
-  getActionLog(): Observable<AgentActionLog> {
-    return this.http.get<AgentActionLog>(`${this.API_URL}/action-log`);
+  getActionLog(since?: number): Observable<AgentActionLog> {
+    const options = since !== undefined ? { params: { since } } : {};
+    return this.http.get<AgentActionLog>(`${this.API_URL}/action-log`, options);
   }
 }
@@ -27,13 +27,17 @@ usage() {
     echo "  coverage          View coverage report in browser"
     echo "  a11y              Run Pa11y accessibility tests (requires dev server)"
     echo "  a11y:report       View Pa11y JSON report"
-    echo "  all               Run all tests (services + components once)"
+    echo "  backend           Run backend unit tests (unittest)"
+    echo "  bench [args]      Run backend API benchmarks against the saved baseline"
+    echo "  all               Run all tests (services + components once + backend)"
     echo "  help              Show this help message"
     echo ""
     echo "Examples:"
     echo "  ./run-tests.sh components        # Interactive component testing"
     echo "  ./run-tests.sh services          # Service coverage report"
     echo "  ./run-tests.sh a11y              # Pa11y a11y tests (start server first)"
+    echo "  ./run-tests.sh backend           # Backend unit tests"
+    echo "  ./run-tests.sh bench --save      # Record a backend benchmark baseline"
     echo "  ./run-tests.sh all               # Run everything"
     echo ""
     echo "Tip: For automated Pa11y testing (with server management):"
@@ -123,6 +127,23 @@ view_a11y_report() {
     fi
 }
 
+# Run backend unit tests
+run_backend() {
+    echo -e "${BLUE}Running backend unit tests...${NC}"
+    echo ""
+    python -m unittest discover -s backend -p 'test_*.py'
+    echo ""
+    echo -e "${GREEN}✅ Backend tests passed${NC}"
+}
+
+# Run backend API benchmarks (extra args go to bench_api.py)
+run_bench() {
+    echo -e "${BLUE}Running backend API benchmarks...${NC}"
+    echo ""
+    cd backend
+    python benchmarks/bench_api.py "$@"
+}
+
 # Run all tests
 run_all() {
     echo -e "${BLUE}Running all tests...${NC}"
@@ -137,6 +158,11 @@ run_all() {
     echo "======================================================================"
     run_components_once
     echo ""
+    echo "======================================================================"
+    echo "Step 3: Backend Unit Tests"
+    echo "======================================================================"
+    run_backend
+    echo ""
     echo -e "${GREEN}✅ All tests completed!${NC}"
 }
 
@@ -160,6 +186,13 @@ case "${1:-help}" in
     a11y:report)
         view_a11y_report
         ;;
+    backend)
+        run_backend
+        ;;
+    bench)
+        shift
+        run_bench "$@"
+        ;;
     all)
         run_all
         ;;